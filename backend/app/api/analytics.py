@@ -0,0 +1,104 @@
+"""
+Analytics router.
+Provides product mix, hourly heatmap and waiter performance reports computed
+from the Parquet snapshot of closed orders (never from MySQL).
+Only accessible to users with Soporte or Administrador roles.
+"""
+import logging
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.utils.auth_middleware import require_admin
+from app.services import analytics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/analytics",
+    tags=["Analytics"],
+    responses={
+        403: {"description": "Prohibido - Permisos insuficientes"},
+        401: {"description": "No autorizado - No autenticado"},
+        503: {"description": "Analítica no disponible (pyarrow no instalado)"}
+    },
+)
+
+def _run(report, from_date: date, to_date: date):
+    """Validate the range and run an analytics report."""
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be on or before 'to'"
+        )
+    try:
+        return report(from_date, to_date)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+# Handlers are sync on purpose: FastAPI runs them in the threadpool so the
+# vectorised compute never blocks the event loop serving the POS.
+
+@router.get("/product-mix")
+def get_product_mix(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get quantity, revenue and revenue share per product.
+    Only accessible to Soporte and Administrador roles.
+    
+    Returns:
+        dict: Product mix rows sorted by revenue
+    """
+    logger.info(f"User {current_user['username']} requested product mix from {from_date} to {to_date}")
+    
+    return {
+        "status": "success",
+        "message": "Mix de productos obtenido exitosamente",
+        "data": _run(analytics.product_mix, from_date, to_date)
+    }
+
+@router.get("/hourly-heatmap")
+def get_hourly_heatmap(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get revenue and quantity by weekday (0=Monday) and closing hour.
+    Only accessible to Soporte and Administrador roles.
+    
+    Returns:
+        dict: 7×24 revenue and quantity matrices
+    """
+    logger.info(f"User {current_user['username']} requested hourly heatmap from {from_date} to {to_date}")
+    
+    return {
+        "status": "success",
+        "message": "Mapa de calor obtenido exitosamente",
+        "data": _run(analytics.hourly_heatmap, from_date, to_date)
+    }
+
+@router.get("/waiter-performance")
+def get_waiter_performance(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get orders, items, revenue and average ticket per waiter.
+    Only accessible to Soporte and Administrador roles.
+    
+    Returns:
+        dict: Waiter rows sorted by revenue
+    """
+    logger.info(f"User {current_user['username']} requested waiter performance from {from_date} to {to_date}")
+    
+    return {
+        "status": "success",
+        "message": "Rendimiento de dependientes obtenido exitosamente",
+        "data": _run(analytics.waiter_performance, from_date, to_date)
+    }
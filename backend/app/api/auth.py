@@ -12,8 +12,6 @@ from app.schemas.auth import LoginRequest, LoginResponse, UserResponse
 from app.services.user_service import authenticate_user
 from app.utils.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -0,0 +1,75 @@
+"""
+Bootstrap router.
+Provides everything a tablet needs on launch in a single response.
+Accessible to all authenticated users.
+"""
+import logging
+from typing import Optional
+import pymysql
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from app.utils.auth_middleware import require_dependiente
+from app.utils import http_cache
+from app.services import bootstrap
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/bootstrap",
+    tags=["Bootstrap"],
+    responses={
+        403: {"description": "Prohibido - Permisos insuficientes"},
+        401: {"description": "No autorizado - No autenticado"}
+    },
+)
+
+@router.get("")
+def get_bootstrap(
+    request: Request,
+    response: Response,
+    sales_area_id: Optional[int] = Query(None, description="Sales area of the tablet"),
+    current_user: dict = Depends(require_dependiente)
+):
+    """
+    Get the establishment configuration, the active sales areas with their
+    service spots, today's published menus (grouped by category, for the
+    given sales area) and the user's open orders.
+    Accessible to all authenticated users.
+    
+    Supports conditional GET: the ETag changes when any of those change, and
+    a matching If-None-Match returns 304 without assembling the payload.
+    
+    Args:
+        sales_area_id: Limit menus and orders to this sales area
+        
+    Returns:
+        dict: The bootstrap payload
+    """
+    logger.info(f"User {current_user['username']} requested bootstrap (sales area: {sales_area_id})")
+    
+    # A failed read answers 503 without an ETag, so tablets never revalidate
+    # an incomplete payload
+    try:
+        etag, build = bootstrap.prepare(current_user, sales_area_id)
+        
+        if etag is not None:
+            headers = {"ETag": etag, "Cache-Control": http_cache.CACHE_LIVE}
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match is not None and http_cache.etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        data = build()
+    except (RuntimeError, pymysql.MySQLError) as e:
+        logger.error(f"Error building bootstrap payload: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos no disponible"
+        )
+    
+    if etag is not None:
+        response.headers.update(headers)
+    
+    return {
+        "status": "success",
+        "message": "Datos de arranque obtenidos exitosamente",
+        "data": data
+    }
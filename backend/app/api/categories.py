@@ -5,8 +5,9 @@ Only accessible to users with Soporte or Administrador roles.
 """
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from app.utils.auth_middleware import require_admin
+from app.utils import http_cache
 from app.schemas.product_category import (
     ProductCategoryCreate, ProductCategoryUpdate, ProductCategoryResponse,
     ProductCategoriesResponse, ProductCategoryDetailResponse,
@@ -14,8 +15,6 @@ from app.schemas.product_category import (
 )
 from app.models.product_category import ProductCategory
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -29,21 +28,30 @@ router = APIRouter(
 
 @router.get("/", response_model=ProductCategoriesResponse)
 async def get_categories(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(require_admin),
     active_only: bool = True
 ):
     """
     Get all product categories.
     Only accessible to Soporte and Administrador roles.
+    Supports conditional GET through ETag/If-None-Match.
     
     Args:
         active_only: Whether to show only active categories
         
     Returns:
-        ProductCategoriesResponse: A list of product categories
+        ProductCategoriesResponse: A list of product categories, or 304 if unchanged
     """
     logger.info(f"User {current_user['username']} accessed product categories")
     
+    not_modified = http_cache.check_not_modified(
+        request, response, ("ProductCategories",), http_cache.CACHE_CATALOG
+    )
+    if not_modified:
+        return not_modified
+    
     # Get categories from database
     if active_only:
         db_categories = ProductCategory.get_active()
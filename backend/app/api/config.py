@@ -7,8 +7,6 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from app.utils.auth_middleware import require_admin
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -11,8 +11,6 @@ from app.schemas.establishment import (
 )
 from app.models.establishment import Establishment
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
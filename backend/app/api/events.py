@@ -0,0 +1,60 @@
+"""
+Events router.
+Pushes live changes (e.g. product availability) to connected clients as
+server-sent events.
+Accessible to all authenticated users.
+"""
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from app.utils.auth_middleware import require_dependiente
+from app.services import events
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/events",
+    tags=["Events"],
+    responses={
+        403: {"description": "Prohibido - Permisos insuficientes"},
+        401: {"description": "No autorizado - No autenticado"}
+    },
+)
+
+# Reconnection delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(require_dependiente)
+):
+    """
+    Stream live change events (text/event-stream).
+    Accessible to all authenticated users.
+    
+    Each message carries the event id, its type (`event`) and a JSON
+    payload (`data`). Clients reconnecting with the `Last-Event-ID` header
+    get the events they missed first. A comment line is sent periodically
+    to keep idle connections open.
+    
+    Returns:
+        StreamingResponse: The event stream
+    """
+    logger.info(f"User {current_user['username']} subscribed to events (last event: {last_event_id})")
+    
+    async def stream():
+        yield f"retry: {RETRY_MS}\n\n"
+        async for row in events.broker.subscribe(last_event_id):
+            if await request.is_disconnected():
+                break
+            yield ": keepalive\n\n" if row is None else events.format_event(row)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # no-transform keeps the compression middleware from buffering events
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,80 @@
+"""
+Forecast router.
+Provides demand forecasts so admins can pre-plan stock for a menu date.
+Only accessible to users with Soporte or Administrador roles.
+"""
+import logging
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.utils.auth_middleware import require_admin
+from app.services import forecast
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/forecast",
+    tags=["Forecast"],
+    responses={
+        403: {"description": "Prohibido - Permisos insuficientes"},
+        401: {"description": "No autorizado - No autenticado"}
+    },
+)
+
+@router.get("/menu")
+def get_menu_forecast(
+    target_date: date = Query(..., alias="date", description="Date to forecast (YYYY-MM-DD)"),
+    method: str = Query(forecast.METHOD_SES, description="ses or seasonal_naive"),
+    alpha: float = Query(forecast.DEFAULT_ALPHA, gt=0, le=1, description="Smoothing factor for ses"),
+    menu_id: Optional[int] = Query(None, description="Forecast only this menu's products"),
+    include_hourly: bool = False,
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Forecast product demand for a date from the same weekday of previous weeks.
+    Only accessible to Soporte and Administrador roles.
+    
+    Runs in the threadpool (sync handler) so the NumPy fit never blocks
+    the event loop.
+    
+    Args:
+        target_date: The date to forecast
+        method: Forecast model
+        alpha: Smoothing factor for ses
+        menu_id: Optional menu to restrict the products
+        include_hourly: Whether to include hourly profiles
+        
+    Returns:
+        dict: Forecast rows sorted by quantity
+    """
+    logger.info(f"User {current_user['username']} requested demand forecast for {target_date}")
+    
+    if method not in forecast.METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid method. Must be one of: {', '.join(forecast.METHODS)}"
+        )
+    
+    try:
+        rows = forecast.forecast_for_date(
+            target_date,
+            method=method,
+            alpha=alpha,
+            menu_id=menu_id,
+            include_hourly=include_hourly
+        )
+    except RuntimeError as e:
+        logger.error(f"Error forecasting demand for {target_date}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos no disponible"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Pronóstico de demanda obtenido exitosamente",
+        "data": rows,
+        "date": target_date,
+        "method": method,
+        "history_weeks": forecast.HISTORY_WEEKS
+    }
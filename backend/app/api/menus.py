@@ -3,18 +3,22 @@ Menus router.
 Provides endpoints for menu management.
 """
 import logging
+from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+import pymysql
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from app.utils.auth_middleware import require_admin, require_dependiente
+from app.utils import http_cache
 from app.schemas.menu import (
     MenuCreate, MenuUpdate, MenuResponse, MenusResponse,
-    MenuDetailResponse, MenuWithItemsResponse, MenuWithItemsDetailResponse
+    MenuDetailResponse, MenuWithItemsResponse, MenuWithItemsDetailResponse,
+    MenuCloneResponse, MenuPriceAdjustment, MenuPriceAdjustmentResponse
 )
 from app.models.menu import Menu
 from app.models.menu_item import MenuItem
+from app.models.published_menu_document import PublishedMenuDocument
+from app.services import menu_documents, menu_resolver
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -28,43 +32,54 @@ router = APIRouter(
 
 @router.get("/", response_model=MenusResponse)
 async def get_menus(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(require_dependiente),
     active_only: bool = True,
-    sales_area_id: Optional[int] = None
+    sales_area_id: Optional[int] = None,
+    valid_date: Optional[date] = None
 ):
     """
     Get all menus with optional filtering.
     Accessible to all authenticated users.
+    Supports conditional GET through ETag/If-None-Match.
     
     Args:
-        active_only: Whether to show only active menus
+        active_only: Whether to show only published menus
         sales_area_id: Optional filter by sales area
+        valid_date: With sales_area_id, return only the published menu that
+            applies to the area on that date (resolved in memory)
         
     Returns:
-        MenusResponse: A list of menus
+        MenusResponse: A list of menus, or 304 if unchanged
     """
     logger.info(f"User {current_user['username']} accessed menus list")
     
-    # Set up filters for query
-    where = {}
-    if active_only:
-        where["is_active"] = True
-        
+    not_modified = http_cache.check_not_modified(
+        request, response, ("Menus", "MenuSalesAreas"), http_cache.CACHE_MENUS
+    )
+    if not_modified:
+        return not_modified
+    
     # Get menus from database
-    if sales_area_id:
+    if sales_area_id and valid_date:
+        menu = menu_resolver.resolve(sales_area_id, valid_date)
+        db_menus = [menu] if menu else []
+    elif sales_area_id:
         # If sales_area_id is provided, get menus assigned to that area
-        db_menus = Menu.get_by_sales_area(sales_area_id)
+        db_menus = Menu.get_by_sales_area(sales_area_id, only_published=active_only)
     else:
-        # Otherwise, get all menus
-        db_menus = Menu.find_all(where=where, order_by="name ASC")
+        where = {"status": Menu.STATUS_PUBLISHED} if active_only else None
+        db_menus = Menu.find_all(where=where, order_by="valid_date DESC, name ASC")
     
     # Convert to response model
     menus = [
         MenuResponse(
             id=menu['id'],
             name=menu['name'],
-            description=menu['description'],
-            is_active=menu['is_active'],
+            valid_date=menu['valid_date'],
+            status=menu['status'],
+            created_by=menu.get('created_by'),
             created_at=menu.get('created_at'),
             updated_at=menu.get('updated_at')
         ) for menu in db_menus
@@ -182,6 +197,50 @@ async def get_menu(
         "data": menu_response
     }
 
+@router.get("/{menu_id}/document")
+def get_menu_document(
+    request: Request,
+    menu_id: int = Path(..., gt=0),
+    sales_area_id: int = Query(PublishedMenuDocument.NO_AREA, ge=0, description="Sales area of the document"),
+    current_user: dict = Depends(require_dependiente)
+):
+    """
+    Get the precompiled document of a published menu: the menu with its
+    items grouped by category, compiled when the menu is published and
+    recompiled only when the menu, its items or their products change.
+    Accessible to all authenticated users.
+    Supports conditional GET through ETag/If-None-Match.
+    
+    Args:
+        menu_id: The ID of the published menu
+        sales_area_id: Sales area the menu is assigned to (0 for none)
+        
+    Returns:
+        Response: The stored JSON document, or 304 if unchanged
+    """
+    logger.info(f"User {current_user['username']} is retrieving the document of menu {menu_id}")
+    
+    try:
+        document = menu_documents.get_document(menu_id, sales_area_id)
+    except (RuntimeError, pymysql.MySQLError) as e:
+        logger.error(f"Error loading the document of menu {menu_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos no disponible"
+        )
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Carta publicada no encontrada para el área indicada"
+        )
+    
+    body, etag = document
+    headers = {"ETag": etag, "Cache-Control": http_cache.CACHE_MENUS}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and http_cache.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.put("/{menu_id}", response_model=MenuDetailResponse)
 async def update_menu(
     menu: MenuUpdate,
@@ -221,6 +280,14 @@ async def update_menu(
             detail="No se pudo actualizar el menú"
         )
     
+    # Publishing compiles the menu documents served by GET /{menu_id}/document
+    if menu_data.get("status") == Menu.STATUS_PUBLISHED:
+        try:
+            menu_documents.compile_menu(menu_id)
+        except (RuntimeError, pymysql.MySQLError) as e:
+            # The first read of the document compiles it instead
+            logger.error(f"Error compiling the documents of menu {menu_id}: {e}")
+    
     # Update sales areas if provided
     if menu.sales_area_ids is not None:
         Menu.update_sales_areas(menu_id, menu.sales_area_ids)
@@ -334,3 +401,116 @@ async def assign_menu_to_sales_areas(
         "status": "success",
         "message": "Menú asignado a las áreas de venta exitosamente"
     }
+
+@router.post("/{menu_id}/clone", response_model=MenuCloneResponse, status_code=status.HTTP_201_CREATED)
+async def clone_menu(
+    menu_id: int = Path(..., gt=0),
+    valid_date: date = Query(..., description="Date of the new menu"),
+    name: Optional[str] = Query(None, min_length=2, max_length=100, description="Name of the new menu (defaults to the original's)"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Copy a menu, its items and its sales areas to a new draft menu.
+    Only accessible to Soporte and Administrador roles.
+    
+    The copy is made in one transaction with a fixed number of statements,
+    whatever the size of the menu.
+    
+    Args:
+        menu_id: The ID of the menu to copy
+        valid_date: Date of the new menu
+        name: Name of the new menu
+        
+    Returns:
+        MenuCloneResponse: The new menu and the number of items and sales areas copied
+    """
+    logger.info(f"User {current_user['username']} is cloning menu {menu_id} for {valid_date}")
+    
+    try:
+        result = Menu.clone(menu_id, valid_date, name=name, created_by=current_user['user_id'])
+    except Exception as e:
+        logger.error(f"Error cloning menu {menu_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No se pudo copiar el menú"
+        )
+    
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Menu not found"
+        )
+    
+    new_menu_id, items_copied, areas_copied = result
+    db_menu = Menu.find_by_id(new_menu_id)
+    
+    return {
+        "status": "success",
+        "message": "Menú copiado exitosamente",
+        "data": {
+            "menu": MenuResponse(**db_menu),
+            "items_copied": items_copied,
+            "sales_areas_copied": areas_copied,
+        }
+    }
+
+@router.patch("/{menu_id}/prices", response_model=MenuPriceAdjustmentResponse)
+async def adjust_menu_prices(
+    adjustment: MenuPriceAdjustment,
+    menu_id: int = Path(..., gt=0),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Raise or lower the prices of a menu's items, optionally of one category.
+    Only accessible to Soporte and Administrador roles.
+    
+    The adjustment is a single UPDATE, whatever the number of items. Prices
+    are rounded to cents and never drop below 0.01.
+    
+    Args:
+        adjustment: Mode (percent or absolute), amount and optional category
+        menu_id: The ID of the menu
+        
+    Returns:
+        MenuPriceAdjustmentResponse: Number of items whose price changed
+    """
+    logger.info(
+        f"User {current_user['username']} is adjusting prices of menu {menu_id}: "
+        f"{adjustment.mode} {adjustment.amount} (category {adjustment.category_id})"
+    )
+    
+    if adjustment.mode not in Menu.PRICE_EXPRESSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Modo de ajuste inválido. Debe ser uno de: {', '.join(Menu.PRICE_EXPRESSIONS)}"
+        )
+    if adjustment.mode == Menu.PRICE_PERCENT and adjustment.amount <= -100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El porcentaje debe ser mayor que -100"
+        )
+    
+    if not Menu.find_by_id(menu_id, columns=("id",)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Menu not found"
+        )
+    
+    items_updated = Menu.adjust_prices(
+        menu_id, adjustment.mode, adjustment.amount, category_id=adjustment.category_id
+    )
+    if items_updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No se pudieron ajustar los precios del menú"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Precios del menú ajustados exitosamente",
+        "data": {
+            "menu_id": menu_id,
+            "category_id": adjustment.category_id,
+            "items_updated": items_updated,
+        }
+    }
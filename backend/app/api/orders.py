@@ -3,26 +3,37 @@ Orders router.
 Provides endpoints for managing orders (comandas).
 Accessible to all authenticated users (Dependiente, Administrador, Soporte).
 """
+import csv
+import io
+import json
 import logging
-from typing import List, Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from typing import List, Optional, Iterator
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+import pymysql
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from app.utils.auth_middleware import require_dependiente, require_admin
 from app.schemas.order import (
     OrderCreate, OrderUpdate, OrderResponse, OrdersResponse,
-    OrderDetailResponse, OrderStatusUpdate
+    OrderDetailResponse, OrderStatusUpdate, OrderBatchRequest, OrderBatchResponse
 )
 from app.schemas.order_item import (
     OrderItemCreate, OrderItemUpdate, OrderItemResponse
 )
+from app.models.base import VersionConflict
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.service_spot import ServiceSpot
+from app.services import menu_resolver, order_batch, price_book
+from app.utils.http_cache import parse_if_match, row_etag, version_conflict
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Resource name in the row ETags of this router
+ETAG_ORDERS = "orders"
+
 router = APIRouter(
     prefix="/api/v1/orders",
     tags=["Orders"],
@@ -37,8 +48,8 @@ async def get_orders(
     current_user: dict = Depends(require_dependiente),
     status: Optional[str] = None,
     service_spot_id: Optional[int] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
     page: int = Query(1, gt=0),
     limit: int = Query(20, gt=0)
 ):
@@ -69,35 +80,39 @@ async def get_orders(
     if service_spot_id:
         where["service_spot_id"] = service_spot_id
     
-    # Date filtering
-    date_filter = {}
+    # Date filtering (date_to is inclusive)
     if date_from:
-        date_filter["from"] = date_from
+        where["created_at__gte"] = date_from
     if date_to:
-        date_filter["to"] = date_to
+        where["created_at__lt"] = date_to + timedelta(days=1)
     
     # Get orders from database with pagination
     db_orders = Order.find_all(
         where=where, 
-        date_filter=date_filter,
         order_by="created_at DESC",
         limit=limit,
         offset=offset
     )
     
     # Get total count for pagination
-    total_count = Order.count(where=where, date_filter=date_filter)
+    total_count = Order.count(where=where)
+    
+    # Get the items of the whole page at once
+    items_by_order = {}
+    for item in OrderItem.find_all(where={"order_id__in": [order["id"] for order in db_orders]}):
+        items_by_order.setdefault(item["order_id"], []).append(item)
     
     # Convert to response model
     orders = []
     for order in db_orders:
-        # Get order items
-        order_items = OrderItem.find_all(where={"order_id": order["id"]})
+        order_items = items_by_order.get(order["id"], [])
         
         orders.append(
             OrderResponse(
                 id=order["id"],
                 service_spot_id=order["service_spot_id"],
+                sales_area_id=order["sales_area_id"],
+                menu_id=order["menu_id"],
                 status=order["status"],
                 total_amount=order["total_amount"],
                 tax_amount=order["tax_amount"],
@@ -105,7 +120,8 @@ async def get_orders(
                 items=order_items,
                 created_at=order.get("created_at"),
                 updated_at=order.get("updated_at"),
-                closed_at=order.get("closed_at")
+                closed_at=order.get("closed_at"),
+                version=order.get("version")
             )
         )
     
@@ -124,6 +140,107 @@ async def get_orders(
         }
     }
 
+# Rows serialised into one chunk of the export stream
+EXPORT_ROWS_PER_CHUNK = 500
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def _export_value(value):
+    """Convert a raw export cell to a JSON/CSV friendly value."""
+    if isinstance(value, Decimal):
+        # Keep money exact instead of going through float
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _export_ndjson(columns, rows) -> Iterator[bytes]:
+    """Encode export rows as newline-delimited JSON, one object per row."""
+    chunk = []
+    for row in rows:
+        record = dict(zip(columns, map(_export_value, row)))
+        chunk.append(json.dumps(record, ensure_ascii=False))
+        if len(chunk) >= EXPORT_ROWS_PER_CHUNK:
+            yield ("\n".join(chunk) + "\n").encode("utf-8")
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode("utf-8")
+
+def _export_csv(columns, rows) -> Iterator[bytes]:
+    """Encode export rows as CSV with a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_export_value(value) for value in row])
+        pending += 1
+        if pending >= EXPORT_ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+@router.get("/export")
+async def export_orders(
+    from_date: date = Query(..., alias="from", description="First closing date (YYYY-MM-DD)"),
+    to_date: date = Query(..., alias="to", description="Last closing date, inclusive (YYYY-MM-DD)"),
+    format: str = Query("ndjson", description="Export format: ndjson or csv"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Export every paid (cobrada) order and its items for a date range.
+    Only accessible to Soporte and Administrador roles.
+    
+    The response is streamed from an unbuffered server-side cursor, one row
+    per order item, so memory stays flat no matter how many rows are exported.
+    
+    Args:
+        from_date: First closing date to include
+        to_date: Last closing date to include
+        format: ndjson (one JSON object per line) or csv
+        
+    Returns:
+        StreamingResponse: The exported rows
+    """
+    logger.info(f"User {current_user['username']} is exporting orders from {from_date} to {to_date} as {format}")
+    
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format. Must be one of: {', '.join(EXPORT_MEDIA_TYPES)}"
+        )
+    
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be on or before 'to'"
+        )
+    
+    # Connect and start the query before answering, so an outage is a 503
+    # rather than a 200 with an empty export
+    try:
+        columns, rows = await run_in_threadpool(Order.stream_closed_with_items, from_date, to_date)
+    except (RuntimeError, pymysql.MySQLError) as e:
+        logger.error(f"Error exporting orders from {from_date} to {to_date}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos no disponible"
+        )
+    encoder = _export_csv if format == "csv" else _export_ndjson
+    filename = f"orders_{from_date.isoformat()}_{to_date.isoformat()}.{format}"
+    
+    return StreamingResponse(
+        encoder(columns, rows),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.post("/", response_model=OrderDetailResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order: OrderCreate,
@@ -143,21 +260,39 @@ async def create_order(
     logger.info(f"current_user dict: {current_user}")
     
     # Check if service spot exists and is available
-    spot = ServiceSpot.find_by_id(order.service_spot_id)
+    spot = ServiceSpot.find_by_id(order.service_spot_id, columns=("id", "sales_area_id"))
     if not spot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service spot not found"
         )
+    if order.sales_area_id != spot["sales_area_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El service spot no pertenece al área de venta indicada"
+        )
     
-    # Prepare order data
-    order_data = order.dict(exclude={"items"})
-    
-    # Add creator info
-    order_data["created_by"] = current_user["user_id"]
+    # The menu is the one published for the spot's area today, not the client's
+    menu = menu_resolver.resolve(spot["sales_area_id"])
+    if not menu:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No hay una carta publicada para el área de venta hoy"
+        )
+    if order.menu_id is not None and order.menu_id != menu["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El menú indicado no es la carta vigente del área de venta"
+        )
     
-    # Create order in database
-    new_order_id = Order.create(order_data)
+    # Create the order and update its spot's status in one transaction
+    new_order_id = Order.create_order(
+        order.service_spot_id,
+        spot["sales_area_id"],
+        menu["id"],
+        current_user["user_id"],
+        status=order.status or Order.STATUS_OPEN
+    )
     
     if not new_order_id:
         raise HTTPException(
@@ -165,9 +300,6 @@ async def create_order(
             detail="No se pudo crear la orden"
         )
     
-    # Update service spot status
-    ServiceSpot.update_status(order.service_spot_id, "pedido_abierto")
-    
     # Get the created order with items
     created_order = Order.get_with_items(new_order_id)
     
@@ -213,8 +345,52 @@ async def create_order(
         "data": order_response
     }
 
+@router.post("/batch", response_model=OrderBatchResponse)
+def submit_order_batch(
+    batch: OrderBatchRequest,
+    current_user: dict = Depends(require_dependiente)
+):
+    """
+    Submit a batch of queued order operations (create_order, add_items).
+    Accessible to all authenticated users.
+    
+    The batch is applied in one transaction with bulk item inserts. Each
+    operation carries a client-generated idempotency key; replayed keys
+    return the stored outcome (status "duplicate") instead of being applied
+    again, and invalid operations are rejected individually.
+    
+    Args:
+        batch: The queued operations, in the order they were made offline
+        
+    Returns:
+        OrderBatchResponse: One result per operation, in request order
+    """
+    logger.info(
+        f"User {current_user['username']} is submitting a batch of {len(batch.operations)} order operations"
+    )
+    
+    try:
+        results = order_batch.submit_batch(
+            [operation.dict() for operation in batch.operations],
+            current_user["user_id"]
+        )
+    except Exception as e:
+        logger.error(f"Error applying order batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No se pudo procesar el lote de operaciones"
+        )
+    
+    applied = sum(1 for result in results if result["status"] == order_batch.RESULT_APPLIED)
+    return {
+        "status": "success",
+        "message": f"Lote procesado: {applied} de {len(results)} operaciones aplicadas",
+        "data": results
+    }
+
 @router.get("/{order_id}", response_model=OrderDetailResponse)
 async def get_order(
+    response: Response,
     order_id: int = Path(..., gt=0),
     current_user: dict = Depends(require_dependiente)
 ):
@@ -239,10 +415,15 @@ async def get_order(
             detail="Order not found"
         )
     
+    # Clients send it back in If-Match to make their edits conditional
+    response.headers["ETag"] = row_etag(ETAG_ORDERS, order_id, db_order["version"])
+    
     # Convert to response model
     order_response = OrderResponse(
         id=db_order["id"],
         service_spot_id=db_order["service_spot_id"],
+        sales_area_id=db_order["sales_area_id"],
+        menu_id=db_order["menu_id"],
         status=db_order["status"],
         total_amount=db_order["total_amount"],
         tax_amount=db_order["tax_amount"],
@@ -250,7 +431,8 @@ async def get_order(
         items=db_order.get("items", []),
         created_at=db_order.get("created_at"),
         updated_at=db_order.get("updated_at"),
-        closed_at=db_order.get("closed_at")
+        closed_at=db_order.get("closed_at"),
+        version=db_order.get("version")
     )
     
     return {
@@ -262,6 +444,8 @@ async def get_order(
 @router.put("/{order_id}", response_model=OrderDetailResponse)
 async def update_order(
     order: OrderUpdate,
+    request: Request,
+    response: Response,
     order_id: int = Path(..., gt=0),
     current_user: dict = Depends(require_dependiente)
 ):
@@ -269,6 +453,10 @@ async def update_order(
     Update an existing order.
     Accessible to all authenticated users.
     
+    With an `If-Match` header carrying the order's ETag the update only
+    applies if nobody changed the order in between (409 otherwise).
+    Replacement items are priced from the order's menu.
+    
     Args:
         order_id: The ID of the order to update
         order: The order data to update
@@ -278,54 +466,54 @@ async def update_order(
     """
     logger.info(f"User {current_user['username']} is updating order {order_id}")
     
-    # Check if order exists
-    db_order = Order.find_by_id(order_id)
-    if not db_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found"
-        )
+    expected_version = parse_if_match(request, ETAG_ORDERS, order_id)
+    items = [item.dict() for item in order.items] if order.items is not None else None
     
-    # Only allow updates to non-closed orders
-    if db_order["status"] == "cobrada":
+    # Status and items change in one transaction guarded by the row version;
+    # status changes go through the transition so the sales rollup stays in sync
+    try:
+        success = Order.apply_update(
+            order_id,
+            new_status=order.status,
+            items=items,
+            closed_by=current_user["user_id"],
+            expected_version=expected_version
+        )
+    except VersionConflict as e:
+        raise version_conflict(ETAG_ORDERS, order_id, e.current_version)
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot update a closed order"
         )
-    
-    # Update order data
-    order_data = {k: v for k, v in order.dict(exclude={"items"}).items() if v is not None}
-    
-    # Update in database
-    success = Order.update(order_id, order_data)
-    
-    if not success:
+    except price_book.PriceBookError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error updating order {order_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="No se pudo actualizar la orden"
         )
     
-    # Handle items updates if provided
-    if order.items is not None:
-        # Remove existing items
-        OrderItem.delete_by_order_id(order_id)
-        
-        # Add new items
-        for item in order.items:
-            item_data = item.dict()
-            item_data["order_id"] = order_id
-            OrderItem.create(item_data)
-    
-    # Update order total
-    Order.update_total(order_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
     
     # Get the updated order with items
     updated_order = Order.get_with_items(order_id)
+    response.headers["ETag"] = row_etag(ETAG_ORDERS, order_id, updated_order["version"])
     
     # Convert to response model
     order_response = OrderResponse(
         id=updated_order["id"],
         service_spot_id=updated_order["service_spot_id"],
+        sales_area_id=updated_order["sales_area_id"],
+        menu_id=updated_order["menu_id"],
         status=updated_order["status"],
         total_amount=updated_order["total_amount"],
         tax_amount=updated_order["tax_amount"],
@@ -333,7 +521,8 @@ async def update_order(
         items=updated_order.get("items", []),
         created_at=updated_order.get("created_at"),
         updated_at=updated_order.get("updated_at"),
-        closed_at=updated_order.get("closed_at")
+        closed_at=updated_order.get("closed_at"),
+        version=updated_order.get("version")
     )
     
     return {
@@ -345,12 +534,15 @@ async def update_order(
 @router.patch("/{order_id}/status", response_model=OrderDetailResponse)
 async def update_order_status(
     status_update: OrderStatusUpdate,
+    request: Request,
+    response: Response,
     order_id: int = Path(..., gt=0),
     current_user: dict = Depends(require_dependiente)
 ):
     """
     Update an order's status.
     Accessible to all authenticated users.
+    Honors `If-Match` like PUT /{order_id}.
     
     Args:
         order_id: The ID of the order to update
@@ -361,13 +553,7 @@ async def update_order_status(
     """
     logger.info(f"User {current_user['username']} is updating order {order_id} status to {status_update.status}")
     
-    # Check if order exists
-    db_order = Order.find_by_id(order_id)
-    if not db_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found"
-        )
+    expected_version = parse_if_match(request, ETAG_ORDERS, order_id)
     
     # Validate status value
     valid_statuses = ['abierta', 'en_preparación', 'servida', 'cobrada', 'cancelada']
@@ -377,14 +563,26 @@ async def update_order_status(
             detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
         )
     
-    # Update status
-    update_data = {"status": status_update.status}
+    # Update status (also keeps the DailySales rollup in sync when the
+    # order enters or leaves 'cobrada', and the service spot status)
+    try:
+        success = Order.transition_status(
+            order_id,
+            status_update.status,
+            closed_by=status_update.closed_by or current_user["user_id"],
+            expected_version=expected_version
+        )
+    except VersionConflict as e:
+        raise version_conflict(ETAG_ORDERS, order_id, e.current_version)
     
-    # If closing the order, set closed_at timestamp
-    if status_update.status == "cobrada":
-        update_data["closed_at"] = datetime.now()
+    # Get the updated order with items
+    updated_order = Order.get_with_items(order_id)
     
-    success = Order.update(order_id, update_data)
+    if not updated_order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
     
     if not success:
         raise HTTPException(
@@ -392,24 +590,14 @@ async def update_order_status(
             detail="Failed to update order status"
         )
     
-    # Update service spot status based on order status
-    if status_update.status == "cobrada":
-        # Run the stored procedure to update the spot status
-        try:
-            Order.execute_custom_query(
-                "CALL update_spot_status(%s)",
-                (db_order["service_spot_id"],)
-            )
-        except Exception as e:
-            logger.error(f"Error updating spot status: {e}")
-    
-    # Get the updated order with items
-    updated_order = Order.get_with_items(order_id)
+    response.headers["ETag"] = row_etag(ETAG_ORDERS, order_id, updated_order["version"])
     
     # Convert to response model
     order_response = OrderResponse(
         id=updated_order["id"],
         service_spot_id=updated_order["service_spot_id"],
+        sales_area_id=updated_order["sales_area_id"],
+        menu_id=updated_order["menu_id"],
         status=updated_order["status"],
         total_amount=updated_order["total_amount"],
         tax_amount=updated_order["tax_amount"],
@@ -417,7 +605,8 @@ async def update_order_status(
         items=updated_order.get("items", []),
         created_at=updated_order.get("created_at"),
         updated_at=updated_order.get("updated_at"),
-        closed_at=updated_order.get("closed_at")
+        closed_at=updated_order.get("closed_at"),
+        version=updated_order.get("version")
     )
     
     return {
@@ -451,11 +640,8 @@ async def delete_order(
             detail="Order not found"
         )
     
-    # Delete the order items first
-    OrderItem.delete_by_order_id(order_id)
-    
-    # Delete the order
-    success = Order.delete(order_id)
+    # Rollup, items, order and spot status change in one transaction
+    success = Order.delete_with_items(order_id)
     
     if not success:
         raise HTTPException(
@@ -463,19 +649,12 @@ async def delete_order(
             detail="No se pudo eliminar la orden"
         )
     
-    # Update service spot status
-    try:
-        Order.execute_custom_query(
-            "CALL update_spot_status(%s)",
-            (db_order["service_spot_id"],)
-        )
-    except Exception as e:
-        logger.error(f"Error updating spot status: {e}")
-    
     # Convert to response model
     order_response = OrderResponse(
         id=db_order["id"],
         service_spot_id=db_order["service_spot_id"],
+        sales_area_id=db_order["sales_area_id"],
+        menu_id=db_order["menu_id"],
         status=db_order["status"],
         total_amount=db_order["total_amount"],
         tax_amount=db_order["tax_amount"],
@@ -483,7 +662,8 @@ async def delete_order(
         items=db_order.get("items", []),
         created_at=db_order.get("created_at"),
         updated_at=db_order.get("updated_at"),
-        closed_at=db_order.get("closed_at")
+        closed_at=db_order.get("closed_at"),
+        version=db_order.get("version")
     )
     
     return {
@@ -502,6 +682,9 @@ async def add_order_item(
     Add a new item to an existing order.
     Accessible to all authenticated users.
     
+    The unit price is the product's price on the order's menu; products
+    that are not on it or are unavailable are rejected.
+    
     Args:
         order_id: The ID of the order to add an item to
         item: The order item data to add
@@ -528,9 +711,27 @@ async def add_order_item(
     
     # Log the payload recibido
     logger.info(f"Payload recibido en add_order_item: {item}")
+    
+    # The price comes from the order's menu, never from the client
+    try:
+        priced = price_book.price_items(db_order["menu_id"], [item.dict()])[0]
+    except price_book.PriceBookError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except RuntimeError as e:
+        logger.error(f"Error pricing item for order {order_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No se pudieron obtener los precios de la carta"
+        )
+
     # Create the order item
-    item_data = item.dict()
-    item_data["order_id"] = order_id
+    item_data = OrderItem._item_row(
+        order_id, priced["product_id"], priced["quantity"], priced["unit_price"], priced.get("notes")
+    )
+    item_data["status"] = item.status or OrderItem.STATUS_PENDING
     new_item_id = OrderItem.create(item_data)
     
     if not new_item_id:
@@ -549,6 +750,8 @@ async def add_order_item(
     order_response = OrderResponse(
         id=updated_order["id"],
         service_spot_id=updated_order["service_spot_id"],
+        sales_area_id=updated_order["sales_area_id"],
+        menu_id=updated_order["menu_id"],
         status=updated_order["status"],
         total_amount=updated_order["total_amount"],
         tax_amount=updated_order["tax_amount"],
@@ -556,7 +759,8 @@ async def add_order_item(
         items=updated_order.get("items", []),
         created_at=updated_order.get("created_at"),
         updated_at=updated_order.get("updated_at"),
-        closed_at=updated_order.get("closed_at")
+        closed_at=updated_order.get("closed_at"),
+        version=updated_order.get("version")
     )
     
     return {
@@ -600,7 +804,7 @@ async def delete_order_item(
         )
     
     # Check if item exists for this order
-    db_item = OrderItem.find_one({"id": item_id, "order_id": order_id})
+    db_item = OrderItem.find_one({"id": item_id, "order_id": order_id}, columns=("id",))
     if not db_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -626,6 +830,8 @@ async def delete_order_item(
     order_response = OrderResponse(
         id=updated_order["id"],
         service_spot_id=updated_order["service_spot_id"],
+        sales_area_id=updated_order["sales_area_id"],
+        menu_id=updated_order["menu_id"],
         status=updated_order["status"],
         total_amount=updated_order["total_amount"],
         tax_amount=updated_order["tax_amount"],
@@ -633,7 +839,8 @@ async def delete_order_item(
         items=updated_order.get("items", []),
         created_at=updated_order.get("created_at"),
         updated_at=updated_order.get("updated_at"),
-        closed_at=updated_order.get("closed_at")
+        closed_at=updated_order.get("closed_at"),
+        version=updated_order.get("version")
     )
     
     return {
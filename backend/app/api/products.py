@@ -4,19 +4,22 @@ Provides endpoints for product management.
 Only accessible to users with Soporte or Administrador roles.
 """
 import logging
+import hashlib
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status, File, UploadFile, Form
-from app.utils.auth_middleware import require_admin, get_current_user
+import pymysql
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status, File, UploadFile, Form
+from app.utils.auth_middleware import require_admin, require_dependiente, get_current_user
+from app.utils import http_cache
 from app.schemas.product import (
     ProductCreate, ProductUpdate, ProductResponse, ProductsResponse,
     ProductDetailResponse, ProductWithCategoryResponse, ProductWithCategoryDetailResponse,
-    ProductAvailabilityUpdate, ProductSearchResponse
+    ProductAvailabilityUpdate, ProductSearchResponse, ProductSuggestResponse,
+    BulkAvailabilityUpdate, BulkAvailabilityResponse
 )
 from app.models.product import Product
 from app.models.product_category import ProductCategory
+from app.services import events, menu_suggest
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -28,13 +31,14 @@ router = APIRouter(
     },
 )
 
-@router.get("/", response_model=ProductsResponse)
+@router.get("/", response_model=ProductsResponse, response_model_exclude_unset=True)
 async def get_products(
     current_user: dict = Depends(require_admin),
     skip: int = 0,
     limit: int = 100,
     category_id: Optional[int] = None,
-    available_only: bool = False
+    available_only: bool = False,
+    compact: bool = Query(False, description="Solo los campos del selector de productos")
 ):
     """
     Get all products with optional filtering.
@@ -45,6 +49,7 @@ async def get_products(
         limit: Maximum number of records to return
         category_id: Optional filter by category
         available_only: Whether to show only available products
+        compact: Return only Product.PICKER_COLUMNS
 
     Returns:
         ProductsResponse: A list of products
@@ -63,24 +68,29 @@ async def get_products(
         where=where,
         order_by="name ASC",
         limit=limit,
-        offset=skip
+        offset=skip,
+        columns=Product.PICKER_COLUMNS if compact else None
     )
 
     # Convert to response model
-    products = [
-        ProductResponse(
-            id=product['id'],
-            name=product['name'],
-            description=product['description'],
-            price=product['price'],
-            image=product['image'],
-            is_available=product['is_available'],
-            category_id=product['category_id'],
-            created_by=product.get('created_by'),
-            created_at=product.get('created_at'),
-            updated_at=product.get('updated_at')
-        ) for product in db_products
-    ]
+    if compact:
+        # Only the selected fields are set, so nothing else is serialized
+        products = [ProductResponse(**product) for product in db_products]
+    else:
+        products = [
+            ProductResponse(
+                id=product['id'],
+                name=product['name'],
+                description=product['description'],
+                price=product['price'],
+                image=product['image'],
+                is_available=product['is_available'],
+                category_id=product['category_id'],
+                created_by=product.get('created_by'),
+                created_at=product.get('created_at'),
+                updated_at=product.get('updated_at')
+            ) for product in db_products
+        ]
 
     return {
         "status": "success",
@@ -106,7 +116,7 @@ async def create_product(
     logger.info(f"User {current_user['username']} is creating a new product")
 
     # Check if category exists
-    category = ProductCategory.find_by_id(product.category_id)
+    category = ProductCategory.find_by_id(product.category_id, columns=("id",))
     if not category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -149,6 +159,58 @@ async def create_product(
         "data": product_response
     }
 
+@router.get("/suggest", response_model=ProductSuggestResponse)
+def suggest_products(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    sales_area_id: int = Query(..., gt=0),
+    limit: int = Query(menu_suggest.DEFAULT_LIMIT, gt=0, le=menu_suggest.MAX_LIMIT),
+    current_user: dict = Depends(require_dependiente)
+):
+    """
+    Typeahead suggestions for the waiter product picker.
+    Accessible to Soporte, Administrador and Dependiente roles.
+
+    Matches the available items of the menu that applies to the sales area
+    today (the one orders are created on) whose name, or one of its words, starts with the typed text. Served
+    from an in-memory index; supports If-None-Match with the returned ETag.
+
+    Args:
+        q: The typed text
+        sales_area_id: The waiter's sales area
+        limit: Maximum number of suggestions
+
+    Returns:
+        ProductSuggestResponse: The suggestions, or 304 if unchanged
+    """
+    try:
+        index = menu_suggest.get_index(sales_area_id)
+    except (RuntimeError, pymysql.MySQLError) as e:
+        logger.error(f"Error loading suggestions for sales area {sales_area_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos no disponible"
+        )
+    # The body echoes q as typed, so the tag covers the exact text, not the
+    # normalized one the index matches on
+    etag = '"' + hashlib.sha1(
+        f"{sales_area_id}:{index.version}:{limit}:{q}".encode()
+    ).hexdigest()[:20] + '"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and http_cache.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    suggestions = index.suggest(q, limit)
+    response.headers["ETag"] = etag
+    return {
+        "status": "success",
+        "message": f"Found {len(suggestions)} suggestions for '{q}'",
+        "data": suggestions,
+        "query": q
+    }
+
 @router.get("/{product_id}", response_model=ProductWithCategoryDetailResponse)
 async def get_product(
     product_id: int = Path(..., gt=0),
@@ -225,7 +287,7 @@ async def update_product(
 
     # Check if category exists if changing category
     if product.category_id is not None:
-        category = ProductCategory.find_by_id(product.category_id)
+        category = ProductCategory.find_by_id(product.category_id, columns=("id",))
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -303,6 +365,13 @@ async def update_product_availability(
             detail="Failed to update product availability"
         )
 
+    events.publish(events.EVENT_AVAILABILITY, {
+        "is_available": availability.is_available,
+        "product_ids": [product_id],
+        "menu_item_ids": [],
+        "changed_by": current_user['username'],
+    })
+
     # Get the updated product
     updated_product = Product.find_by_id(product_id)
 
@@ -326,6 +395,60 @@ async def update_product_availability(
         "data": product_response
     }
 
+@router.patch("/availability", response_model=BulkAvailabilityResponse)
+def update_availability_bulk(
+    update: BulkAvailabilityUpdate,
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Set the availability of many products and menu items in one request.
+    Only accessible to Soporte and Administrador roles.
+
+    Both tables are updated with one statement each in a single transaction;
+    catalog ETags change and connected clients receive an `availability`
+    event on GET /api/v1/events.
+
+    Args:
+        update: The availability and the product and menu item IDs
+
+    Returns:
+        BulkAvailabilityResponse: The number of rows changed
+    """
+    logger.info(
+        f"User {current_user['username']} is setting availability={update.is_available} on "
+        f"{len(update.product_ids)} products and {len(update.menu_item_ids)} menu items"
+    )
+
+    if not update.product_ids and not update.menu_item_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe indicar al menos un producto o ítem de menú"
+        )
+
+    try:
+        products_updated, menu_items_updated = Product.update_availability_bulk(
+            update.is_available,
+            product_ids=update.product_ids,
+            menu_item_ids=update.menu_item_ids,
+            changed_by=current_user['username']
+        )
+    except Exception as e:
+        logger.error(f"Error updating availability in bulk: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No se pudo actualizar la disponibilidad"
+        )
+
+    return {
+        "status": "success",
+        "message": "Disponibilidad actualizada exitosamente",
+        "data": {
+            "is_available": update.is_available,
+            "products_updated": products_updated,
+            "menu_items_updated": menu_items_updated,
+        }
+    }
+
 @router.delete("/{product_id}", response_model=ProductDetailResponse)
 async def delete_product(
     product_id: int = Path(..., gt=0),
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from app.models.product_category import ProductCategory
 from app.schemas.product_category import ProductCategoryWithProductsResponse
+from app.utils import http_cache
 from typing import List
 
 router = APIRouter(prefix="/api/v1/products-grouped", tags=["products-grouped"])
 
 @router.get("/", response_model=List[ProductCategoryWithProductsResponse])
-def get_categories_with_products():
+def get_categories_with_products(request: Request, response: Response):
     """
     Get all active product categories with their available products grouped.
+    Supports conditional GET: a matching If-None-Match returns 304 without
+    running the grouped query.
     """
+    not_modified = http_cache.check_not_modified(
+        request, response, ("ProductCategories", "Products"), http_cache.CACHE_CATALOG
+    )
+    if not_modified:
+        return not_modified
+    
     categories_with_products = ProductCategory.get_with_products()
     # El resultado ya está agrupado y estructurado desde el modelo, pero puede requerir ajuste de claves para el esquema
     # Ajustamos el formato para el esquema de respuesta
@@ -0,0 +1,88 @@
+"""
+Reports router.
+Provides sales reporting endpoints backed by the DailySales rollup.
+Only accessible to users with Soporte or Administrador roles.
+"""
+import logging
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.utils.auth_middleware import require_admin
+from app.schemas.report import SalesReportRow, SalesReportResponse
+from app.models.daily_sales import DailySales
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/reports",
+    tags=["Reports"],
+    responses={
+        403: {"description": "Prohibido - Permisos insuficientes"},
+        401: {"description": "No autorizado - No autenticado"}
+    },
+)
+
+@router.get("/sales", response_model=SalesReportResponse)
+async def get_sales_report(
+    from_date: date = Query(..., alias="from", description="First sale date (YYYY-MM-DD)"),
+    to_date: date = Query(..., alias="to", description="Last sale date, inclusive (YYYY-MM-DD)"),
+    group_by: str = Query("date", description="Comma separated: date, sales_area, product, user"),
+    sales_area_id: Optional[int] = None,
+    product_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get aggregated sales for a date range.
+    Only accessible to Soporte and Administrador roles.
+    
+    Reads the pre-aggregated DailySales rollup instead of scanning the
+    transactional Orders and OrderItems tables.
+    
+    Args:
+        from_date: First sale date to include
+        to_date: Last sale date to include
+        group_by: Dimensions to group by
+        sales_area_id: Optional filter by sales area
+        product_id: Optional filter by product
+        user_id: Optional filter by user (waiter who opened the order)
+        
+    Returns:
+        SalesReportResponse: The aggregated rows
+    """
+    logger.info(f"User {current_user['username']} requested sales report from {from_date} to {to_date}")
+    
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be on or before 'to'"
+        )
+    
+    dimensions = [d.strip() for d in group_by.split(",") if d.strip()]
+    invalid = [d for d in dimensions if d not in DailySales.GROUP_BY_COLUMNS]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid group_by. Must be any of: {', '.join(DailySales.GROUP_BY_COLUMNS)}"
+        )
+    
+    db_rows = DailySales.get_report(
+        from_date,
+        to_date,
+        group_by=list(dict.fromkeys(dimensions)),
+        sales_area_id=sales_area_id,
+        product_id=product_id,
+        user_id=user_id
+    )
+    
+    rows = [
+        SalesReportRow(**{k: v for k, v in row.items() if v is not None})
+        for row in db_rows
+    ]
+    
+    return {
+        "status": "success",
+        "message": "Reporte de ventas obtenido exitosamente",
+        "data": rows,
+        "group_by": dimensions
+    }
@@ -5,16 +5,15 @@ Only accessible to users with Soporte or Administrador roles.
 """
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from app.utils.auth_middleware import require_admin, require_dependiente
+from app.utils import http_cache
 from app.schemas.sales_area import (
     SalesAreaCreate, SalesAreaUpdate, SalesAreaResponse, SalesAreasResponse,
     SalesAreaDetailResponse, SalesAreaWithSpotsResponse, SalesAreaWithSpotsDetailResponse
 )
 from app.models.sales_area import SalesArea
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -30,6 +29,8 @@ from app.schemas.sales_area import SalesAreaWithSpotsResponse
 
 @router.get("/", response_model=dict)
 async def get_sales_areas(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(require_dependiente),
     active_only: bool = True,
     establishment_id: Optional[int] = None
@@ -37,16 +38,24 @@ async def get_sales_areas(
     """
     Get all sales areas.
     Only accessible to Soporte and Administrador roles.
+    Supports conditional GET through ETag/If-None-Match. Spot statuses are
+    embedded, so clients must always revalidate.
     
     Args:
         active_only: Whether to show only active sales areas
         establishment_id: Optional filter by establishment
         
     Returns:
-        SalesAreasResponse: A list of sales areas
+        SalesAreasResponse: A list of sales areas, or 304 if unchanged
     """
     logger.info(f"User {current_user['username']} accessed sales areas list")
     
+    not_modified = http_cache.check_not_modified(
+        request, response, ("SalesAreas", "ServiceSpots"), http_cache.CACHE_LIVE
+    )
+    if not_modified:
+        return not_modified
+    
     # Get sales areas from database
     if active_only:
         db_areas = SalesArea.get_active_areas(establishment_id)
@@ -92,8 +101,6 @@ async def get_sales_areas(
         for area in db_areas
     ]
 
-    import logging
-    logging.warning(f"RESPONSE AREAS DEBUG: {areas}")
     return {
         "status": "success",
         "message": "Áreas de venta recuperadas correctamente",
@@ -4,19 +4,23 @@ Provides endpoints for service spots management (tables, seats, etc.).
 """
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from app.utils.auth_middleware import require_admin, require_dependiente
 from app.schemas.service_spot import (
     ServiceSpotCreate, ServiceSpotUpdate, ServiceSpotResponse, ServiceSpotsResponse,
     ServiceSpotDetailResponse, ServiceSpotStatusUpdate, ServiceSpotWithAreaResponse,
     ServiceSpotWithAreaDetailResponse
 )
+from app.models.base import VersionConflict
 from app.models.service_spot import ServiceSpot
+from app.services import spot_status
+from app.utils.http_cache import parse_if_match, row_etag, version_conflict
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Resource name in the row ETags of this router
+ETAG_SERVICE_SPOTS = "service-spots"
+
 router = APIRouter(
     prefix="/api/v1/service-spots",
     tags=["Service Spots"],
@@ -132,6 +136,7 @@ async def create_service_spot(
 
 @router.get("/{spot_id}", response_model=ServiceSpotWithAreaDetailResponse)
 async def get_service_spot(
+    response: Response,
     spot_id: int = Path(..., gt=0),
     current_user: dict = Depends(require_dependiente)
 ):
@@ -164,6 +169,9 @@ async def get_service_spot(
             detail="Service spot not found"
         )
     
+    # Clients send it back in If-Match to make their edits conditional
+    response.headers["ETag"] = row_etag(ETAG_SERVICE_SPOTS, spot_id, db_spot[0]['version'])
+    
     # Convert to response model
     spot_response = ServiceSpotWithAreaResponse(
         id=db_spot[0]['id'],
@@ -174,7 +182,8 @@ async def get_service_spot(
         sales_area_id=db_spot[0]['sales_area_id'],
         sales_area_name=db_spot[0]['sales_area_name'],
         created_at=db_spot[0].get('created_at'),
-        updated_at=db_spot[0].get('updated_at')
+        updated_at=db_spot[0].get('updated_at'),
+        version=db_spot[0].get('version')
     )
     
     return {
@@ -186,12 +195,16 @@ async def get_service_spot(
 @router.put("/{spot_id}", response_model=ServiceSpotDetailResponse)
 async def update_service_spot(
     service_spot: ServiceSpotUpdate,
+    request: Request,
+    response: Response,
     spot_id: int = Path(..., gt=0),
     current_user: dict = Depends(require_admin)
 ):
     """
     Update a specific service spot.
     Only accessible to Soporte and Administrador roles.
+    With an `If-Match` header carrying the spot's ETag the update only
+    applies if nobody changed the spot in between (409 otherwise).
     
     Args:
         spot_id: The ID of the service spot to update
@@ -202,19 +215,25 @@ async def update_service_spot(
     """
     logger.info(f"User {current_user['username']} is updating service spot {spot_id}")
     
-    # Check if service spot exists
-    db_spot = ServiceSpot.find_by_id(spot_id)
-    if not db_spot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Service spot not found"
-        )
+    expected_version = parse_if_match(request, ETAG_SERVICE_SPOTS, spot_id)
     
     # Update service spot data
     spot_data = {k: v for k, v in service_spot.dict().items() if v is not None}
     
     # Update in database
-    success = ServiceSpot.update(spot_id, spot_data)
+    try:
+        success = ServiceSpot.update(spot_id, spot_data, expected_version=expected_version)
+    except VersionConflict as e:
+        raise version_conflict(ETAG_SERVICE_SPOTS, spot_id, e.current_version)
+    
+    # Get the updated service spot
+    updated_spot = ServiceSpot.find_by_id(spot_id)
+    
+    if not updated_spot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service spot not found"
+        )
     
     if not success:
         raise HTTPException(
@@ -222,8 +241,7 @@ async def update_service_spot(
             detail="Failed to update service spot"
         )
     
-    # Get the updated service spot
-    updated_spot = ServiceSpot.find_by_id(spot_id)
+    response.headers["ETag"] = row_etag(ETAG_SERVICE_SPOTS, spot_id, updated_spot['version'])
     
     # Convert to response model
     spot_response = ServiceSpotResponse(
@@ -234,7 +252,8 @@ async def update_service_spot(
         is_active=updated_spot['is_active'],
         sales_area_id=updated_spot['sales_area_id'],
         created_at=updated_spot.get('created_at'),
-        updated_at=updated_spot.get('updated_at')
+        updated_at=updated_spot.get('updated_at'),
+        version=updated_spot.get('version')
     )
     
     return {
@@ -246,12 +265,15 @@ async def update_service_spot(
 @router.patch("/{spot_id}/status", response_model=ServiceSpotDetailResponse)
 async def update_spot_status(
     status_update: ServiceSpotStatusUpdate,
+    request: Request,
+    response: Response,
     spot_id: int = Path(..., gt=0),
     current_user: dict = Depends(require_dependiente)
 ):
     """
     Update a service spot's status.
     Accessible to all authenticated users.
+    Honors `If-Match` like PUT /{spot_id}.
     
     Args:
         spot_id: The ID of the service spot to update
@@ -262,13 +284,7 @@ async def update_spot_status(
     """
     logger.info(f"User {current_user['username']} is updating service spot {spot_id} status")
     
-    # Check if service spot exists
-    db_spot = ServiceSpot.find_by_id(spot_id)
-    if not db_spot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Service spot not found"
-        )
+    expected_version = parse_if_match(request, ETAG_SERVICE_SPOTS, spot_id)
     
     # Validate status value
     valid_statuses = ['libre', 'ocupado', 'reservado', 'pedido_abierto', 'cobrado']
@@ -279,7 +295,19 @@ async def update_spot_status(
         )
     
     # Update status
-    success = ServiceSpot.update_status(spot_id, status_update.status)
+    try:
+        success = ServiceSpot.update_status(spot_id, status_update.status, expected_version=expected_version)
+    except VersionConflict as e:
+        raise version_conflict(ETAG_SERVICE_SPOTS, spot_id, e.current_version)
+    
+    # Get the updated service spot
+    updated_spot = ServiceSpot.find_by_id(spot_id)
+    
+    if not updated_spot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service spot not found"
+        )
     
     if not success:
         raise HTTPException(
@@ -287,8 +315,7 @@ async def update_spot_status(
             detail="Failed to update service spot status"
         )
     
-    # Get the updated service spot
-    updated_spot = ServiceSpot.find_by_id(spot_id)
+    response.headers["ETag"] = row_etag(ETAG_SERVICE_SPOTS, spot_id, updated_spot['version'])
     
     # Convert to response model
     spot_response = ServiceSpotResponse(
@@ -299,7 +326,8 @@ async def update_spot_status(
         is_active=updated_spot['is_active'],
         sales_area_id=updated_spot['sales_area_id'],
         created_at=updated_spot.get('created_at'),
-        updated_at=updated_spot.get('updated_at')
+        updated_at=updated_spot.get('updated_at'),
+        version=updated_spot.get('version')
     )
     
     return {
@@ -387,3 +415,36 @@ async def reset_all_spots(
         "status": "success",
         "message": "All service spots reset to 'libre' status successfully"
     }
+
+@router.post("/reconcile", response_model=dict)
+def reconcile_spots(
+    sales_area_id: Optional[int] = Query(None, gt=0, description="Limitar a un área de venta"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Recompute service spot statuses from their orders.
+    Only accessible to Soporte and Administrador roles.
+    Fixes spots left out of sync (e.g. after manual database changes).
+    
+    Args:
+        sales_area_id: Optional sales area to limit the recomputation to
+        
+    Returns:
+        dict: Number of spots whose status changed
+    """
+    logger.info(f"User {current_user['username']} is reconciling service spots (area {sales_area_id})")
+    
+    try:
+        changed = spot_status.reconcile(sales_area_id)
+    except Exception as e:
+        logger.error(f"Error reconciling service spots: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No se pudieron recalcular los estados"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Estados de los service spots recalculados",
+        "data": {"changed": changed}
+    }
@@ -0,0 +1,65 @@
+"""
+Sync router.
+Provides incremental (delta) synchronization for offline-capable tablets.
+Accessible to all authenticated users.
+"""
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.utils.auth_middleware import require_dependiente
+from app.services import sync
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/sync",
+    tags=["Sync"],
+    responses={
+        403: {"description": "Prohibido - Permisos insuficientes"},
+        401: {"description": "No autorizado - No autenticado"}
+    },
+)
+
+@router.get("")
+def sync_changes(
+    since: Optional[str] = Query(None, description="Token returned by the previous sync"),
+    current_user: dict = Depends(require_dependiente)
+):
+    """
+    Get the rows of Orders, OrderItems, ServiceSpots, Products and MenuItems
+    created, updated or deleted since the given token.
+    Accessible to all authenticated users.
+    
+    Without a token a full snapshot is returned (full=true); clients then
+    replace their local copy. Otherwise clients upsert the returned rows by
+    id and remove the deleted ids. The returned token is sent as `since` on
+    the next call.
+    
+    Args:
+        since: Sync token from the previous response
+        
+    Returns:
+        dict: Changes per resource and the next sync token
+    """
+    logger.info(f"User {current_user['username']} requested sync (incremental: {since is not None})")
+    
+    try:
+        result = sync.changes_since(since)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except RuntimeError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de datos no disponible"
+        )
+    
+    return {
+        "status": "success",
+        "message": "Sincronización completa" if result["full"] else "Cambios obtenidos exitosamente",
+        "data": result["changes"],
+        "full": result["full"],
+        "token": result["token"]
+    }
@@ -14,8 +14,6 @@ from app.schemas.user import (
 )
 from app.models.user import User
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -55,7 +53,8 @@ async def get_users(
         db_users = User.find_all(
             order_by="username ASC", 
             limit=limit, 
-            offset=skip
+            offset=skip,
+            columns=User.PUBLIC_COLUMNS
         )
     
     # Convert to response model
@@ -118,7 +117,7 @@ async def create_user(
         )
     
     # Get the created user
-    created_user = User.find_by_id(new_user_id)
+    created_user = User.find_by_id(new_user_id, columns=User.PUBLIC_COLUMNS)
     
     # Convert to response model
     user_response = UserResponse(
@@ -155,7 +154,7 @@ async def get_user(
     logger.info(f"User {current_user['username']} is retrieving user {user_id}")
     
     # Get user from database
-    db_user = User.find_by_id(user_id)
+    db_user = User.find_by_id(user_id, columns=User.PUBLIC_COLUMNS)
     
     if not db_user:
         raise HTTPException(
@@ -200,7 +199,7 @@ async def update_user(
     logger.info(f"User {current_user['username']} is updating user {user_id}")
     
     # Check if user exists
-    db_user = User.find_by_id(user_id)
+    db_user = User.find_by_id(user_id, columns=("id", "username"))
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -233,7 +232,7 @@ async def update_user(
         )
     
     # Get the updated user
-    updated_user = User.find_by_id(user_id)
+    updated_user = User.find_by_id(user_id, columns=User.PUBLIC_COLUMNS)
     
     # Convert to response model
     user_response = UserResponse(
@@ -277,7 +276,7 @@ async def delete_user(
         )
     
     # Get user before deletion
-    db_user = User.find_by_id(user_id)
+    db_user = User.find_by_id(user_id, columns=User.PUBLIC_COLUMNS)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -320,7 +319,7 @@ async def read_users_me(current_user: dict = Depends(get_current_user)):
         UserDetailResponse: The current user data
     """
     # Get user from database using the ID in the token
-    db_user = User.find_by_id(current_user.get('id'))
+    db_user = User.find_by_id(current_user.get('user_id'), columns=User.PUBLIC_COLUMNS)
     
     if not db_user:
         raise HTTPException(
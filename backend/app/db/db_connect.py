@@ -1,65 +1,181 @@
 import os
+import queue
+import threading
 import pymysql
-from dotenv import load_dotenv
+from contextlib import contextmanager
 import logging
+from app.settings import get_settings
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-is_docker = os.path.exists("/app/.db.env")
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
 
-# Path for Docker environment
-if is_docker:
-    logger.info("Running in Docker environment")
-    load_dotenv("/app/.db.env")
-else:
-    # Try to load from the project root when running locally
-    logger.info("Running in local environment")
-    local_env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".db.env")
-    logger.info(f"Loading environment from: {local_env_path}")
-    load_dotenv(local_env_path)
+def _connect(cursorclass):
+    return pymysql.connect(
+        **get_settings().db_config(),
+        cursorclass=cursorclass,
+        connect_timeout=5  # Add timeout to avoid long waits
+    )
 
-# Define host based on environment
-default_host = "db" if is_docker else "localhost"
+class PooledConnection:
+    """
+    A pooled connection handed out by get_connection.
+
+    Behaves like the pymysql connection it wraps, except that close() rolls
+    back whatever the borrower left open and returns it to its pool.
+    """
 
-DB_CONFIG = {
-    "host": os.getenv("DB_HOST", default_host),
-    "user": os.getenv("MYSQL_USER", "vestasysuser"),
-    "password": os.getenv("MYSQL_PASSWORD", "VestaSys2025"),
-    "database": os.getenv("MYSQL_DATABASE", "vestasys"),
-    "port": int(os.getenv("DB_PORT", 3306)),
-}
+    def __init__(self, connection, pool):
+        self._connection = connection
+        self._pool = pool
 
-logger.info(f"Database configuration: host={DB_CONFIG['host']}, database={DB_CONFIG['database']}, port={DB_CONFIG['port']}")
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
 
+    def close(self):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            # Ends the transaction so the next borrower gets a fresh snapshot
+            connection.rollback()
+            self._pool.put_nowait(connection)
+        except Exception:
+            connection.close()
 
-def get_connection():
+def init_pool(size: int = None) -> int:
+    """
+    Open this process's connection pool.
+
+    Called in each worker after it is forked (pymysql connections must not be
+    shared between processes); a pool inherited from another process is
+    discarded without closing its sockets.
+
+    Args:
+        size: Connections to open (defaults to the DB_POOL_SIZE setting)
+
+    Returns:
+        int: Connections opened
+    """
+    global _pool, _pool_pid
+    size = get_settings().db_pool_size if size is None else size
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            return 0
+        _pool = queue.LifoQueue(maxsize=size) if size > 0 else None
+        _pool_pid = os.getpid()
+        if _pool is None:
+            return 0
+
+    opened = 0
+    for _ in range(size):
+        try:
+            _pool.put_nowait(_connect(pymysql.cursors.DictCursor))
+            opened += 1
+        except Exception as e:
+            logger.error(f"Error opening pooled connection: {e}")
+            break
+    logger.info(f"Connection pool ready in worker {os.getpid()} ({opened}/{size} connections)")
+    return opened
+
+def close_pool():
+    """Close every idle pooled connection of this process."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    while pool is not None:
+        try:
+            pool.get_nowait().close()
+        except queue.Empty:
+            break
+        except Exception as e:
+            logger.error(f"Error closing pooled connection: {e}")
+
+def _borrow(cursorclass):
+    """Take a live connection from this process's pool, or None."""
+    pool = _pool
+    if pool is None or _pool_pid != os.getpid():
+        return None
+    # Streaming cursors can leave unread results behind; they get their own connection
+    if issubclass(cursorclass, pymysql.cursors.SSCursor):
+        return None
+    while True:
+        try:
+            connection = pool.get_nowait()
+        except queue.Empty:
+            # Pool exhausted: open a connection that joins the pool when closed
+            return PooledConnection(_connect(cursorclass), pool)
+        try:
+            connection.ping(reconnect=True)
+        except Exception as e:
+            logger.warning(f"Dropping dead pooled connection: {e}")
+            continue
+        connection.cursorclass = cursorclass
+        return PooledConnection(connection, pool)
+
+def get_connection(cursorclass=pymysql.cursors.DictCursor):
     """
     Get a connection to the MySQL database.
     
+    Connections come from the worker's pool once init_pool has run; closing
+    them returns them to it.
+    
+    Args:
+        cursorclass: Cursor class used by the connection. Defaults to DictCursor;
+            pass pymysql.cursors.SSCursor for unbuffered, server-side streaming.
+    
     Returns:
         pymysql.connections.Connection: A connection to the database, or None if connection fails.
     """
     try:
-        logger.info(f"Attempting to connect to database at {DB_CONFIG['host']}:{DB_CONFIG['port']}")
-        connection = pymysql.connect(
-            host=DB_CONFIG["host"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            database=DB_CONFIG["database"],
-            port=DB_CONFIG["port"],
-            cursorclass=pymysql.cursors.DictCursor,
-            connect_timeout=5  # Add timeout to avoid long waits
-        )
+        connection = _borrow(cursorclass)
+        if connection is not None:
+            return connection
+        settings = get_settings()
+        logger.info(f"Attempting to connect to database at {settings.db_host}:{settings.db_port}")
+        connection = _connect(cursorclass)
         logger.info("Database connection established successfully")
         return connection
     except Exception as e:
         logger.error(f"Error connecting to database: {e}")
         # Log more details about the configuration
-        logger.error(f"Connection details: host={DB_CONFIG['host']}, user={DB_CONFIG['user']}, db={DB_CONFIG['database']}, port={DB_CONFIG['port']}")
+        settings = get_settings()
+        logger.error(f"Connection details: host={settings.db_host}, user={settings.db_user}, db={settings.db_name}, port={settings.db_port}")
         return None
 
+@contextmanager
+def transaction(cursorclass=pymysql.cursors.DictCursor):
+    """
+    Run a block of statements in a single transaction.
+    
+    Yields a cursor; the transaction is committed when the block exits
+    normally and rolled back if it raises. The connection is always closed.
+    
+    Args:
+        cursorclass: Cursor class used by the connection
+        
+    Yields:
+        pymysql.cursors.Cursor: Cursor bound to the transaction
+        
+    Raises:
+        RuntimeError: If no connection could be established
+    """
+    connection = get_connection(cursorclass=cursorclass)
+    if not connection:
+        raise RuntimeError("Database unavailable")
+    
+    try:
+        with connection.cursor() as cursor:
+            yield cursor
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
 def check_connection():
    
     try:
@@ -6,8 +6,6 @@ import logging
 from passlib.hash import bcrypt
 from app.db.db_connect import get_connection, check_connection
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def create_users_table():
@@ -113,21 +111,24 @@ def init_database():
     """
     Initialize the database by creating all required tables and initial data.
     Uses the migration system to create all tables and seed data.
+    
+    When the migration ledger is current this is a single ledger read; the
+    Users table and the pending migrations are otherwise created under the
+    migration lock, so concurrent workers do not race.
     """
     logger.info("Initializing database...")
     
-    # First, ensure the Users table exists (legacy approach)
-    users_table_created = create_users_table()
-    
-    if not users_table_created:
-        logger.error("Failed to create Users table")
-        return False
+    # Ensure the Users table exists (legacy approach) before the migrations
+    def ensure_users_table():
+        if not create_users_table():
+            logger.error("Failed to create Users table")
+            return False
+        return True
     
-    # Run migrations to create all other tables
     try:
         from app.db.migrate import run_migrations
         
-        if run_migrations():
+        if run_migrations(before_apply=ensure_users_table):
             logger.info("Database migrations completed successfully")
             return True
         else:
@@ -139,4 +140,6 @@ def init_database():
         return False
 
 if __name__ == "__main__":
+    from app.settings import configure_logging
+    configure_logging()
     init_database()
@@ -1,15 +1,45 @@
 """
 Database migration script.
 Executes SQL migrations to set up or update the database schema.
+
+Applied files are recorded in the schema_migrations ledger with a SHA-256 of
+their contents, so a start against a current schema costs one ledger read.
+Pending files (new, or changed since they were applied; every migration is
+written to be re-runnable) are applied while holding a GET_LOCK advisory lock,
+so concurrent workers and containers never run them twice at the same time.
 """
 import os
+import time
+import hashlib
 import logging
+import pymysql
+from typing import Callable, Dict, List, Optional, Tuple
 from app.db.db_connect import get_connection
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+# Applied in this order; stored procedures may depend on any table
+MIGRATION_DIRS = (
+    os.path.join(DB_DIR, 'migrations'),
+    os.path.join(DB_DIR, 'stored_procs'),
+)
+
+LOCK_NAME = "vesta_schema_migrations"
+LOCK_TIMEOUT_SECONDS = 120
+
+LEDGER_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        filename VARCHAR(255) PRIMARY KEY,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        execution_ms INT UNSIGNED NOT NULL DEFAULT 0
+    )
+"""
+
+# (ledger filename, path, checksum)
+MigrationFile = Tuple[str, str, str]
+
 def execute_migration_script(file_path):
     """
     Execute SQL statements from a migration file.
@@ -25,9 +55,8 @@ def execute_migration_script(file_path):
         with open(file_path, 'r') as f:
             sql_script = f.read()
 
-        # Determine the type of SQL script
-        is_table_creation = '01_create_tables' in file_path
-        is_procedure_creation = '02_create_procedures' in file_path
+        # Procedure bodies contain semicolons, so they are not split on them
+        is_procedure_creation = 'CREATE PROCEDURE' in sql_script.upper()
             
         # Get a database connection
         conn = get_connection()
@@ -86,59 +115,137 @@ def execute_migration_script(file_path):
         logger.error(f"Error reading migration file {file_path}: {e}")
         return False
 
-def run_migrations(migrations_dir=None):
+def list_migrations(migrations_dir=None) -> List[MigrationFile]:
     """
-    Run all pending migrations from the migrations directory.
+    List the migration files in the order they are applied.
     
     Args:
-        migrations_dir: Path to migrations directory. If None, use default.
+        migrations_dir: A single directory to use instead of MIGRATION_DIRS
         
     Returns:
-        bool: True if all migrations were successful, False otherwise
+        list: (ledger filename, path, checksum) tuples
     """
-    # Default migrations directory
-    if migrations_dir is None:
-        migrations_dir = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            'migrations'
-        )
-    
-    logger.info(f"Looking for migrations in: {migrations_dir}")
-    
-    # Check if directory exists
-    if not os.path.exists(migrations_dir):
-        logger.error(f"Migrations directory not found: {migrations_dir}")
-        return False
-    
-    # Get all SQL files
-    migration_files = [
-        os.path.join(migrations_dir, f) 
-        for f in os.listdir(migrations_dir) 
-        if f.endswith('.sql')
-    ]
+    dirs = [migrations_dir] if migrations_dir else list(MIGRATION_DIRS)
+    files = []
+    for index, directory in enumerate(dirs):
+        if not os.path.exists(directory):
+            logger.error(f"Migrations directory not found: {directory}")
+            continue
+        # Later directories are prefixed so their files cannot collide with migrations
+        prefix = "" if index == 0 else os.path.basename(directory) + "/"
+        for name in sorted(f for f in os.listdir(directory) if f.endswith('.sql')):
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                checksum = hashlib.sha256(f.read()).hexdigest()
+            files.append((prefix + name, path, checksum))
+    return files
+
+def read_ledger(cursor) -> Dict[str, str]:
+    """
+    Read the applied migrations.
     
-    # Sort files to ensure consistent order
-    migration_files.sort()
+    Args:
+        cursor: A DictCursor
+        
+    Returns:
+        dict: Ledger filename -> checksum (empty if the ledger does not exist yet)
+    """
+    try:
+        cursor.execute("SELECT filename, checksum FROM schema_migrations")
+    except pymysql.err.ProgrammingError as e:
+        # 1146: table doesn't exist
+        if e.args and e.args[0] == 1146:
+            return {}
+        raise
+    return {row['filename']: row['checksum'] for row in cursor.fetchall()}
+
+def pending_migrations(files: List[MigrationFile], ledger: Dict[str, str]) -> List[MigrationFile]:
+    """Files never applied or changed since they were applied."""
+    return [entry for entry in files if ledger.get(entry[0]) != entry[2]]
+
+def run_migrations(migrations_dir=None, before_apply: Optional[Callable[[], bool]] = None):
+    """
+    Run all pending migrations from the migrations directories.
     
-    if not migration_files:
+    Args:
+        migrations_dir: Path to a single migrations directory. If None, use
+            MIGRATION_DIRS.
+        before_apply: Optional step run under the migration lock before the
+            pending files, only when there are any; returning False aborts
+        
+    Returns:
+        bool: True if all migrations were successful, False otherwise
+    """
+    files = list_migrations(migrations_dir)
+    if not files:
         logger.warning("No migration files found")
         return True
     
-    # Execute each migration
-    success = True
-    for migration_file in migration_files:
-        logger.info(f"Applying migration: {os.path.basename(migration_file)}")
-        if not execute_migration_script(migration_file):
-            logger.error(f"Migration failed: {migration_file}")
-            success = False
-            break
+    conn = get_connection()
+    if not conn:
+        logger.error("Failed to connect to database for migrations")
+        return False
     
-    if success:
-        logger.info("All migrations completed successfully")
-    else:
-        logger.error("Migration process failed")
+    locked = False
+    try:
+        with conn.cursor() as cursor:
+            # Fast path: one ledger read when the schema is current
+            if not pending_migrations(files, read_ledger(cursor)):
+                logger.info(f"Database schema is current ({len(files)} migrations applied)")
+                return True
+            
+            cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (LOCK_NAME, LOCK_TIMEOUT_SECONDS))
+            if cursor.fetchone()['acquired'] != 1:
+                logger.error(f"Timed out waiting for the migration lock {LOCK_NAME}")
+                return False
+            locked = True
+            
+            # Another process may have applied them while we waited for the lock
+            cursor.execute(LEDGER_DDL)
+            ledger = read_ledger(cursor)
+            conn.commit()
+            pending = pending_migrations(files, ledger)
+            if not pending:
+                logger.info("Database schema was brought up to date by another process")
+                return True
+            
+            if before_apply is not None and not before_apply():
+                return False
+            
+            for filename, path, checksum in pending:
+                if filename in ledger:
+                    logger.warning(f"Migration changed since it was applied, re-running: {filename}")
+                logger.info(f"Applying migration: {filename}")
+                started = time.perf_counter()
+                if not execute_migration_script(path):
+                    logger.error(f"Migration failed: {path}")
+                    logger.error("Migration process failed")
+                    return False
+                cursor.execute("""
+                    INSERT INTO schema_migrations (filename, checksum, execution_ms)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE checksum = VALUES(checksum),
+                        execution_ms = VALUES(execution_ms), applied_at = CURRENT_TIMESTAMP
+                """, (filename, checksum, int((time.perf_counter() - started) * 1000)))
+                conn.commit()
+        
+        logger.info(f"All migrations completed successfully ({len(pending)} applied)")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error running migrations: {e}")
+        return False
     
-    return success
+    finally:
+        if locked:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            except Exception as e:
+                logger.error(f"Error releasing migration lock: {e}")
+        conn.close()
 
 if __name__ == "__main__":
+    from app.settings import configure_logging
+    configure_logging()
     run_migrations()
@@ -0,0 +1,17 @@
+-- Índice para consultas por estado y fecha de cierre (exportación de órdenes cobradas)
+-- MySQL 8 no soporta CREATE INDEX IF NOT EXISTS, así que se crea de forma condicional
+-- para que la migración pueda ejecutarse en cada arranque.
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_orders_status_closed_at ON Orders (status, closed_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'Orders'
+    AND index_name = 'idx_orders_status_closed_at'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
@@ -0,0 +1,16 @@
+-- Tabla de agregados diarios de ventas (día × área de venta × producto × usuario)
+-- Se mantiene de forma incremental cuando una orden pasa a 'cobrada' y puede
+-- reconstruirse con backfill_daily_sales.py a partir del histórico.
+CREATE TABLE IF NOT EXISTS DailySales (
+    sale_date DATE NOT NULL,
+    sales_area_id INT NOT NULL,
+    product_id INT NOT NULL,
+    user_id INT NOT NULL,
+    quantity INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    order_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (sale_date, sales_area_id, product_id, user_id),
+    INDEX idx_daily_sales_product (product_id, sale_date),
+    INDEX idx_daily_sales_user (user_id, sale_date)
+);
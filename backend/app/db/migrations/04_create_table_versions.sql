@@ -0,0 +1,97 @@
+-- Contadores de versión por tabla para cachés HTTP (ETag) y cachés en memoria.
+-- Los triggers incrementan la versión en cualquier escritura, incluidas las
+-- hechas por procedimientos almacenados o SQL directo, de modo que un cambio
+-- de versión es la única señal necesaria para invalidar.
+-- Nota: los borrados en cascada por clave foránea no disparan triggers, por
+-- eso quien depende de una tabla hija incluye también la versión de la padre.
+CREATE TABLE IF NOT EXISTS TableVersions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO TableVersions (table_name, version) VALUES
+    ('Products', 0),
+    ('ProductCategories', 0),
+    ('Menus', 0),
+    ('MenuItems', 0),
+    ('MenuSalesAreas', 0),
+    ('SalesAreas', 0),
+    ('ServiceSpots', 0);
+
+-- Products
+DROP TRIGGER IF EXISTS trg_products_insert_version;
+CREATE TRIGGER trg_products_insert_version AFTER INSERT ON Products FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Products';
+DROP TRIGGER IF EXISTS trg_products_update_version;
+CREATE TRIGGER trg_products_update_version AFTER UPDATE ON Products FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Products';
+DROP TRIGGER IF EXISTS trg_products_delete_version;
+CREATE TRIGGER trg_products_delete_version AFTER DELETE ON Products FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Products';
+
+-- ProductCategories
+DROP TRIGGER IF EXISTS trg_product_categories_insert_version;
+CREATE TRIGGER trg_product_categories_insert_version AFTER INSERT ON ProductCategories FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'ProductCategories';
+DROP TRIGGER IF EXISTS trg_product_categories_update_version;
+CREATE TRIGGER trg_product_categories_update_version AFTER UPDATE ON ProductCategories FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'ProductCategories';
+DROP TRIGGER IF EXISTS trg_product_categories_delete_version;
+CREATE TRIGGER trg_product_categories_delete_version AFTER DELETE ON ProductCategories FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'ProductCategories';
+
+-- Menus
+DROP TRIGGER IF EXISTS trg_menus_insert_version;
+CREATE TRIGGER trg_menus_insert_version AFTER INSERT ON Menus FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Menus';
+DROP TRIGGER IF EXISTS trg_menus_update_version;
+CREATE TRIGGER trg_menus_update_version AFTER UPDATE ON Menus FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Menus';
+DROP TRIGGER IF EXISTS trg_menus_delete_version;
+CREATE TRIGGER trg_menus_delete_version AFTER DELETE ON Menus FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Menus';
+
+-- MenuItems
+DROP TRIGGER IF EXISTS trg_menu_items_insert_version;
+CREATE TRIGGER trg_menu_items_insert_version AFTER INSERT ON MenuItems FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'MenuItems';
+DROP TRIGGER IF EXISTS trg_menu_items_update_version;
+CREATE TRIGGER trg_menu_items_update_version AFTER UPDATE ON MenuItems FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'MenuItems';
+DROP TRIGGER IF EXISTS trg_menu_items_delete_version;
+CREATE TRIGGER trg_menu_items_delete_version AFTER DELETE ON MenuItems FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'MenuItems';
+
+-- MenuSalesAreas
+DROP TRIGGER IF EXISTS trg_menu_sales_areas_insert_version;
+CREATE TRIGGER trg_menu_sales_areas_insert_version AFTER INSERT ON MenuSalesAreas FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'MenuSalesAreas';
+DROP TRIGGER IF EXISTS trg_menu_sales_areas_update_version;
+CREATE TRIGGER trg_menu_sales_areas_update_version AFTER UPDATE ON MenuSalesAreas FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'MenuSalesAreas';
+DROP TRIGGER IF EXISTS trg_menu_sales_areas_delete_version;
+CREATE TRIGGER trg_menu_sales_areas_delete_version AFTER DELETE ON MenuSalesAreas FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'MenuSalesAreas';
+
+-- SalesAreas
+DROP TRIGGER IF EXISTS trg_sales_areas_insert_version;
+CREATE TRIGGER trg_sales_areas_insert_version AFTER INSERT ON SalesAreas FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'SalesAreas';
+DROP TRIGGER IF EXISTS trg_sales_areas_update_version;
+CREATE TRIGGER trg_sales_areas_update_version AFTER UPDATE ON SalesAreas FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'SalesAreas';
+DROP TRIGGER IF EXISTS trg_sales_areas_delete_version;
+CREATE TRIGGER trg_sales_areas_delete_version AFTER DELETE ON SalesAreas FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'SalesAreas';
+
+-- ServiceSpots
+DROP TRIGGER IF EXISTS trg_service_spots_insert_version;
+CREATE TRIGGER trg_service_spots_insert_version AFTER INSERT ON ServiceSpots FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'ServiceSpots';
+DROP TRIGGER IF EXISTS trg_service_spots_update_version;
+CREATE TRIGGER trg_service_spots_update_version AFTER UPDATE ON ServiceSpots FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'ServiceSpots';
+DROP TRIGGER IF EXISTS trg_service_spots_delete_version;
+CREATE TRIGGER trg_service_spots_delete_version AFTER DELETE ON ServiceSpots FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'ServiceSpots';
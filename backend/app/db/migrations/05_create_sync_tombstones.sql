@@ -0,0 +1,107 @@
+-- Soporte para sincronización incremental (GET /api/v1/sync).
+-- Las filas creadas o modificadas se detectan por updated_at; los borrados
+-- quedan registrados como tombstones mediante triggers AFTER DELETE.
+-- Nota: los borrados en cascada por clave foránea no disparan triggers; por
+-- eso OrderItem.delete_by_order_id borra los ítems explícitamente.
+CREATE TABLE IF NOT EXISTS SyncTombstones (
+    id BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
+    table_name VARCHAR(64) NOT NULL,
+    row_id INT NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_sync_tombstones_deleted_at (deleted_at)
+);
+
+-- Orders
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_orders_updated_at ON Orders (updated_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'Orders'
+    AND index_name = 'idx_orders_updated_at'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+DROP TRIGGER IF EXISTS trg_orders_delete_tombstone;
+CREATE TRIGGER trg_orders_delete_tombstone AFTER DELETE ON Orders FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id) VALUES ('Orders', OLD.id);
+
+-- OrderItems
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_order_items_updated_at ON OrderItems (updated_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'OrderItems'
+    AND index_name = 'idx_order_items_updated_at'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+DROP TRIGGER IF EXISTS trg_order_items_delete_tombstone;
+CREATE TRIGGER trg_order_items_delete_tombstone AFTER DELETE ON OrderItems FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id) VALUES ('OrderItems', OLD.id);
+
+-- ServiceSpots
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_service_spots_updated_at ON ServiceSpots (updated_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'ServiceSpots'
+    AND index_name = 'idx_service_spots_updated_at'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+DROP TRIGGER IF EXISTS trg_service_spots_delete_tombstone;
+CREATE TRIGGER trg_service_spots_delete_tombstone AFTER DELETE ON ServiceSpots FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id) VALUES ('ServiceSpots', OLD.id);
+
+-- Products
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_products_updated_at ON Products (updated_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'Products'
+    AND index_name = 'idx_products_updated_at'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+DROP TRIGGER IF EXISTS trg_products_delete_tombstone;
+CREATE TRIGGER trg_products_delete_tombstone AFTER DELETE ON Products FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id) VALUES ('Products', OLD.id);
+
+-- MenuItems
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_menu_items_updated_at ON MenuItems (updated_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'MenuItems'
+    AND index_name = 'idx_menu_items_updated_at'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+DROP TRIGGER IF EXISTS trg_menu_items_delete_tombstone;
+CREATE TRIGGER trg_menu_items_delete_tombstone AFTER DELETE ON MenuItems FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id) VALUES ('MenuItems', OLD.id);
@@ -0,0 +1,14 @@
+-- Claves de idempotencia de las operaciones enviadas por POST /api/v1/orders/batch.
+-- Guardan el resultado de cada operación para que un reenvío (reintento tras
+-- perder la conexión) devuelva la misma respuesta sin volver a aplicarla.
+CREATE TABLE IF NOT EXISTS IdempotencyKeys (
+    idempotency_key VARCHAR(64) PRIMARY KEY,
+    user_id INT NOT NULL,
+    operation VARCHAR(32) NOT NULL,
+    result_status VARCHAR(16) NOT NULL,
+    order_id INT NULL,
+    items_added INT NOT NULL DEFAULT 0,
+    detail VARCHAR(255) NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_idempotency_keys_created_at (created_at)
+);
@@ -0,0 +1,16 @@
+-- Índice para el recálculo por lotes del estado de los service spots
+-- (órdenes activas y cobradas hoy agrupadas por service spot).
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_orders_spot_status_closed ON Orders (service_spot_id, status, closed_at)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'Orders'
+    AND index_name = 'idx_orders_spot_status_closed'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
@@ -0,0 +1,41 @@
+-- Versión por fila para control de concurrencia optimista (If-Match / 409)
+-- en Orders y ServiceSpots. Los triggers BEFORE UPDATE incrementan la versión
+-- en cualquier escritura, incluidas las de SQL directo, de modo que un
+-- UPDATE ... WHERE id = %s AND version = %s detecta cualquier cambio concurrente.
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'ALTER TABLE Orders ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1',
+        'DO 0'
+    )
+    FROM information_schema.columns
+    WHERE table_schema = DATABASE()
+    AND table_name = 'Orders'
+    AND column_name = 'version'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'ALTER TABLE ServiceSpots ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1',
+        'DO 0'
+    )
+    FROM information_schema.columns
+    WHERE table_schema = DATABASE()
+    AND table_name = 'ServiceSpots'
+    AND column_name = 'version'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+
+DROP TRIGGER IF EXISTS trg_orders_row_version;
+CREATE TRIGGER trg_orders_row_version BEFORE UPDATE ON Orders FOR EACH ROW
+    SET NEW.version = OLD.version + 1;
+
+DROP TRIGGER IF EXISTS trg_service_spots_row_version;
+CREATE TRIGGER trg_service_spots_row_version BEFORE UPDATE ON ServiceSpots FOR EACH ROW
+    SET NEW.version = OLD.version + 1;
@@ -0,0 +1,13 @@
+-- Contador de versión de Establishment para el ETag del arranque de tablets
+-- (GET /api/v1/bootstrap), igual que las demás tablas de 04_create_table_versions.
+INSERT IGNORE INTO TableVersions (table_name, version) VALUES ('Establishment', 0);
+
+DROP TRIGGER IF EXISTS trg_establishment_insert_version;
+CREATE TRIGGER trg_establishment_insert_version AFTER INSERT ON Establishment FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Establishment';
+DROP TRIGGER IF EXISTS trg_establishment_update_version;
+CREATE TRIGGER trg_establishment_update_version AFTER UPDATE ON Establishment FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Establishment';
+DROP TRIGGER IF EXISTS trg_establishment_delete_version;
+CREATE TRIGGER trg_establishment_delete_version AFTER DELETE ON Establishment FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1 WHERE table_name = 'Establishment';
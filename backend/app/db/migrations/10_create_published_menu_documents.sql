@@ -0,0 +1,15 @@
+-- Documentos precompilados de las cartas publicadas: el cuerpo JSON completo
+-- de GET /api/v1/menus/{menu_id}/document por carta y área de venta
+-- (sales_area_id = 0 para la carta sin área), servido tal cual.
+-- source_hash resume la carta, sus ítems y los productos que referencian;
+-- el documento se recompila solo cuando deja de coincidir.
+CREATE TABLE IF NOT EXISTS PublishedMenuDocuments (
+    menu_id INT NOT NULL,
+    sales_area_id INT NOT NULL DEFAULT 0,
+    document MEDIUMTEXT NOT NULL,
+    etag CHAR(26) NOT NULL,
+    source_hash VARCHAR(64) NOT NULL,
+    compiled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (menu_id, sales_area_id),
+    FOREIGN KEY (menu_id) REFERENCES Menus(id) ON DELETE CASCADE
+);
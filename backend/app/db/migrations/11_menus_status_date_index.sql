@@ -0,0 +1,16 @@
+-- Índice para resolver la carta publicada de cada área por fecha
+-- (Menu.get_active_for_date y la carga del resolvedor de cartas).
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'CREATE INDEX idx_menus_status_valid_date ON Menus (status, valid_date)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'Menus'
+    AND index_name = 'idx_menus_status_valid_date'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
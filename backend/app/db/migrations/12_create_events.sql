@@ -0,0 +1,11 @@
+-- Eventos enviados a los clientes conectados a GET /api/v1/events (SSE).
+-- Cada worker lee las filas nuevas por id y las reparte a sus suscriptores,
+-- así un cambio hecho en un worker llega a las tablets conectadas a cualquiera.
+-- Las filas de más de un día se borran periódicamente.
+CREATE TABLE IF NOT EXISTS Events (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    event_type VARCHAR(32) NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_events_created_at (created_at)
+);
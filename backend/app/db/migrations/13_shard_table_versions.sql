@@ -0,0 +1,78 @@
+-- Contadores de versión repartidos en filas (shards) para las tablas que se
+-- escriben dentro de las transacciones de órdenes y disponibilidad.
+-- Con una sola fila por tabla, el trigger AFTER de cada escritura bloqueaba
+-- esa fila hasta el commit y serializaba a todos los dependientes. Cada
+-- conexión incrementa ahora la fila CONNECTION_ID() % 16 de la tabla, así
+-- una transacción bloquea como mucho una fila y las concurrentes casi nunca
+-- coinciden. La versión de una tabla es la suma de sus filas
+-- (http_cache.get_versions), que crece con cualquier escritura igual que antes.
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'ALTER TABLE TableVersions ADD COLUMN shard TINYINT UNSIGNED NOT NULL DEFAULT 0 AFTER table_name, DROP PRIMARY KEY, ADD PRIMARY KEY (table_name, shard)',
+        'DO 0'
+    )
+    FROM information_schema.columns
+    WHERE table_schema = DATABASE()
+    AND table_name = 'TableVersions'
+    AND column_name = 'shard'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
+
+INSERT IGNORE INTO TableVersions (table_name, shard, version)
+SELECT t.table_name, s.shard, 0
+FROM (
+    SELECT 'ServiceSpots' AS table_name
+    UNION ALL SELECT 'Products'
+    UNION ALL SELECT 'MenuItems'
+) t
+CROSS JOIN (
+    SELECT 0 AS shard UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
+    UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
+    UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10 UNION ALL SELECT 11
+    UNION ALL SELECT 12 UNION ALL SELECT 13 UNION ALL SELECT 14 UNION ALL SELECT 15
+) s;
+
+-- Products
+DROP TRIGGER IF EXISTS trg_products_insert_version;
+CREATE TRIGGER trg_products_insert_version AFTER INSERT ON Products FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'Products' AND shard = CONNECTION_ID() % 16;
+DROP TRIGGER IF EXISTS trg_products_update_version;
+CREATE TRIGGER trg_products_update_version AFTER UPDATE ON Products FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'Products' AND shard = CONNECTION_ID() % 16;
+DROP TRIGGER IF EXISTS trg_products_delete_version;
+CREATE TRIGGER trg_products_delete_version AFTER DELETE ON Products FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'Products' AND shard = CONNECTION_ID() % 16;
+
+-- MenuItems
+DROP TRIGGER IF EXISTS trg_menu_items_insert_version;
+CREATE TRIGGER trg_menu_items_insert_version AFTER INSERT ON MenuItems FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'MenuItems' AND shard = CONNECTION_ID() % 16;
+DROP TRIGGER IF EXISTS trg_menu_items_update_version;
+CREATE TRIGGER trg_menu_items_update_version AFTER UPDATE ON MenuItems FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'MenuItems' AND shard = CONNECTION_ID() % 16;
+DROP TRIGGER IF EXISTS trg_menu_items_delete_version;
+CREATE TRIGGER trg_menu_items_delete_version AFTER DELETE ON MenuItems FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'MenuItems' AND shard = CONNECTION_ID() % 16;
+
+-- ServiceSpots
+DROP TRIGGER IF EXISTS trg_service_spots_insert_version;
+CREATE TRIGGER trg_service_spots_insert_version AFTER INSERT ON ServiceSpots FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'ServiceSpots' AND shard = CONNECTION_ID() % 16;
+DROP TRIGGER IF EXISTS trg_service_spots_update_version;
+CREATE TRIGGER trg_service_spots_update_version AFTER UPDATE ON ServiceSpots FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'ServiceSpots' AND shard = CONNECTION_ID() % 16;
+DROP TRIGGER IF EXISTS trg_service_spots_delete_version;
+CREATE TRIGGER trg_service_spots_delete_version AFTER DELETE ON ServiceSpots FOR EACH ROW
+    UPDATE TableVersions SET version = version + 1
+    WHERE table_name = 'ServiceSpots' AND shard = CONNECTION_ID() % 16;
@@ -0,0 +1,50 @@
+-- Tombstones de las filas borradas en cascada por clave foránea.
+-- Los borrados en cascada no disparan los triggers de la tabla hija, así que
+-- GET /api/v1/sync nunca veía borrar, por ejemplo, los ítems de carta de un
+-- producto o de una carta eliminados. Un trigger BEFORE DELETE en cada tabla
+-- padre registra los tombstones de sus descendientes sincronizados; si el
+-- borrado falla, la sentencia se revierte junto con ellos.
+
+-- Orders -> OrderItems
+DROP TRIGGER IF EXISTS trg_orders_cascade_tombstones;
+CREATE TRIGGER trg_orders_cascade_tombstones BEFORE DELETE ON Orders FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id)
+    SELECT 'OrderItems', id FROM OrderItems WHERE order_id = OLD.id;
+
+-- Menus -> MenuItems
+DROP TRIGGER IF EXISTS trg_menus_cascade_tombstones;
+CREATE TRIGGER trg_menus_cascade_tombstones BEFORE DELETE ON Menus FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id)
+    SELECT 'MenuItems', id FROM MenuItems WHERE menu_id = OLD.id;
+
+-- Products -> MenuItems
+DROP TRIGGER IF EXISTS trg_products_cascade_tombstones;
+CREATE TRIGGER trg_products_cascade_tombstones BEFORE DELETE ON Products FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id)
+    SELECT 'MenuItems', id FROM MenuItems WHERE product_id = OLD.id;
+
+-- ProductCategories -> Products -> MenuItems
+DROP TRIGGER IF EXISTS trg_product_categories_cascade_tombstones;
+CREATE TRIGGER trg_product_categories_cascade_tombstones BEFORE DELETE ON ProductCategories FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id)
+    SELECT 'Products', p.id FROM Products p WHERE p.category_id = OLD.id
+    UNION ALL
+    SELECT 'MenuItems', mi.id
+    FROM MenuItems mi
+    JOIN Products p ON p.id = mi.product_id
+    WHERE p.category_id = OLD.id;
+
+-- SalesAreas -> ServiceSpots
+DROP TRIGGER IF EXISTS trg_sales_areas_cascade_tombstones;
+CREATE TRIGGER trg_sales_areas_cascade_tombstones BEFORE DELETE ON SalesAreas FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id)
+    SELECT 'ServiceSpots', id FROM ServiceSpots WHERE sales_area_id = OLD.id;
+
+-- Establishment -> SalesAreas -> ServiceSpots
+DROP TRIGGER IF EXISTS trg_establishment_cascade_tombstones;
+CREATE TRIGGER trg_establishment_cascade_tombstones BEFORE DELETE ON Establishment FOR EACH ROW
+    INSERT INTO SyncTombstones (table_name, row_id)
+    SELECT 'ServiceSpots', ss.id
+    FROM ServiceSpots ss
+    JOIN SalesAreas sa ON sa.id = ss.sales_area_id
+    WHERE sa.establishment_id = OLD.id;
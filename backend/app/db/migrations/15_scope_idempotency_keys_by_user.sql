@@ -0,0 +1,18 @@
+-- Las claves de idempotencia de POST /api/v1/orders/batch son únicas por
+-- usuario: una clave generada por otra tablet que coincida con la de otro
+-- usuario no debe devolver su resultado ni su orden.
+SET @vesta_ddl = (
+    SELECT IF(
+        COUNT(*) = 0,
+        'ALTER TABLE IdempotencyKeys DROP PRIMARY KEY, ADD PRIMARY KEY (user_id, idempotency_key)',
+        'DO 0'
+    )
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE()
+    AND table_name = 'IdempotencyKeys'
+    AND index_name = 'PRIMARY'
+    AND column_name = 'user_id'
+);
+PREPARE vesta_stmt FROM @vesta_ddl;
+EXECUTE vesta_stmt;
+DEALLOCATE PREPARE vesta_stmt;
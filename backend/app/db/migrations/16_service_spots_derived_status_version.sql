@@ -0,0 +1,10 @@
+-- Los cambios de estado derivados de las órdenes (spot_status: pedido_abierto,
+-- cobrado, libre) no incrementan la versión del service spot. Si lo hicieran,
+-- cada orden abierta o cobrada invalidaría el If-Match de un administrador que
+-- está editando el spot y su cambio terminaría en un 409 sin motivo.
+-- spot_status marca sus sentencias con la variable de sesión
+-- @vesta_derived_status = 1; cualquier otra escritura incrementa la versión
+-- como antes.
+DROP TRIGGER IF EXISTS trg_service_spots_row_version;
+CREATE TRIGGER trg_service_spots_row_version BEFORE UPDATE ON ServiceSpots FOR EACH ROW
+    SET NEW.version = OLD.version + IF(@vesta_derived_status <=> 1, 0, 1);
@@ -0,0 +1,256 @@
+"""
+Cached SQL builders for BaseModel.
+
+Filters are given as a dict whose keys are a column name optionally followed
+by an operator suffix, Django style:
+
+    {"status": "abierta"}                      status = %s
+    {"status": ["abierta", "servida"]}         status IN %s
+    {"status__in": (...), "id__not_in": [...]} IN / NOT IN
+    {"created_at__gte": a, "created_at__lt": b} ranges (gt, gte, lt, lte, ne)
+    {"closed_at": None}, {"closed_at__isnull": False}
+    {"name__like": "caf%"}
+
+The SQL text only depends on the table, the selected columns and the shape of
+the filter (column and operator pairs), so it is compiled once per shape and
+kept in an LRU cache; a hot query costs a dict walk to collect its parameters.
+IN lists are bound as one parameter that PyMySQL expands to a parenthesized
+list, so their length does not multiply the cached shapes.
+
+PyMySQL has no server-side prepared statements (it only speaks the text
+protocol), so caching the compiled text is the part of statement preparation
+that can be skipped on the client.
+"""
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_CACHE_SIZE = 1024
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Operator -> SQL template for "<column> <template>"
+OPERATORS = {
+    "eq": "= %s",
+    "ne": "<> %s",
+    "lt": "< %s",
+    "lte": "<= %s",
+    "gt": "> %s",
+    "gte": ">= %s",
+    "in": "IN %s",
+    "not_in": "NOT IN %s",
+    "like": "LIKE %s",
+    "isnull": "IS NULL",
+    "notnull": "IS NOT NULL",
+}
+
+# Operators that compile to a constant when their list is empty
+_EMPTY_LIST_SQL = {"in": "FALSE", "not_in": "TRUE"}
+
+Shape = Tuple[Tuple[str, str], ...]
+
+def check_identifier(name: str) -> str:
+    """
+    Validate a table or column name before it is interpolated into SQL.
+
+    Args:
+        name: The identifier
+
+    Returns:
+        str: The same identifier
+
+    Raises:
+        ValueError: If it is not a plain identifier
+    """
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _split_key(key: str) -> Tuple[str, str]:
+    column, _, operator = key.partition("__")
+    if not operator:
+        return column, "eq"
+    if operator not in OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {operator!r}")
+    return column, operator
+
+def build_where(where: Optional[Dict[str, Any]]) -> Tuple[Shape, List[Any]]:
+    """
+    Split a filter dict into its cacheable shape and its parameters.
+
+    Args:
+        where: Filter dict (see module docstring)
+
+    Returns:
+        tuple: (shape, params)
+    """
+    if not where:
+        return (), []
+
+    shape = []
+    params: List[Any] = []
+    for key, value in where.items():
+        column, operator = _split_key(key)
+
+        # Plain equality adapts to the value: lists become IN, None IS NULL
+        if operator == "eq":
+            if value is None:
+                operator = "isnull"
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                operator = "in"
+        elif operator == "ne" and value is None:
+            operator = "notnull"
+        elif operator == "isnull":
+            operator = "isnull" if value else "notnull"
+
+        if operator in _EMPTY_LIST_SQL:
+            values = tuple(value)
+            if not values:
+                shape.append((column, operator + ":empty"))
+                continue
+            params.append(values)
+        elif operator not in ("isnull", "notnull"):
+            params.append(value)
+        shape.append((column, operator))
+
+    return tuple(shape), params
+
+def _where_sql(shape: Shape) -> str:
+    if not shape:
+        return ""
+    parts = []
+    for column, operator in shape:
+        check_identifier(column)
+        if operator.endswith(":empty"):
+            parts.append(_EMPTY_LIST_SQL[operator.split(":", 1)[0]])
+        else:
+            parts.append(f"{column} {OPERATORS[operator]}")
+    return " WHERE " + " AND ".join(parts)
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def parse_order_by(order_by: Optional[str], allowed: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Parse an ORDER BY spec such as "valid_date DESC, name ASC" or "-created_at".
+
+    Args:
+        order_by: The spec
+        allowed: Columns that may be sorted on (a tuple, so the parse is cached)
+
+    Returns:
+        tuple: ((column, "ASC" | "DESC"), ...)
+
+    Raises:
+        ValueError: If a column is not allowed or the direction is invalid
+    """
+    if not order_by:
+        return ()
+
+    terms = []
+    for term in order_by.split(","):
+        parts = term.split()
+        if not parts or len(parts) > 2:
+            raise ValueError(f"Invalid ORDER BY term: {term!r}")
+        column = parts[0]
+        direction = parts[1].upper() if len(parts) == 2 else "ASC"
+        if column.startswith("-"):
+            column, direction = column[1:], "DESC"
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"Invalid ORDER BY direction: {direction!r}")
+        if column not in allowed:
+            raise ValueError(f"Column not allowed in ORDER BY: {column!r}")
+        terms.append((column, direction))
+    return tuple(terms)
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compile_select(table: str,
+                   columns: Optional[Tuple[str, ...]],
+                   shape: Shape,
+                   order: Tuple[Tuple[str, str], ...] = (),
+                   has_limit: bool = False,
+                   has_offset: bool = False) -> str:
+    """
+    Compile a SELECT for a table, column list and filter shape.
+
+    Args:
+        table: The table name
+        columns: Selected columns, or None for all
+        shape: Filter shape from build_where
+        order: Sort terms from parse_order_by
+        has_limit: Whether a LIMIT parameter follows the filter parameters
+        has_offset: Whether an OFFSET parameter follows the LIMIT
+
+    Returns:
+        str: The SQL text
+    """
+    select_list = ", ".join(check_identifier(c) for c in columns) if columns else "*"
+    query = f"SELECT {select_list} FROM {check_identifier(table)}" + _where_sql(shape)
+    if order:
+        query += " ORDER BY " + ", ".join(f"{column} {direction}" for column, direction in order)
+    if has_limit:
+        query += " LIMIT %s"
+        if has_offset:
+            query += " OFFSET %s"
+    elif has_offset:
+        # MySQL needs a LIMIT to accept an OFFSET
+        query += " LIMIT 18446744073709551615 OFFSET %s"
+    return query
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compile_count(table: str, shape: Shape) -> str:
+    """
+    Compile a COUNT(*) for a table and filter shape.
+
+    Args:
+        table: The table name
+        shape: Filter shape from build_where
+
+    Returns:
+        str: The SQL text (result column "total")
+    """
+    return f"SELECT COUNT(*) AS total FROM {check_identifier(table)}" + _where_sql(shape)
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compile_insert(table: str, columns: Tuple[str, ...]) -> str:
+    """
+    Compile a single-row INSERT.
+
+    Args:
+        table: The table name
+        columns: Inserted columns, in parameter order
+
+    Returns:
+        str: The SQL text
+    """
+    column_list = ", ".join(check_identifier(c) for c in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO {check_identifier(table)} ({column_list}) VALUES ({placeholders})"
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compile_update(table: str, columns: Tuple[str, ...], versioned: bool = False) -> str:
+    """
+    Compile an UPDATE by primary key.
+
+    Args:
+        table: The table name
+        columns: Updated columns, in parameter order (followed by id)
+        versioned: Whether a row version parameter follows the id
+
+    Returns:
+        str: The SQL text
+    """
+    set_clause = ", ".join(f"{check_identifier(c)} = %s" for c in columns)
+    query = f"UPDATE {check_identifier(table)} SET {set_clause} WHERE id = %s"
+    if versioned:
+        query += " AND version = %s"
+    return query
+
+def cache_info() -> Dict[str, Any]:
+    """Hit/miss counters of the statement caches, for diagnostics."""
+    return {
+        fn.__name__: fn.cache_info()._asdict()
+        for fn in (compile_select, compile_count, compile_insert, compile_update)
+    }
@@ -0,0 +1,62 @@
+"""
+Compact row types for large result sets.
+
+DictCursor builds a new dict per row, each with its own hash table over the
+column names. For wide or long results (order history, analytics, catalog
+loads) a named tuple is a fraction of the size: the column names live once in
+a class generated per result shape, and each row is a plain tuple of values
+that still reads as `row.column`, `row[index]` or `row._asdict()`.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+ROW_DICT = "dict"
+ROW_TUPLE = "tuple"
+ROW_TYPES = (ROW_DICT, ROW_TUPLE)
+
+def check_row_type(row_type: str) -> str:
+    """
+    Validate a row_type argument.
+
+    Args:
+        row_type: One of ROW_TYPES
+
+    Returns:
+        str: The same row type
+
+    Raises:
+        ValueError: If it is not supported
+    """
+    if row_type not in ROW_TYPES:
+        raise ValueError(f"Unsupported row_type {row_type!r}; use one of {ROW_TYPES}")
+    return row_type
+
+@lru_cache(maxsize=256)
+def row_class(columns: Tuple[str, ...]) -> type:
+    """
+    Get the named tuple class of a result shape, creating it once.
+
+    Column names that are not valid identifiers (e.g. `COUNT(*)`) are renamed
+    to positional names (`_0`, `_1`, ...), so alias computed columns.
+
+    Args:
+        columns: Column names, in select order
+
+    Returns:
+        type: A namedtuple class
+    """
+    return namedtuple("Row", columns, rename=True)
+
+def fetch_tuples(cursor) -> List[Any]:
+    """
+    Fetch the remaining rows of a tuple cursor as named tuples.
+
+    Args:
+        cursor: An executed cursor returning plain tuples (pymysql Cursor)
+
+    Returns:
+        list: Named tuple rows
+    """
+    make = row_class(tuple(column[0] for column in cursor.description))._make
+    return [make(row) for row in cursor.fetchall()]
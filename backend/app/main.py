@@ -7,9 +7,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from app.db.init_db import init_database
+from app.db.db_connect import init_pool, close_pool
+from app.services import events, spot_status
+from app.services.warmup import warm_caches
+from app.utils.compression import CompressionMiddleware
+from app.utils.keyring import keyring
+from app.settings import configure_logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create the FastAPI app instance
@@ -35,6 +39,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON/text responses (gzip, or brotli when installed)
+app.add_middleware(CompressionMiddleware)
+
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
@@ -68,6 +75,12 @@ from app.api.establishment import router as establishment_router
 from app.api.sales_areas import router as sales_areas_router
 from app.api.service_spots import router as service_spots_router
 from app.api.menus import router as menus_router
+from app.api.reports import router as reports_router
+from app.api.analytics import router as analytics_router
+from app.api.forecast import router as forecast_router
+from app.api.sync import router as sync_router
+from app.api.bootstrap import router as bootstrap_router
+from app.api.events import router as events_router
 
 # Include routers
 app.include_router(db_health_router)
@@ -82,17 +95,34 @@ app.include_router(establishment_router)
 app.include_router(sales_areas_router)
 app.include_router(service_spots_router)
 app.include_router(menus_router)
+app.include_router(reports_router)
+app.include_router(analytics_router)
+app.include_router(forecast_router)
+app.include_router(sync_router)
+app.include_router(bootstrap_router)
+app.include_router(events_router)
 
 # Database initialization event
 @app.on_event("startup")
 async def startup_db_client():
     """
     Initialize the database when the application starts.
-    Creates necessary tables and the initial admin user if they don't exist.
+    Creates necessary tables and the initial admin user if they don't exist,
+    opens this worker's connection pool, warms its caches and starts its
+    event poller.
     """
+    configure_logging()
+    init_pool()
     logger.info("Starting database initialization...")
     init_database()
+    spot_status.initialize()
     logger.info("Database initialization completed.")
+    # Load the JWT key ring now so a bad configuration fails at boot, not at login
+    kid, _ = keyring.signing_key()
+    logger.info(f"Signing access tokens with JWT key {kid}")
+    warm_caches()
+    # Runs for the worker's lifetime so its caches see other workers' changes
+    await events.broker.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
@@ -100,5 +130,4 @@ async def shutdown_db_client():
     Clean up any database resources when the application shuts down.
     """
     logger.info("Shutting down database connections...")
-    # No active connections pool to close at this point
-    # In the future, we might add connection pooling and close it here
+    close_pool()
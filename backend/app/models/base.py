@@ -3,18 +3,32 @@ Base model class and shared utilities for database models.
 """
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Iterator
+from pymysql.cursors import Cursor, SSCursor
 from app.db.db_connect import get_connection
+from app.db import query_builder, rows
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class VersionConflict(Exception):
+    """Raised when a versioned write finds the row changed since it was read."""
+    
+    def __init__(self, table_name: str, record_id: int, current_version: int):
+        super().__init__(
+            f"{table_name} {record_id} is at version {current_version}"
+        )
+        self.table_name = table_name
+        self.record_id = record_id
+        self.current_version = current_version
+
 class BaseModel:
     """Base class for all database models"""
     
     table_name = None  # Override in subclasses
     
+    # Columns accepted in find_all(order_by=...); extend in subclasses
+    sortable_columns = ("id", "name", "created_at", "updated_at")
+    
     @classmethod
     def create_table(cls):
         """
@@ -27,12 +41,27 @@ class BaseModel:
         )
     
     @classmethod
-    def find_by_id(cls, id: int) -> Optional[Dict[str, Any]]:
+    def _after_write(cls, action: str, record_id: Optional[int] = None):
+        """
+        Hook called after a committed create, update or delete.
+        
+        Subclasses override it to invalidate in-process caches built from
+        their table.
+        
+        Args:
+            action: "create", "update" or "delete"
+            record_id: The primary key of the affected record
+        """
+        pass
+    
+    @classmethod
+    def find_by_id(cls, id: int, columns: Sequence[str] = None) -> Optional[Dict[str, Any]]:
         """
         Find a record by its ID.
         
         Args:
             id: The primary key value
+            columns: Columns to select (all when omitted)
             
         Returns:
             dict: The record as a dictionary, or None if not found
@@ -47,7 +76,9 @@ class BaseModel:
             
         try:
             with conn.cursor() as cursor:
-                query = f"SELECT * FROM {cls.table_name} WHERE id = %s"
+                query = query_builder.compile_select(
+                    cls.table_name, tuple(columns) if columns else None, (("id", "eq"),)
+                )
                 cursor.execute(query, (id,))
                 result = cursor.fetchone()
                 return result
@@ -62,21 +93,41 @@ class BaseModel:
                  where: Dict[str, Any] = None, 
                  order_by: str = None, 
                  limit: int = None,
-                 offset: int = None) -> List[Dict[str, Any]]:
+                 offset: int = None,
+                 columns: Sequence[str] = None,
+                 row_type: str = rows.ROW_DICT) -> List[Any]:
         """
         Find all records matching the given criteria.
         
         Args:
-            where: Dictionary of column-value pairs for filtering
-            order_by: Column to order by, e.g. "name ASC" or "created_at DESC"
+            where: Filters as column-value pairs; keys may carry an operator
+                suffix (status__in, created_at__gte, closed_at__isnull, ...),
+                list values filter with IN and None with IS NULL
+                (see app.db.query_builder)
+            order_by: Columns to order by, e.g. "name ASC" or "created_at DESC";
+                only columns in sortable_columns are accepted
             limit: Maximum number of records to return
             offset: Number of records to skip
+            columns: Columns to select (all when omitted)
+            row_type: "dict" (default) or "tuple" for compact named tuple
+                rows (see app.db.rows)
             
         Returns:
-            list: List of records as dictionaries
+            list: List of records as dictionaries (or named tuples)
         """
         if not cls.table_name:
             raise ValueError(f"table_name not defined for {cls.__name__}")
+        rows.check_row_type(row_type)
+        
+        shape, params = query_builder.build_where(where)
+        order = query_builder.parse_order_by(order_by, cls.sortable_columns)
+        query = query_builder.compile_select(
+            cls.table_name, tuple(columns) if columns else None, shape, order, bool(limit), bool(offset)
+        )
+        if limit:
+            params.append(limit)
+        if offset:
+            params.append(offset)
             
         conn = get_connection()
         if not conn:
@@ -84,34 +135,11 @@ class BaseModel:
             return []
             
         try:
+            if row_type == rows.ROW_TUPLE:
+                with conn.cursor(Cursor) as cursor:
+                    cursor.execute(query, tuple(params))
+                    return rows.fetch_tuples(cursor)
             with conn.cursor() as cursor:
-                query = f"SELECT * FROM {cls.table_name}"
-                params = []
-                
-                # Add WHERE clause if needed
-                if where:
-                    where_parts = []
-                    for key, value in where.items():
-                        where_parts.append(f"{key} = %s")
-                        params.append(value)
-                    
-                    if where_parts:
-                        query += " WHERE " + " AND ".join(where_parts)
-                
-                # Add ORDER BY if specified
-                if order_by:
-                    query += f" ORDER BY {order_by}"
-                
-                # Add LIMIT if specified
-                if limit:
-                    query += " LIMIT %s"
-                    params.append(limit)
-                
-                # Add OFFSET if specified
-                if offset:
-                    query += " OFFSET %s"
-                    params.append(offset)
-                
                 cursor.execute(query, tuple(params))
                 results = cursor.fetchall()
                 return results
@@ -121,6 +149,45 @@ class BaseModel:
         finally:
             conn.close()
     
+    @classmethod
+    def find_one(cls,
+                 where: Dict[str, Any],
+                 columns: Sequence[str] = None,
+                 order_by: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the first record matching the given criteria.
+        
+        Args:
+            where: Filters, as in find_all
+            columns: Columns to select (all when omitted)
+            order_by: Columns to order by, as in find_all
+            
+        Returns:
+            dict: The record as a dictionary, or None if not found
+        """
+        results = cls.find_all(where=where, order_by=order_by, limit=1, columns=columns)
+        return results[0] if results else None
+    
+    @classmethod
+    def count(cls, where: Dict[str, Any] = None) -> int:
+        """
+        Count the records matching the given criteria.
+        
+        Args:
+            where: Filters, as in find_all
+            
+        Returns:
+            int: Number of matching records (0 on error)
+        """
+        if not cls.table_name:
+            raise ValueError(f"table_name not defined for {cls.__name__}")
+        
+        shape, params = query_builder.build_where(where)
+        result = cls.execute_custom_query(
+            query_builder.compile_count(cls.table_name, shape), tuple(params)
+        )
+        return int(result[0]['total']) if result else 0
+    
     @classmethod
     def create(cls, data: Dict[str, Any]) -> Optional[int]:
         """
@@ -146,18 +213,14 @@ class BaseModel:
             
         try:
             with conn.cursor() as cursor:
-                # Prepare column names and placeholders
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join(["%s"] * len(data))
-                
-                query = f"INSERT INTO {cls.table_name} ({columns}) VALUES ({placeholders})"
+                query = query_builder.compile_insert(cls.table_name, tuple(data.keys()))
                 cursor.execute(query, tuple(data.values()))
                 
                 # Get the ID of the inserted record
-                cursor.execute("SELECT LAST_INSERT_ID()")
-                last_id = cursor.fetchone()['LAST_INSERT_ID()']
+                last_id = cursor.lastrowid
                 
                 conn.commit()
+                cls._after_write("create", last_id)
                 return last_id
         except Exception as e:
             logger.error(f"Error in {cls.__name__}.create: {e}")
@@ -167,16 +230,22 @@ class BaseModel:
             conn.close()
     
     @classmethod
-    def update(cls, id: int, data: Dict[str, Any]) -> bool:
+    def update(cls, id: int, data: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
         """
         Update an existing record.
         
         Args:
             id: The primary key value
             data: Dictionary of column-value pairs to update
+            expected_version: For tables with a row version, only update if the
+                row is still at this version
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            VersionConflict: If expected_version is given and the row has
+                another version
         """
         if not cls.table_name:
             raise ValueError(f"table_name not defined for {cls.__name__}")
@@ -188,32 +257,53 @@ class BaseModel:
         # Don't update timestamps that are managed by MySQL
         if 'created_at' in data:
             del data['created_at']
+        
+        # Row versions are bumped by the database triggers
+        if 'version' in data:
+            del data['version']
             
         conn = get_connection()
         if not conn:
             logger.error(f"Failed to connect to database in {cls.__name__}.update")
             return False
-            
+        
+        current_version = None
         try:
             with conn.cursor() as cursor:
-                # Prepare SET clause
-                set_parts = [f"{key} = %s" for key in data.keys()]
-                set_clause = ", ".join(set_parts)
-                
-                query = f"UPDATE {cls.table_name} SET {set_clause} WHERE id = %s"
+                query = query_builder.compile_update(
+                    cls.table_name, tuple(data.keys()), expected_version is not None
+                )
                 params = list(data.values()) + [id]
+                if expected_version is not None:
+                    params.append(expected_version)
                 
                 cursor.execute(query, tuple(params))
                 conn.commit()
                 
                 # Check if any rows were affected
-                return cursor.rowcount > 0
+                if cursor.rowcount > 0:
+                    cls._after_write("update", id)
+                    return True
+                
+                # Only a missed versioned update pays for a second read
+                if expected_version is not None:
+                    cursor.execute(f"SELECT version FROM {cls.table_name} WHERE id = %s", (id,))
+                    row = cursor.fetchone()
+                    if row and row['version'] == expected_version:
+                        # Matched but left unchanged
+                        return True
+                    if row:
+                        current_version = row['version']
+                if current_version is None:
+                    return False
         except Exception as e:
             logger.error(f"Error in {cls.__name__}.update: {e}")
             conn.rollback()
             return False
         finally:
             conn.close()
+        
+        raise VersionConflict(cls.table_name, id, current_version)
     
     @classmethod
     def delete(cls, id: int) -> bool:
@@ -241,7 +331,10 @@ class BaseModel:
                 conn.commit()
                 
                 # Check if any rows were affected
-                return cursor.rowcount > 0
+                if cursor.rowcount > 0:
+                    cls._after_write("delete", id)
+                    return True
+                return False
         except Exception as e:
             logger.error(f"Error in {cls.__name__}.delete: {e}")
             conn.rollback()
@@ -250,26 +343,34 @@ class BaseModel:
             conn.close()
             
     @classmethod
-    def execute_custom_query(cls, query: str, params: Tuple = None) -> List[Dict[str, Any]]:
+    def execute_custom_query(cls,
+                             query: str,
+                             params: Tuple = None,
+                             row_type: str = rows.ROW_DICT) -> List[Any]:
         """
         Execute a custom SQL query.
         
         Args:
             query: The SQL query to execute
             params: Query parameters
+            row_type: "dict" (default) or "tuple" for compact named tuple
+                rows of a SELECT (see app.db.rows)
             
         Returns:
-            list: Query results as dictionaries
+            list: Query results as dictionaries (or named tuples)
         """
+        rows.check_row_type(row_type)
         conn = get_connection()
         if not conn:
             logger.error(f"Failed to connect to database in {cls.__name__}.execute_custom_query")
             return []
             
         try:
-            with conn.cursor() as cursor:
+            with conn.cursor(Cursor if row_type == rows.ROW_TUPLE else None) as cursor:
                 cursor.execute(query, params or ())
                 if query.strip().upper().startswith(('SELECT', 'SHOW')):
+                    if row_type == rows.ROW_TUPLE:
+                        return rows.fetch_tuples(cursor)
                     return cursor.fetchall()
                 else:
                     conn.commit()
@@ -281,3 +382,63 @@ class BaseModel:
             return []
         finally:
             conn.close()
+    
+    @classmethod
+    def stream_custom_query(cls,
+                            query: str,
+                            params: Tuple = None,
+                            fetch_size: int = 1000) -> Iterator[tuple]:
+        """
+        Stream the rows of a SELECT query as tuples.
+        
+        Uses an unbuffered server-side cursor (SSCursor), so rows are read from
+        the socket as they are consumed and memory stays flat regardless of the
+        result size. The connection is closed when the iterator is exhausted
+        or closed.
+        
+        Args:
+            query: The SQL query to execute
+            params: Query parameters
+            fetch_size: Rows pulled from the server per fetchmany()
+            
+        Returns:
+            Iterator[tuple]: One row at a time, in SELECT column order
+            
+        Raises:
+            RuntimeError: If the database is unavailable
+            pymysql.MySQLError: If the query fails to start
+        """
+        # Connect and start the query before returning, so callers learn that
+        # the database is down here rather than from an empty iterator
+        conn = get_connection(cursorclass=SSCursor)
+        if not conn:
+            logger.error(f"Failed to connect to database in {cls.__name__}.stream_custom_query")
+            raise RuntimeError("Database unavailable")
+            
+        # The cursor is deliberately not used as a context manager: closing an
+        # SSCursor drains the remaining result set, which would read the whole
+        # result when a consumer stops early. Closing the connection aborts the
+        # query instead.
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params or ())
+        except Exception as e:
+            logger.error(f"Error in {cls.__name__}.stream_custom_query: {e}")
+            conn.close()
+            raise
+        return cls._stream_rows(conn, cursor, fetch_size)
+    
+    @classmethod
+    def _stream_rows(cls, conn, cursor, fetch_size: int) -> Iterator[tuple]:
+        try:
+            while True:
+                batch = cursor.fetchmany(fetch_size)
+                if not batch:
+                    break
+                yield from batch
+            cursor.close()
+        except Exception as e:
+            logger.error(f"Error in {cls.__name__}.stream_custom_query: {e}")
+            raise
+        finally:
+            conn.close()
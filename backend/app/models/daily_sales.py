@@ -0,0 +1,202 @@
+"""
+DailySales model holding the pre-aggregated sales rollup.
+One row per day × sales area × product × user (the waiter who opened the order).
+"""
+import logging
+from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
+from app.db.db_connect import get_connection
+from app.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class DailySales(BaseModel):
+    """Model for the daily sales rollup"""
+    
+    table_name = "DailySales"
+    
+    # Dimensions accepted by get_report, mapped to their rollup column
+    GROUP_BY_COLUMNS = {
+        "date": "ds.sale_date",
+        "sales_area": "ds.sales_area_id",
+        "product": "ds.product_id",
+        "user": "ds.user_id",
+    }
+    
+    # Aggregates one order's non-canceled items into the rollup. The sign
+    # parameter appears once per measure so the same statement can add
+    # (+1) or retract (-1) an order.
+    _APPLY_ORDER_SQL = """
+        INSERT INTO DailySales (sale_date, sales_area_id, product_id, user_id,
+                                quantity, revenue, order_count)
+        SELECT
+            DATE(o.closed_at), o.sales_area_id, oi.product_id, o.created_by,
+            %s * SUM(oi.quantity), %s * SUM(oi.total_price), %s
+        FROM Orders o
+        JOIN OrderItems oi ON oi.order_id = o.id
+        WHERE o.id = %s
+        AND o.closed_at IS NOT NULL
+        AND oi.status <> 'cancelado'
+        GROUP BY DATE(o.closed_at), o.sales_area_id, oi.product_id, o.created_by
+        ON DUPLICATE KEY UPDATE
+            quantity = quantity + VALUES(quantity),
+            revenue = revenue + VALUES(revenue),
+            order_count = order_count + VALUES(order_count)
+    """
+    
+    @classmethod
+    def apply_order(cls, order_id: int, sign: int = 1, cursor=None) -> bool:
+        """
+        Add (sign=1) or retract (sign=-1) a paid order in the rollup.
+        
+        Args:
+            order_id: The order ID
+            sign: 1 to add the order, -1 to remove it
+            cursor: Optional cursor of an open transaction. When given the
+                statement runs inside that transaction and is not committed here.
+                
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        params = (sign, sign, sign, order_id)
+        
+        if cursor is not None:
+            cursor.execute(cls._APPLY_ORDER_SQL, params)
+            return True
+            
+        return bool(cls.execute_custom_query(cls._APPLY_ORDER_SQL, params))
+    
+    @classmethod
+    def backfill(cls, from_date: date = None, to_date: date = None) -> Optional[int]:
+        """
+        Rebuild the rollup from paid orders, optionally limited to a date range.
+        Existing rollup rows in the range are replaced in a single transaction.
+        
+        Args:
+            from_date: First closing date to rebuild (defaults to all history)
+            to_date: Last closing date to rebuild, inclusive
+            
+        Returns:
+            int: Number of rollup rows written, or None if failed
+        """
+        delete_query = "DELETE FROM DailySales WHERE 1=1"
+        insert_query = """
+            INSERT INTO DailySales (sale_date, sales_area_id, product_id, user_id,
+                                    quantity, revenue, order_count)
+            SELECT
+                DATE(o.closed_at), o.sales_area_id, oi.product_id, o.created_by,
+                SUM(oi.quantity), SUM(oi.total_price), COUNT(DISTINCT o.id)
+            FROM Orders o
+            JOIN OrderItems oi ON oi.order_id = o.id
+            WHERE o.status = 'cobrada'
+            AND o.closed_at IS NOT NULL
+            AND oi.status <> 'cancelado'
+        """
+        delete_params = []
+        insert_params = []
+        
+        if from_date:
+            delete_query += " AND sale_date >= %s"
+            delete_params.append(from_date)
+            insert_query += " AND o.closed_at >= %s"
+            insert_params.append(from_date)
+            
+        if to_date:
+            delete_query += " AND sale_date <= %s"
+            delete_params.append(to_date)
+            insert_query += " AND o.closed_at < %s"
+            insert_params.append(to_date + timedelta(days=1))
+            
+        insert_query += " GROUP BY DATE(o.closed_at), o.sales_area_id, oi.product_id, o.created_by"
+        
+        conn = get_connection()
+        if not conn:
+            logger.error(f"Failed to connect to database in {cls.__name__}.backfill")
+            return None
+            
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(delete_query, tuple(delete_params))
+                cursor.execute(insert_query, tuple(insert_params))
+                written = cursor.rowcount
+            conn.commit()
+            return written
+        except Exception as e:
+            logger.error(f"Error in {cls.__name__}.backfill: {e}")
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+    
+    @classmethod
+    def get_report(cls,
+                   from_date: date,
+                   to_date: date,
+                   group_by: List[str],
+                   sales_area_id: int = None,
+                   product_id: int = None,
+                   user_id: int = None) -> List[Dict[str, Any]]:
+        """
+        Aggregate the rollup for a date range.
+        
+        Args:
+            from_date: First sale date to include
+            to_date: Last sale date to include
+            group_by: Dimensions to group by (keys of GROUP_BY_COLUMNS)
+            sales_area_id: Optional filter by sales area
+            product_id: Optional filter by product
+            user_id: Optional filter by user
+            
+        Returns:
+            list: One row per group with quantity, revenue and order_count
+        """
+        select_parts = []
+        joins = []
+        group_parts = []
+        
+        for dimension in group_by:
+            column = cls.GROUP_BY_COLUMNS[dimension]
+            group_parts.append(column)
+            select_parts.append(column)
+            
+            # Resolve display names from the small dimension tables
+            if dimension == "sales_area":
+                joins.append("LEFT JOIN SalesAreas sa ON sa.id = ds.sales_area_id")
+                select_parts.append("MAX(sa.name) AS sales_area_name")
+            elif dimension == "product":
+                joins.append("LEFT JOIN Products p ON p.id = ds.product_id")
+                select_parts.append("MAX(p.name) AS product_name")
+            elif dimension == "user":
+                joins.append("LEFT JOIN Users u ON u.id = ds.user_id")
+                select_parts.append("MAX(u.username) AS username")
+        
+        select_parts.extend([
+            "SUM(ds.quantity) AS quantity",
+            "SUM(ds.revenue) AS revenue",
+            "SUM(ds.order_count) AS order_count",
+        ])
+        
+        query = f"""
+            SELECT {", ".join(select_parts)}
+            FROM DailySales ds
+            {" ".join(joins)}
+            WHERE ds.sale_date BETWEEN %s AND %s
+        """
+        params = [from_date, to_date]
+        
+        if sales_area_id:
+            query += " AND ds.sales_area_id = %s"
+            params.append(sales_area_id)
+            
+        if product_id:
+            query += " AND ds.product_id = %s"
+            params.append(product_id)
+            
+        if user_id:
+            query += " AND ds.user_id = %s"
+            params.append(user_id)
+            
+        if group_parts:
+            query += f" GROUP BY {', '.join(group_parts)} ORDER BY {', '.join(group_parts)}"
+            
+        return cls.execute_custom_query(query, tuple(params))
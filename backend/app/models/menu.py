@@ -1,20 +1,45 @@
 """
 Menu model representing menu cards for specific dates.
 """
-from typing import Dict, Any, Optional, List
+import logging
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import date
+import pymysql
+from app.db.db_connect import transaction
 from app.models.base import BaseModel
+from app.models.menu_item import MenuItem
+from app.services import menu_documents, menu_resolver, menu_suggest, price_book
+
+logger = logging.getLogger(__name__)
 
 class Menu(BaseModel):
     """Model for menus/cards with products for specific dates"""
     
     table_name = "Menus"
+    sortable_columns = BaseModel.sortable_columns + ("valid_date", "status")
     
     # Status constants
     STATUS_DRAFT = 'borrador'
     STATUS_PUBLISHED = 'publicada'
     STATUS_ARCHIVED = 'archivada'
     
+    # Price adjustment modes and the SQL expression of the new price
+    PRICE_PERCENT = 'percent'
+    PRICE_ABSOLUTE = 'absolute'
+    PRICE_EXPRESSIONS = {
+        PRICE_PERCENT: "mi.price * (1 + %s / 100)",
+        PRICE_ABSOLUTE: "mi.price + %s",
+    }
+    # Adjusted prices never drop below this
+    MIN_PRICE = 0.01
+    
+    @classmethod
+    def _after_write(cls, action: str, record_id: Optional[int] = None):
+        menu_suggest.invalidate()
+        menu_resolver.invalidate()
+        menu_documents.invalidate(record_id)
+        price_book.invalidate(record_id)
+    
     @classmethod
     def get_active_for_date(cls, target_date: date = None) -> List[Dict[str, Any]]:
         """
@@ -26,17 +51,42 @@ class Menu(BaseModel):
         Returns:
             list: List of active menus for the date
         """
-        date_str = target_date.strftime('%Y-%m-%d') if target_date else 'CURRENT_DATE()'
-        
         return cls.execute_custom_query(
-            f"""
+            """
             SELECT *
             FROM Menus
             WHERE status = %s
-            AND valid_date = {date_str}
+            AND valid_date = %s
             ORDER BY name ASC
             """,
-            (cls.STATUS_PUBLISHED,)
+            (cls.STATUS_PUBLISHED, target_date or date.today())
+        )
+    
+    @classmethod
+    def get_by_sales_area(cls, sales_area_id: int, only_published: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get the menus assigned to a sales area.
+        
+        Args:
+            sales_area_id: The sales area ID
+            only_published: Whether to include only published menus
+            
+        Returns:
+            list: List of menus, newest date first
+        """
+        status_clause = "AND m.status = %s" if only_published else ""
+        params = (sales_area_id, cls.STATUS_PUBLISHED) if only_published else (sales_area_id,)
+        
+        return cls.execute_custom_query(
+            f"""
+            SELECT m.*
+            FROM Menus m
+            JOIN MenuSalesAreas msa ON m.id = msa.menu_id
+            WHERE msa.sales_area_id = %s
+            {status_clause}
+            ORDER BY m.valid_date DESC, m.name ASC
+            """,
+            params
         )
     
     @classmethod
@@ -123,13 +173,17 @@ class Menu(BaseModel):
         Returns:
             bool: True if successful, False otherwise
         """
-        return cls.execute_custom_query(
+        result = cls.execute_custom_query(
             """
             INSERT INTO MenuItems (menu_id, product_id, price, is_available)
             VALUES (%s, %s, %s, %s)
             """,
             (menu_id, product_id, price, is_available)
-        ) is not None
+        )
+        menu_suggest.invalidate()
+        menu_documents.invalidate(menu_id)
+        price_book.invalidate(menu_id)
+        return bool(result)
     
     @classmethod
     def assign_to_area(cls, menu_id: int, sales_area_id: int) -> bool:
@@ -143,18 +197,22 @@ class Menu(BaseModel):
         Returns:
             bool: True if successful, False otherwise
         """
-        return cls.execute_custom_query(
+        result = cls.execute_custom_query(
             """
             INSERT IGNORE INTO MenuSalesAreas (menu_id, sales_area_id)
             VALUES (%s, %s)
             """,
             (menu_id, sales_area_id)
-        ) is not None
+        )
+        menu_suggest.invalidate()
+        menu_resolver.invalidate()
+        menu_documents.invalidate(menu_id)
+        return bool(result)
     
     @classmethod
     def publish(cls, menu_id: int) -> bool:
         """
-        Publish a menu (change status to published).
+        Publish a menu (change status to published) and compile its documents.
         
         Args:
             menu_id: The menu ID
@@ -162,7 +220,14 @@ class Menu(BaseModel):
         Returns:
             bool: True if successful, False otherwise
         """
-        return cls.update(menu_id, {"status": cls.STATUS_PUBLISHED})
+        if not cls.update(menu_id, {"status": cls.STATUS_PUBLISHED}):
+            return False
+        try:
+            menu_documents.compile_menu(menu_id)
+        except (RuntimeError, pymysql.MySQLError) as e:
+            # The first read of the document compiles it instead
+            logger.error(f"Error compiling the documents of menu {menu_id}: {e}")
+        return True
     
     @classmethod
     def archive(cls, menu_id: int) -> bool:
@@ -176,3 +241,107 @@ class Menu(BaseModel):
             bool: True if successful, False otherwise
         """
         return cls.update(menu_id, {"status": cls.STATUS_ARCHIVED})
+    
+    @classmethod
+    def clone(cls,
+              menu_id: int,
+              valid_date: date,
+              name: str = None,
+              created_by: int = None) -> Optional[Tuple[int, int, int]]:
+        """
+        Copy a menu, its items and its sales areas to a new draft menu.
+        
+        Runs three INSERT ... SELECT statements in one transaction, so the
+        number of round-trips does not depend on the size of the menu.
+        
+        Args:
+            menu_id: The menu to copy
+            valid_date: Date of the new menu
+            name: Name of the new menu (defaults to the original's)
+            created_by: The user ID creating the copy
+            
+        Returns:
+            tuple: (new menu ID, items copied, sales areas copied), or None if
+                the menu does not exist
+            
+        Raises:
+            RuntimeError: If the database is unavailable
+        """
+        with transaction() as cursor:
+            if not cursor.execute(
+                """
+                INSERT INTO Menus (name, valid_date, status, created_by)
+                SELECT COALESCE(%s, name), %s, %s, %s
+                FROM Menus
+                WHERE id = %s
+                """,
+                (name, valid_date, cls.STATUS_DRAFT, created_by, menu_id)
+            ):
+                return None
+            new_menu_id = cursor.lastrowid
+            
+            items_copied = cursor.execute(
+                """
+                INSERT INTO MenuItems (menu_id, product_id, price, is_available)
+                SELECT %s, product_id, price, is_available
+                FROM MenuItems
+                WHERE menu_id = %s
+                ORDER BY id
+                """,
+                (new_menu_id, menu_id)
+            )
+            areas_copied = cursor.execute(
+                """
+                INSERT INTO MenuSalesAreas (menu_id, sales_area_id)
+                SELECT %s, sales_area_id
+                FROM MenuSalesAreas
+                WHERE menu_id = %s
+                """,
+                (new_menu_id, menu_id)
+            )
+        
+        cls._after_write("create", new_menu_id)
+        return new_menu_id, items_copied, areas_copied
+    
+    @classmethod
+    def adjust_prices(cls,
+                      menu_id: int,
+                      mode: str,
+                      amount: float,
+                      category_id: int = None) -> Optional[int]:
+        """
+        Adjust the prices of a menu's items with a single UPDATE ... JOIN.
+        
+        Prices are rounded to cents and never drop below MIN_PRICE.
+        
+        Args:
+            menu_id: The menu ID
+            mode: PRICE_PERCENT or PRICE_ABSOLUTE
+            amount: Percentage or amount added to each price (negative lowers it)
+            category_id: Only adjust items whose product is in this category
+            
+        Returns:
+            int: Number of items whose price changed, or None on error
+            
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in cls.PRICE_EXPRESSIONS:
+            raise ValueError(f"Unknown price adjustment mode: {mode}")
+        
+        query = f"""
+            UPDATE MenuItems mi
+            JOIN Products p ON p.id = mi.product_id
+            SET mi.price = GREATEST(ROUND({cls.PRICE_EXPRESSIONS[mode]}, 2), %s)
+            WHERE mi.menu_id = %s
+        """
+        params = [amount, cls.MIN_PRICE, menu_id]
+        if category_id is not None:
+            query += " AND p.category_id = %s"
+            params.append(category_id)
+        
+        result = cls.execute_custom_query(query, tuple(params))
+        if not result:
+            return None
+        MenuItem._after_write("update")
+        return result[0]['affected_rows']
@@ -3,6 +3,7 @@ Menu Item model for database operations
 """
 from typing import Dict, Any, Optional, List
 from app.models.base import BaseModel
+from app.services import menu_documents, menu_suggest, price_book
 
 class MenuItem(BaseModel):
     """
@@ -10,6 +11,12 @@ class MenuItem(BaseModel):
     """
     table_name = "MenuItems"
     
+    @classmethod
+    def _after_write(cls, action: str, record_id: Optional[int] = None):
+        menu_suggest.invalidate()
+        menu_documents.invalidate()
+        price_book.invalidate()
+    
     @classmethod
     def get_by_menu_id(cls, menu_id: int) -> List[Dict[str, Any]]:
         """
@@ -1,10 +1,16 @@
 """
 Order model representing customer orders/commands.
 """
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from app.models.base import BaseModel
-from app.models.service_spot import ServiceSpot
+import logging
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+from datetime import datetime, date, timedelta
+from app.db.db_connect import transaction
+from app.models.base import BaseModel, VersionConflict
+from app.models.daily_sales import DailySales
+from app.models.order_item import OrderItem
+from app.services import price_book, spot_status
+
+logger = logging.getLogger(__name__)
 
 class Order(BaseModel):
     """Model for customer orders (comandas)"""
@@ -18,12 +24,25 @@ class Order(BaseModel):
     STATUS_PAID = 'cobrada'
     STATUS_CANCELED = 'cancelada'
     
+    # Columns emitted by stream_closed_with_items, in row order
+    EXPORT_COLUMNS = (
+        "order_id", "service_spot_id", "sales_area_id", "menu_id",
+        "total_amount", "tax_amount", "created_by", "closed_by",
+        "created_at", "closed_at", "item_id", "product_id", "product_name",
+        "quantity", "unit_price", "total_price", "item_status", "notes",
+    )
+    
+    # Rows pulled from the server per fetchmany() while streaming
+    EXPORT_FETCH_SIZE = 1000
+    
     @classmethod
     def create_order(cls, 
                      service_spot_id: int, 
                      sales_area_id: int, 
                      menu_id: int, 
-                     created_by: int) -> Optional[int]:
+                     created_by: int,
+                     status: str = STATUS_OPEN,
+                     cursor=None) -> Optional[int]:
         """
         Create a new order and update the service spot status.
         
@@ -32,6 +51,9 @@ class Order(BaseModel):
             sales_area_id: The sales area ID
             menu_id: The menu ID
             created_by: The user ID who created the order
+            status: The order's initial status
+            cursor: Optional cursor of an open transaction; when given, both
+                writes join it and the caller commits
             
         Returns:
             int: Order ID if successful, None otherwise
@@ -41,21 +63,68 @@ class Order(BaseModel):
             "service_spot_id": service_spot_id,
             "sales_area_id": sales_area_id,
             "menu_id": menu_id,
-            "status": cls.STATUS_OPEN,
+            "status": status,
             "created_by": created_by
         }
         
-        order_id = cls.create(order_data)
+        if cursor is None:
+            try:
+                with transaction() as own_cursor:
+                    return cls.create_order(
+                        service_spot_id, sales_area_id, menu_id, created_by, status, cursor=own_cursor
+                    )
+            except Exception as e:
+                logger.error(f"Error in {cls.__name__}.create_order: {e}")
+                return None
         
-        if order_id:
-            # Update service spot status
-            ServiceSpot.update_status(
-                service_spot_id, 
-                ServiceSpot.STATUS_ORDER_OPEN
-            )
-            
+        columns = ", ".join(order_data.keys())
+        placeholders = ", ".join(["%s"] * len(order_data))
+        cursor.execute(
+            f"INSERT INTO {cls.table_name} ({columns}) VALUES ({placeholders})",
+            tuple(order_data.values())
+        )
+        order_id = cursor.lastrowid
+        
+        # Update service spot status
+        spot_status.order_status_changed(service_spot_id, status, cursor)
         return order_id
     
+    @classmethod
+    def delete_with_items(cls, order_id: int) -> bool:
+        """
+        Delete an order and its items in one transaction.
+        
+        A paid order is retracted from the sales rollup and the spot's status
+        is recomputed in the same transaction. Items are deleted explicitly
+        rather than through the foreign key cascade so the delete triggers
+        (sync tombstones) fire for every item.
+        
+        Args:
+            order_id: The order ID
+            
+        Returns:
+            bool: True if the order was deleted, False if missing or on error
+        """
+        try:
+            with transaction() as cursor:
+                cursor.execute(
+                    f"SELECT status, service_spot_id FROM {cls.table_name} WHERE id = %s FOR UPDATE",
+                    (order_id,)
+                )
+                order = cursor.fetchone()
+                if not order:
+                    return False
+                
+                if order['status'] == cls.STATUS_PAID:
+                    DailySales.apply_order(order_id, sign=-1, cursor=cursor)
+                cursor.execute("DELETE FROM OrderItems WHERE order_id = %s", (order_id,))
+                cursor.execute(f"DELETE FROM {cls.table_name} WHERE id = %s", (order_id,))
+                spot_status.order_closed(order['service_spot_id'], cursor)
+            return True
+        except Exception as e:
+            logger.error(f"Error in {cls.__name__}.delete_with_items: {e}")
+            return False
+    
     @classmethod
     def get_active_by_spot(cls, service_spot_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -70,7 +139,7 @@ class Order(BaseModel):
         orders = cls.find_all(
             where={
                 "service_spot_id": service_spot_id,
-                "status": [cls.STATUS_OPEN, cls.STATUS_IN_PREPARATION, cls.STATUS_SERVED]
+                "status__in": [cls.STATUS_OPEN, cls.STATUS_IN_PREPARATION, cls.STATUS_SERVED]
             }, 
             order_by="created_at DESC",
             limit=1
@@ -104,6 +173,7 @@ class Order(BaseModel):
                 o.created_at,
                 o.updated_at,
                 o.closed_at,
+                o.version,
                 u_created.username as created_by_username,
                 u_closed.username as closed_by_username,
                 ss.name as service_spot_name,
@@ -208,29 +278,203 @@ class Order(BaseModel):
         Returns:
             bool: True if successful, False otherwise
         """
-        update_data = {"status": new_status}
+        return cls.transition_status(order_id, new_status, closed_by)
+    
+    @classmethod
+    def transition_status(cls,
+                          order_id: int,
+                          new_status: str,
+                          closed_by: int = None,
+                          expected_version: Optional[int] = None) -> bool:
+        """
+        Change an order's status and keep the DailySales rollup and the
+        service spot status in sync.
+        
+        Runs in a single transaction with the order row locked, so an order is
+        added to the rollup exactly once when it becomes paid (cobrada) and
+        retracted if it leaves that status, even under concurrent requests.
+        
+        Args:
+            order_id: The order ID
+            new_status: The new status
+            closed_by: The user ID who closed the order (if applicable)
+            expected_version: Only change the order if it is at this version
+            
+        Returns:
+            bool: True if successful, False otherwise
+            
+        Raises:
+            VersionConflict: If expected_version is given and the order has
+                another version
+        """
+        try:
+            with transaction() as cursor:
+                return cls._transition(cursor, order_id, new_status, closed_by, expected_version)
+        except VersionConflict:
+            raise
+        except Exception as e:
+            logger.error(f"Error in {cls.__name__}.transition_status: {e}")
+            return False
+    
+    @classmethod
+    def _transition(cls, cursor, order_id: int, new_status: str,
+                    closed_by: int = None, expected_version: Optional[int] = None) -> bool:
+        cursor.execute(
+            "SELECT status, service_spot_id, version FROM Orders WHERE id = %s FOR UPDATE",
+            (order_id,)
+        )
+        current = cursor.fetchone()
+        if not current:
+            return False
+        if expected_version is not None and current['version'] != expected_version:
+            raise VersionConflict(cls.table_name, order_id, current['version'])
+            
+        old_status = current['status']
+        if old_status == new_status:
+            return True
+        
+        # Retract with the old closing date before it is overwritten
+        if old_status == cls.STATUS_PAID:
+            DailySales.apply_order(order_id, sign=-1, cursor=cursor)
+        
+        set_parts = ["status = %s"]
+        params = [new_status]
         
         if new_status in [cls.STATUS_PAID, cls.STATUS_CANCELED]:
-            update_data["closed_at"] = datetime.now()
+            set_parts.append("closed_at = %s")
+            params.append(datetime.now())
             
             if closed_by:
-                update_data["closed_by"] = closed_by
-                
-            # Also update service spot status
-            order = cls.find_by_id(order_id)
-            if order:
-                if new_status == cls.STATUS_PAID:
-                    ServiceSpot.update_status(
-                        order['service_spot_id'], 
-                        ServiceSpot.STATUS_PAID
-                    )
-                else:  # CANCELED
-                    ServiceSpot.update_status(
-                        order['service_spot_id'], 
-                        ServiceSpot.STATUS_FREE
+                set_parts.append("closed_by = %s")
+                params.append(closed_by)
+        
+        cursor.execute(
+            f"UPDATE Orders SET {', '.join(set_parts)} WHERE id = %s",
+            tuple(params + [order_id])
+        )
+        
+        if new_status == cls.STATUS_PAID:
+            DailySales.apply_order(order_id, sign=1, cursor=cursor)
+        
+        spot_status.order_status_changed(current['service_spot_id'], new_status, cursor)
+        return True
+    
+    @classmethod
+    def apply_update(cls,
+                     order_id: int,
+                     new_status: Optional[str] = None,
+                     items: Optional[List[Dict[str, Any]]] = None,
+                     closed_by: int = None,
+                     expected_version: Optional[int] = None) -> bool:
+        """
+        Update an open order's status and/or replace its items atomically.
+        
+        The write starts with a conditional UPDATE on (id, version), so a
+        concurrent edit is detected without locking the row beforehand; the
+        row is only read again when that UPDATE matches nothing.
+        
+        Args:
+            order_id: The order ID
+            new_status: The new status, if it changes
+            items: Replacement items (product_id, quantity, notes), priced from
+                the order's menu, or None to keep the current ones
+            closed_by: The user ID who closed the order (if applicable)
+            expected_version: Only update the order if it is at this version
+            
+        Returns:
+            bool: True if updated, False if the order does not exist
+            
+        Raises:
+            VersionConflict: If the order is not at expected_version
+            ValueError: If the order is already paid
+            PriceBookError: If an item is not on the order's menu or is unavailable
+            RuntimeError: If the database is unavailable
+        """
+        query = "UPDATE Orders SET updated_at = NOW() WHERE id = %s AND status <> %s"
+        params = [order_id, cls.STATUS_PAID]
+        if expected_version is not None:
+            query += " AND version = %s"
+            params.append(expected_version)
+        
+        with transaction() as cursor:
+            # Claims the row; the row-version trigger bumps its version
+            if not cursor.execute(query, tuple(params)):
+                cursor.execute("SELECT status, version FROM Orders WHERE id = %s", (order_id,))
+                current = cursor.fetchone()
+                if not current:
+                    return False
+                if current['status'] == cls.STATUS_PAID:
+                    raise ValueError("Cannot update a closed order")
+                raise VersionConflict(cls.table_name, order_id, current['version'])
+            
+            # Items first: closing the order rolls its final total into DailySales
+            if items is not None:
+                cursor.execute("SELECT menu_id FROM Orders WHERE id = %s", (order_id,))
+                items = price_book.price_items(cursor.fetchone()['menu_id'], items)
+                cursor.execute("DELETE FROM OrderItems WHERE order_id = %s", (order_id,))
+                OrderItem.add_many([
+                    OrderItem._item_row(
+                        order_id, item["product_id"], item["quantity"], item["unit_price"], item.get("notes")
                     )
-                
-        return cls.update(order_id, update_data)
+                    for item in items
+                ], cursor)
+                cls.recalculate_totals([order_id], cursor=cursor)
+            
+            if new_status:
+                cls._transition(cursor, order_id, new_status, closed_by)
+        
+        return True
+    
+    @classmethod
+    def recalculate_totals(cls, order_ids: List[int], cursor=None) -> bool:
+        """
+        Recompute subtotal-based totals and taxes for several orders at once.
+        
+        Args:
+            order_ids: The order IDs
+            cursor: Optional cursor of an open transaction
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not order_ids:
+            return True
+        
+        placeholders = ", ".join(["%s"] * len(order_ids))
+        query = f"""
+            UPDATE Orders o
+            LEFT JOIN (
+                SELECT order_id, SUM(total_price) AS subtotal
+                FROM OrderItems
+                WHERE order_id IN ({placeholders})
+                GROUP BY order_id
+            ) t ON t.order_id = o.id
+            CROSS JOIN (
+                SELECT COALESCE(MAX(tax_rate), 0) AS tax_rate FROM Establishment
+            ) e
+            SET o.tax_amount = COALESCE(t.subtotal, 0) * e.tax_rate / 100,
+                o.total_amount = COALESCE(t.subtotal, 0) * (1 + e.tax_rate / 100)
+            WHERE o.id IN ({placeholders})
+        """
+        params = tuple(order_ids) * 2
+        
+        if cursor is not None:
+            cursor.execute(query, params)
+            return True
+        return bool(cls.execute_custom_query(query, params))
+    
+    @classmethod
+    def update_total(cls, order_id: int) -> bool:
+        """
+        Recompute the total and tax of an order from its items.
+        
+        Args:
+            order_id: The order ID
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return cls.recalculate_totals([order_id])
     
     @classmethod
     def calculate_total(cls, order_id: int) -> bool:
@@ -272,3 +516,48 @@ class Order(BaseModel):
             "total_amount": total_amount,
             "tax_amount": tax_amount
         })
+    
+    @classmethod
+    def stream_closed_with_items(cls,
+                                 from_date: date,
+                                 to_date: date) -> Tuple[Tuple[str, ...], Iterator[tuple]]:
+        """
+        Stream every paid (closed) order and its items for a date range.
+        
+        Rows come from an unbuffered server-side cursor (see
+        stream_custom_query), so memory stays flat regardless of the number of
+        exported rows. Orders without items are emitted once with NULL item
+        columns.
+        
+        Args:
+            from_date: First closing date to include
+            to_date: Last closing date to include (inclusive)
+            
+        Returns:
+            tuple: (column names, iterator of row tuples). The connection is
+            closed when the iterator is exhausted or closed.
+        
+        Raises:
+            RuntimeError: If the database is unavailable
+            pymysql.MySQLError: If the query fails to start
+        """
+        query = """
+            SELECT
+                o.id, o.service_spot_id, o.sales_area_id, o.menu_id,
+                o.total_amount, o.tax_amount, o.created_by, o.closed_by,
+                o.created_at, o.closed_at,
+                oi.id, oi.product_id, p.name,
+                oi.quantity, oi.unit_price, oi.total_price, oi.status, oi.notes
+            FROM Orders o
+            LEFT JOIN OrderItems oi ON oi.order_id = o.id
+            LEFT JOIN Products p ON oi.product_id = p.id
+            WHERE o.status = %s
+            AND o.closed_at >= %s
+            AND o.closed_at < %s
+            ORDER BY o.closed_at, o.id
+        """
+        # Half-open range on the raw column keeps the predicate sargable
+        params = (cls.STATUS_PAID, from_date, to_date + timedelta(days=1))
+        
+        rows = cls.stream_custom_query(query, params, fetch_size=cls.EXPORT_FETCH_SIZE)
+        return cls.EXPORT_COLUMNS, rows
@@ -16,13 +16,31 @@ class OrderItem(BaseModel):
     STATUS_SERVED = 'servido'
     STATUS_CANCELED = 'cancelado'
     
+    @classmethod
+    def _item_row(cls,
+                  order_id: int,
+                  product_id: int,
+                  quantity: int,
+                  unit_price: float,
+                  notes: str = None) -> Dict[str, Any]:
+        return {
+            "order_id": order_id,
+            "product_id": product_id,
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "total_price": quantity * unit_price,
+            "notes": notes,
+            "status": cls.STATUS_PENDING
+        }
+    
     @classmethod
     def add_to_order(cls, 
                      order_id: int, 
                      product_id: int, 
                      quantity: int, 
                      unit_price: float, 
-                     notes: str = None) -> Optional[int]:
+                     notes: str = None,
+                     cursor=None) -> Optional[int]:
         """
         Add an item to an order.
         
@@ -32,21 +50,17 @@ class OrderItem(BaseModel):
             quantity: The quantity
             unit_price: The unit price
             notes: Optional notes for the item
+            cursor: Optional cursor of an open transaction; when given, the
+                caller commits and recalculates the order total
             
         Returns:
             int: Item ID if successful, None otherwise
         """
-        total_price = quantity * unit_price
+        item_data = cls._item_row(order_id, product_id, quantity, unit_price, notes)
         
-        item_data = {
-            "order_id": order_id,
-            "product_id": product_id,
-            "quantity": quantity,
-            "unit_price": unit_price,
-            "total_price": total_price,
-            "notes": notes,
-            "status": cls.STATUS_PENDING
-        }
+        if cursor is not None:
+            cls.add_many([item_data], cursor)
+            return cursor.lastrowid
         
         item_id = cls.create(item_data)
         
@@ -61,6 +75,33 @@ class OrderItem(BaseModel):
             
         return item_id
     
+    @classmethod
+    def add_many(cls, items: List[Dict[str, Any]], cursor) -> int:
+        """
+        Insert many items with a single multi-row INSERT.
+        
+        Order totals are not updated; callers run Order.recalculate_totals
+        once for the affected orders.
+        
+        Args:
+            items: Rows built like _item_row (same keys in every row)
+            cursor: Cursor of an open transaction
+            
+        Returns:
+            int: Number of inserted items
+        """
+        if not items:
+            return 0
+        
+        columns = list(items[0].keys())
+        placeholders = ", ".join(["%s"] * len(columns))
+        # PyMySQL rewrites executemany on INSERT ... VALUES into one statement
+        cursor.executemany(
+            f"INSERT INTO {cls.table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+            [tuple(item[column] for column in columns) for item in items]
+        )
+        return len(items)
+    
     @classmethod
     def update_quantity(cls, item_id: int, new_quantity: int) -> bool:
         """
@@ -112,6 +153,26 @@ class OrderItem(BaseModel):
         """
         return cls.update(item_id, {"status": new_status})
     
+    @classmethod
+    def delete_by_order_id(cls, order_id: int) -> bool:
+        """
+        Delete all items of an order.
+        
+        Deleted explicitly rather than through the foreign key cascade so the
+        delete triggers (sync tombstones) fire for every item.
+        
+        Args:
+            order_id: The order ID
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        result = cls.execute_custom_query(
+            "DELETE FROM OrderItems WHERE order_id = %s",
+            (order_id,)
+        )
+        return bool(result)
+    
     @classmethod
     def get_by_order(cls, order_id: int) -> List[Dict[str, Any]]:
         """
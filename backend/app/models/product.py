@@ -1,13 +1,48 @@
 """
 Product model representing individual products offered by the establishment.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+from app.db.db_connect import transaction
 from app.models.base import BaseModel
+from app.models.menu_item import MenuItem
+from app.utils.search_index import SearchIndex
+from app.services import events, menu_suggest, price_book
+from app.utils import http_cache
 
 class Product(BaseModel):
     """Model for products like food items, drinks, etc."""
     
     table_name = "Products"
+    sortable_columns = BaseModel.sortable_columns + ("price", "category_id")
+    
+    # What the product pickers show; skips the description text and audit columns
+    PICKER_COLUMNS = ("id", "name", "price", "image", "is_available", "category_id")
+    
+    # Weights of the searchable fields; name must stay first
+    SEARCH_FIELDS = {"name": 3.0, "category_name": 1.0, "description": 0.5}
+    # Tables the search rows are read from
+    SEARCH_TABLES = ("Products", "ProductCategories")
+    
+    @classmethod
+    def _search_rows(cls) -> List[Dict[str, Any]]:
+        return cls.execute_custom_query(
+            """
+            SELECT p.*, pc.name as category_name
+            FROM Products p
+            JOIN ProductCategories pc ON p.category_id = pc.id
+            """
+        )
+    
+    @classmethod
+    def _search_fingerprint(cls):
+        # TableVersions counters move on every write, unlike MAX(updated_at)
+        return http_cache.versions_fingerprint(cls.SEARCH_TABLES)
+    
+    @classmethod
+    def _after_write(cls, action: str, record_id: Optional[int] = None):
+        product_search_index.invalidate()
+        menu_suggest.invalidate()
+        price_book.invalidate()
     
     @classmethod
     def get_by_category(cls, category_id: int, only_available: bool = True) -> List[Dict[str, Any]]:
@@ -31,7 +66,11 @@ class Product(BaseModel):
     @classmethod
     def search(cls, query: str, only_available: bool = True) -> List[Dict[str, Any]]:
         """
-        Search products by name or description.
+        Search products by name, category or description.
+        
+        Matching is accent-insensitive and every query term may be a word
+        prefix. Results come from the in-process search index and are ranked
+        by relevance, name matches first.
         
         Args:
             query: The search term
@@ -40,21 +79,8 @@ class Product(BaseModel):
         Returns:
             list: List of matching products
         """
-        search_query = f"%{query}%"
-        
-        availability_clause = "AND is_available = TRUE" if only_available else ""
-        
-        return cls.execute_custom_query(
-            f"""
-            SELECT p.*, pc.name as category_name
-            FROM Products p
-            JOIN ProductCategories pc ON p.category_id = pc.id
-            WHERE (p.name LIKE %s OR p.description LIKE %s)
-            {availability_clause}
-            ORDER BY p.name ASC
-            """,
-            (search_query, search_query)
-        )
+        predicate = (lambda product: bool(product['is_available'])) if only_available else None
+        return product_search_index.search(query, predicate=predicate)
     
     @classmethod
     def get_with_category(cls, product_id: int) -> Optional[Dict[str, Any]]:
@@ -92,3 +118,74 @@ class Product(BaseModel):
             bool: True if successful, False otherwise
         """
         return cls.update(product_id, {"is_available": is_available})
+    
+    @classmethod
+    def update_availability_bulk(cls,
+                                 is_available: bool,
+                                 product_ids: Sequence[int] = (),
+                                 menu_item_ids: Sequence[int] = (),
+                                 changed_by: str = None) -> Tuple[int, int]:
+        """
+        Set the availability of many products and menu items at once.
+        
+        One UPDATE per table and the availability event run in a single
+        transaction; the row triggers bump the TableVersions counters, so
+        catalog ETags change, and connected clients get the event.
+        
+        Args:
+            is_available: The new availability
+            product_ids: Products to change
+            menu_item_ids: Menu items to change
+            changed_by: Username recorded in the event
+            
+        Returns:
+            tuple: (products changed, menu items changed); rows already at
+                the requested availability are not counted
+            
+        Raises:
+            RuntimeError: If the database is unavailable
+        """
+        product_ids = sorted(set(product_ids))
+        menu_item_ids = sorted(set(menu_item_ids))
+        products_updated = menu_items_updated = 0
+        
+        with transaction() as cursor:
+            if product_ids:
+                placeholders = ", ".join(["%s"] * len(product_ids))
+                products_updated = cursor.execute(
+                    f"UPDATE Products SET is_available = %s WHERE id IN ({placeholders}) AND NOT (is_available <=> %s)",
+                    (is_available, *product_ids, is_available)
+                )
+            if menu_item_ids:
+                placeholders = ", ".join(["%s"] * len(menu_item_ids))
+                menu_items_updated = cursor.execute(
+                    f"UPDATE MenuItems SET is_available = %s WHERE id IN ({placeholders}) AND NOT (is_available <=> %s)",
+                    (is_available, *menu_item_ids, is_available)
+                )
+            if products_updated or menu_items_updated:
+                events.publish(events.EVENT_AVAILABILITY, {
+                    "is_available": is_available,
+                    "product_ids": product_ids if products_updated else [],
+                    "menu_item_ids": menu_item_ids if menu_items_updated else [],
+                    "changed_by": changed_by,
+                }, cursor=cursor)
+        
+        if products_updated:
+            cls._after_write("update")
+        if menu_items_updated:
+            MenuItem._after_write("update")
+        return products_updated, menu_items_updated
+
+product_search_index = SearchIndex(
+    loader=Product._search_rows,
+    fields=Product.SEARCH_FIELDS,
+    fingerprint=Product._search_fingerprint
+)
+
+def _on_availability_event(payload: Dict[str, Any]):
+    # Availability changed in any worker (this one included): drop the caches
+    # built from product and menu item availability
+    Product._after_write("update")
+    MenuItem._after_write("update")
+
+events.add_listener(events.EVENT_AVAILABILITY, _on_availability_event)
@@ -3,12 +3,18 @@ ProductCategory model representing categories of products.
 """
 from typing import Dict, Any, Optional, List
 from app.models.base import BaseModel
+from app.models.product import product_search_index
 
 class ProductCategory(BaseModel):
     """Model for product categories like Drinks, Food, etc."""
     
     table_name = "ProductCategories"
     
+    @classmethod
+    def _after_write(cls, action: str, record_id: Optional[int] = None):
+        # Indexed products carry their category name
+        product_search_index.invalidate()
+    
     @classmethod
     def get_active(cls) -> List[Dict[str, Any]]:
         """
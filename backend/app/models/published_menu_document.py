@@ -0,0 +1,81 @@
+"""
+PublishedMenuDocument model holding the precompiled body of published menus.
+One row per menu × sales area (sales_area_id 0 for the menu without an area).
+"""
+import logging
+from typing import Dict, Any, List, Optional
+from app.db.db_connect import get_connection
+from app.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class PublishedMenuDocument(BaseModel):
+    """Model for the precompiled published menu documents"""
+    
+    table_name = "PublishedMenuDocuments"
+    
+    # sales_area_id of the document not bound to a sales area
+    NO_AREA = 0
+    
+    @classmethod
+    def get(cls, menu_id: int, sales_area_id: int = NO_AREA) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored document.
+        
+        Args:
+            menu_id: The menu ID
+            sales_area_id: The sales area ID (NO_AREA for the menu without an area)
+            
+        Returns:
+            dict: document, etag and source_hash, or None if not compiled
+        """
+        results = cls.execute_custom_query(
+            """
+            SELECT document, etag, source_hash
+            FROM PublishedMenuDocuments
+            WHERE menu_id = %s AND sales_area_id = %s
+            """,
+            (menu_id, sales_area_id)
+        )
+        return results[0] if results else None
+    
+    @classmethod
+    def replace_for_menu(cls, menu_id: int, documents: List[Dict[str, Any]]) -> bool:
+        """
+        Replace every stored document of a menu in one transaction.
+        
+        Args:
+            menu_id: The menu ID
+            documents: Rows with sales_area_id, document, etag and source_hash
+                (empty to just drop the menu's documents)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        conn = get_connection()
+        if not conn:
+            logger.error(f"Failed to connect to database in {cls.__name__}.replace_for_menu")
+            return False
+            
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM PublishedMenuDocuments WHERE menu_id = %s", (menu_id,))
+                if documents:
+                    cursor.executemany(
+                        """
+                        INSERT INTO PublishedMenuDocuments (menu_id, sales_area_id, document, etag, source_hash)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (menu_id, doc['sales_area_id'], doc['document'], doc['etag'], doc['source_hash'])
+                            for doc in documents
+                        ]
+                    )
+            conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error in {cls.__name__}.replace_for_menu: {e}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
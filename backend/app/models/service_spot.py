@@ -55,18 +55,23 @@ class ServiceSpot(BaseModel):
         return cls.find_all(where=where, order_by="name ASC")
     
     @classmethod
-    def update_status(cls, spot_id: int, new_status: str) -> bool:
+    def update_status(cls, spot_id: int, new_status: str, expected_version: Optional[int] = None) -> bool:
         """
         Update the status of a service spot.
         
         Args:
             spot_id: The service spot ID
             new_status: The new status
+            expected_version: Only update the spot if it is at this version
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            VersionConflict: If expected_version is given and the spot has
+                another version
         """
-        return cls.update(spot_id, {"status": new_status})
+        return cls.update(spot_id, {"status": new_status}, expected_version=expected_version)
     
     @classmethod
     def reset_all_statuses(cls) -> bool:
@@ -9,6 +9,10 @@ class User(BaseModel):
     """Model for system users"""
     
     table_name = "Users"
+    sortable_columns = BaseModel.sortable_columns + ("username", "role")
+    
+    # Everything but the password hash, for reads that feed API responses
+    PUBLIC_COLUMNS = ("id", "name", "surname", "username", "role", "created_at", "updated_at")
     
     # Role constants
     ROLE_SOPORTE = 'Soporte'
@@ -58,7 +62,7 @@ class User(BaseModel):
         
         return cls.execute_custom_query(
             f"""
-            SELECT *
+            SELECT {", ".join(cls.PUBLIC_COLUMNS)}
             FROM {cls.table_name}
             WHERE name LIKE %s
             OR surname LIKE %s
@@ -105,3 +105,30 @@ class MenuWithAreasResponse(MenuResponse):
 class MenuWithAreasDetailResponse(ResponseBase):
     """Schema for single menu with areas response"""
     data: MenuWithAreasResponse
+    
+# Schemas for menu cloning and bulk price adjustment
+class MenuCloneResult(BaseModel):
+    """Schema for the menu created by a clone"""
+    menu: MenuResponse
+    items_copied: int
+    sales_areas_copied: int
+    
+class MenuCloneResponse(ResponseBase):
+    """Schema for menu clone response"""
+    data: MenuCloneResult
+    
+class MenuPriceAdjustment(BaseModel):
+    """Schema for adjusting the prices of a menu's items"""
+    mode: str = Field(..., description="Adjustment mode: percent, absolute")
+    amount: float = Field(..., description="Percentage (10 = +10%) or amount added to each price; negative lowers it")
+    category_id: Optional[int] = Field(None, description="Only items whose product is in this category")
+    
+class MenuPriceAdjustmentResult(BaseModel):
+    """Schema for the outcome of a price adjustment"""
+    menu_id: int
+    category_id: Optional[int] = None
+    items_updated: int
+    
+class MenuPriceAdjustmentResponse(ResponseBase):
+    """Schema for price adjustment response"""
+    data: MenuPriceAdjustmentResult
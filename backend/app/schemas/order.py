@@ -16,10 +16,19 @@ class OrderBase(BaseModel):
 class OrderCreate(OrderBase):
     """Schema for order creation"""
     created_by: int
+    menu_id: Optional[int] = Field(None, description="Defaults to the menu published for the sales area today")
+    
+class BatchOrderItem(BaseModel):
+    """Schema for an item inside a batch operation or an order update"""
+    product_id: int
+    quantity: int = Field(..., gt=0)
+    unit_price: Optional[float] = Field(None, gt=0, description="Ignored; the price on the order's menu applies")
+    notes: Optional[str] = None
     
 class OrderUpdate(BaseModel):
     """Schema for order update"""
     status: Optional[str] = None
+    items: Optional[List[BatchOrderItem]] = Field(None, description="Replaces every item of the order")
     
 class OrderStatusUpdate(BaseModel):
     """Schema for order status update"""
@@ -33,6 +42,7 @@ class OrderResponse(OrderBase, IDModel, TimeStampMixin):
     created_by: int
     closed_by: Optional[int] = None
     closed_at: Optional[datetime] = None
+    version: Optional[int] = None
     
     class Config:
         orm_mode = True
@@ -77,3 +87,38 @@ class OrderWithItemsResponse(OrderWithInfoResponse):
 class OrderWithItemsDetailResponse(ResponseBase):
     """Schema for single order with items response"""
     data: OrderWithItemsResponse
+    
+# Schemas for offline batch submission
+class OrderBatchOperation(BaseModel):
+    """
+    Schema for one queued client operation.
+    
+    create_order needs service_spot_id; sales_area_id and menu_id are
+    checked against the spot's area and default to it and its menu of today.
+    add_items targets order_id, or order_key: the idempotency key of a
+    create_order sent in this or an earlier batch.
+    """
+    idempotency_key: str = Field(..., min_length=8, max_length=64)
+    type: str = Field(..., description="Operation type: create_order, add_items")
+    service_spot_id: Optional[int] = None
+    sales_area_id: Optional[int] = None
+    menu_id: Optional[int] = None
+    order_id: Optional[int] = None
+    order_key: Optional[str] = Field(None, max_length=64)
+    items: List[BatchOrderItem] = []
+    
+class OrderBatchRequest(BaseModel):
+    """Schema for a batch of queued operations"""
+    operations: List[OrderBatchOperation] = Field(..., min_length=1, max_length=1000)
+    
+class OrderBatchResult(BaseModel):
+    """Schema for the outcome of one batch operation"""
+    idempotency_key: str
+    status: str = Field(..., description="applied, duplicate or rejected")
+    order_id: Optional[int] = None
+    items_added: int = 0
+    detail: Optional[str] = None
+    
+class OrderBatchResponse(ResponseBase):
+    """Schema for batch submission response"""
+    data: List[OrderBatchResult]
@@ -14,13 +14,9 @@ class OrderItemBase(BaseModel):
     notes: Optional[str] = None
     
 class OrderItemCreate(OrderItemBase):
-    """Schema for order item creation"""
+    """Schema for order item creation; prices come from the order's menu"""
+    unit_price: Optional[float] = Field(None, gt=0, description="Ignored; the price on the order's menu applies")
     status: Optional[str] = "pendiente"
-    total_price: Optional[float] = None  # Calculated field, optional in request
-    
-    def calculate_total(self):
-        """Calculate total price based on quantity and unit price"""
-        return self.quantity * self.unit_price
     
 class OrderItemUpdate(BaseModel):
     """Schema for order item update"""
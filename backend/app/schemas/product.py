@@ -31,6 +31,22 @@ class ProductAvailabilityUpdate(BaseModel):
     """Schema for product availability update"""
     is_available: bool
     
+class BulkAvailabilityUpdate(BaseModel):
+    """Schema for flipping the availability of many products and menu items"""
+    is_available: bool
+    product_ids: List[int] = Field([], max_length=1000)
+    menu_item_ids: List[int] = Field([], max_length=1000)
+    
+class BulkAvailabilityResult(BaseModel):
+    """Schema for the rows changed by a bulk availability update"""
+    is_available: bool
+    products_updated: int
+    menu_items_updated: int
+    
+class BulkAvailabilityResponse(ResponseBase):
+    """Schema for bulk availability update response"""
+    data: BulkAvailabilityResult
+    
 class ProductResponse(ProductBase, IDModel, TimeStampMixin):
     """Schema for product response"""
     created_by: Optional[int] = None
@@ -60,3 +76,19 @@ class ProductSearchResponse(ResponseBase):
     """Schema for product search response"""
     data: List[ProductWithCategoryResponse]
     query: str
+    
+# Schemas for the waiter typeahead
+class ProductSuggestion(BaseModel):
+    """Schema for a product suggestion from the area's active menu"""
+    product_id: int
+    menu_item_id: int
+    menu_id: int
+    name: str
+    price: float
+    category_id: int
+    category_name: str
+    
+class ProductSuggestResponse(ResponseBase):
+    """Schema for product suggestions response"""
+    data: List[ProductSuggestion]
+    query: str
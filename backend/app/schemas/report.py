@@ -0,0 +1,25 @@
+"""
+Report schemas for API response validation
+"""
+from typing import Optional, List
+from datetime import date
+from pydantic import BaseModel, Field
+from app.schemas.base import ResponseBase
+
+class SalesReportRow(BaseModel):
+    """Schema for one aggregated sales report row"""
+    sale_date: Optional[date] = None
+    sales_area_id: Optional[int] = None
+    sales_area_name: Optional[str] = None
+    product_id: Optional[int] = None
+    product_name: Optional[str] = None
+    user_id: Optional[int] = None
+    username: Optional[str] = None
+    quantity: int = 0
+    revenue: float = 0.0
+    order_count: int = Field(0, description="Orders containing the product, summed per group row")
+    
+class SalesReportResponse(ResponseBase):
+    """Schema for sales report response"""
+    data: List[SalesReportRow]
+    group_by: List[str]
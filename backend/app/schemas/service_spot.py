@@ -31,6 +31,7 @@ class ServiceSpotStatusUpdate(BaseModel):
     
 class ServiceSpotResponse(ServiceSpotBase, IDModel, TimeStampMixin):
     """Schema for service spot response"""
+    version: Optional[int] = None
     
     class Config:
         orm_mode = True
@@ -0,0 +1,124 @@
+"""
+Production server entry point.
+
+Usage (from the backend directory):
+    python -m app.serve
+    python -m app.serve --workers 4 --port 8000 --keep-alive 5 --backlog 2048
+
+Settings default to environment variables so containers can tune them
+without changing the command: WEB_CONCURRENCY, HOST, PORT, BACKLOG,
+KEEP_ALIVE, GRACEFUL_TIMEOUT.
+
+With gunicorn installed the app runs under gunicorn's process manager with
+uvicorn workers:
+
+    - the app is imported once in the master and the workers are forked from
+      it, sharing the imported modules copy-on-write and starting faster;
+    - each worker opens its own connection pool and warms its caches in the
+      startup event, and only then starts accepting connections;
+    - SIGHUP reloads gracefully (new workers are started, old ones drain),
+      SIGTERM stops accepting and drains in-flight requests for up to
+      GRACEFUL_TIMEOUT seconds; SIGTTIN/SIGTTOU add or remove a worker.
+
+Without gunicorn it falls back to uvicorn's own supervisor, where every worker
+imports the app itself and SIGTERM drains the same way (no SIGHUP reload).
+uvicorn picks uvloop and httptools automatically when they are installed.
+"""
+import argparse
+import logging
+import os
+from app.settings import configure_logging
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = "app.main:app"
+
+def cpu_count() -> int:
+    """Cores this process may run on (respects CPU affinity and container cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY") or cpu_count())
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Vesta API in production")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=_default_workers(),
+                        help="Worker processes (defaults to the available cores)")
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("BACKLOG", 2048)),
+                        help="Pending connections the listening socket queues")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("KEEP_ALIVE", 5)),
+                        help="Seconds an idle keep-alive connection stays open")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+                        help="Seconds in-flight requests get to finish on shutdown or reload")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    return parser.parse_args(argv)
+
+def _worker_class() -> str:
+    try:
+        import uvicorn_worker  # noqa: F401  (maintained home of the worker class)
+        return "uvicorn_worker.UvicornWorker"
+    except ImportError:
+        return "uvicorn.workers.UvicornWorker"
+
+def run_gunicorn(args: argparse.Namespace):
+    from gunicorn.app.base import BaseApplication
+
+    class VestaApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{args.host}:{args.port}",
+                "workers": max(1, args.workers),
+                "worker_class": _worker_class(),
+                "preload_app": True,
+                "backlog": args.backlog,
+                "keepalive": args.keep_alive,
+                "graceful_timeout": args.graceful_timeout,
+                # Workers may block in startup while the caches load
+                "timeout": max(60, args.graceful_timeout * 2),
+                "loglevel": args.log_level,
+                "accesslog": "-",
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs once in the master when preload_app is on
+            from app.main import app
+            return app
+
+    VestaApplication().run()
+
+def run_uvicorn(args: argparse.Namespace):
+    import uvicorn
+
+    uvicorn.run(
+        APP_PATH,
+        host=args.host,
+        port=args.port,
+        workers=max(1, args.workers),
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+        proxy_headers=True,
+    )
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        logger.warning("gunicorn is not installed; using uvicorn's supervisor (no preload or SIGHUP reload)")
+        run_uvicorn(args)
+        return
+    logger.info(f"Starting {args.workers} worker(s) on {args.host}:{args.port}")
+    run_gunicorn(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Analytics service.
+Answers group-by queries over the Parquet snapshot written by
+analytics_snapshot with vectorised Arrow/NumPy compute, so reports never
+query the transactional MySQL tables.
+"""
+import os
+import logging
+from datetime import date
+from typing import Dict, Any, List
+from app.services.analytics_snapshot import data_root, require_pyarrow, snapshot_schema
+
+logger = logging.getLogger(__name__)
+
+def _load(from_date: date, to_date: date, columns: List[str], data_dir: str = None):
+    """
+    Read the snapshot rows closed between two dates (inclusive).
+    Partition pruning on closed_date means only the requested days are read.
+    """
+    pa = require_pyarrow()
+    import pyarrow.dataset as ds
+    
+    root = data_dir or data_root()
+    if not os.path.isdir(root):
+        return snapshot_schema().empty_table().select(columns)
+    
+    partition_schema = pa.schema([("closed_date", pa.date32())])
+    dataset = ds.dataset(
+        root,
+        format="parquet",
+        schema=pa.unify_schemas([snapshot_schema(), partition_schema]),
+        partitioning=ds.partitioning(partition_schema, flavor="hive")
+    )
+    closed_date = ds.field("closed_date")
+    return dataset.to_table(
+        columns=columns,
+        filter=(closed_date >= from_date) & (closed_date <= to_date)
+    )
+
+def product_mix(from_date: date, to_date: date, data_dir: str = None) -> List[Dict[str, Any]]:
+    """
+    Quantity and revenue per product, with its share of total revenue.
+    
+    Returns:
+        list: Rows sorted by revenue, descending
+    """
+    table = _load(
+        from_date, to_date,
+        ["product_id", "product_name", "category_id", "category_name", "quantity", "total_price"],
+        data_dir
+    )
+    grouped = table.group_by(["product_id", "product_name", "category_id", "category_name"]).aggregate([
+        ("quantity", "sum"),
+        ("total_price", "sum"),
+    ]).sort_by([("total_price_sum", "descending")])
+    
+    total_revenue = sum(grouped.column("total_price_sum").to_pylist()) or 0.0
+    
+    return [
+        {
+            "product_id": row["product_id"],
+            "product_name": row["product_name"],
+            "category_id": row["category_id"],
+            "category_name": row["category_name"],
+            "quantity": row["quantity_sum"],
+            "revenue": row["total_price_sum"],
+            "revenue_share": row["total_price_sum"] / total_revenue if total_revenue else 0.0,
+        }
+        for row in grouped.to_pylist()
+    ]
+
+def hourly_heatmap(from_date: date, to_date: date, data_dir: str = None) -> Dict[str, Any]:
+    """
+    Revenue and quantity by weekday (0=Monday) and closing hour.
+    
+    Returns:
+        dict: 7×24 matrices of revenue and quantity
+    """
+    import numpy as np
+    import pyarrow.compute as pc
+    
+    table = _load(from_date, to_date, ["closed_at", "quantity", "total_price"], data_dir)
+    
+    # Arrow's day_of_week is 0=Monday, like date.weekday()
+    weekdays = pc.day_of_week(table.column("closed_at")).to_numpy(zero_copy_only=False)
+    hours = pc.hour(table.column("closed_at")).to_numpy(zero_copy_only=False)
+    cells = weekdays.astype(np.int64) * 24 + hours.astype(np.int64)
+    
+    revenue = np.bincount(
+        cells,
+        weights=table.column("total_price").to_numpy(zero_copy_only=False),
+        minlength=7 * 24
+    ).reshape(7, 24)
+    quantity = np.bincount(
+        cells,
+        weights=table.column("quantity").to_numpy(zero_copy_only=False),
+        minlength=7 * 24
+    ).reshape(7, 24)
+    
+    return {
+        "revenue": revenue.round(2).tolist(),
+        "quantity": quantity.astype(np.int64).tolist(),
+    }
+
+def waiter_performance(from_date: date, to_date: date, data_dir: str = None) -> List[Dict[str, Any]]:
+    """
+    Orders, items, revenue and average ticket per waiter (order creator).
+    
+    Returns:
+        list: Rows sorted by revenue, descending
+    """
+    table = _load(from_date, to_date, ["created_by", "order_id", "quantity", "total_price"], data_dir)
+    grouped = table.group_by("created_by").aggregate([
+        ("order_id", "count_distinct"),
+        ("quantity", "sum"),
+        ("total_price", "sum"),
+    ]).sort_by([("total_price_sum", "descending")])
+    
+    return [
+        {
+            "user_id": row["created_by"],
+            "orders": row["order_id_count_distinct"],
+            "items": row["quantity_sum"],
+            "revenue": row["total_price_sum"],
+            "average_ticket": row["total_price_sum"] / row["order_id_count_distinct"]
+            if row["order_id_count_distinct"] else 0.0,
+        }
+        for row in grouped.to_pylist()
+    ]
@@ -0,0 +1,157 @@
+"""
+Analytics snapshot service.
+Exports paid orders and their items, joined with products and categories,
+into date-partitioned Parquet files (closed_date=YYYY-MM-DD/part-0.parquet)
+that the analytics service queries without touching MySQL.
+"""
+import os
+import logging
+from datetime import date, timedelta
+from typing import Optional
+from app.models.order import Order
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+def data_root() -> str:
+    """Root directory of the Parquet dataset (the ANALYTICS_DATA_DIR setting)."""
+    return get_settings().analytics_data_dir
+
+# Rows per Arrow record batch / Parquet row group
+SNAPSHOT_BATCH_ROWS = 50000
+
+SNAPSHOT_QUERY = """
+    SELECT
+        o.id, o.sales_area_id, o.service_spot_id, o.created_by,
+        o.created_at, o.closed_at,
+        oi.product_id, p.name, p.category_id, pc.name,
+        oi.quantity, oi.unit_price, oi.total_price
+    FROM Orders o
+    JOIN OrderItems oi ON oi.order_id = o.id
+    JOIN Products p ON oi.product_id = p.id
+    JOIN ProductCategories pc ON p.category_id = pc.id
+    WHERE o.status = %s
+    AND o.closed_at >= %s
+    AND o.closed_at < %s
+    AND oi.status <> 'cancelado'
+"""
+
+def require_pyarrow():
+    """
+    Import pyarrow lazily so the API can start without the analytics extras.
+    
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError as e:
+        raise RuntimeError("Analytics requires pyarrow (pip install pyarrow)") from e
+
+def snapshot_schema():
+    """Arrow schema of the snapshot files, in SNAPSHOT_QUERY column order."""
+    pa = require_pyarrow()
+    return pa.schema([
+        ("order_id", pa.int64()),
+        ("sales_area_id", pa.int32()),
+        ("service_spot_id", pa.int32()),
+        ("created_by", pa.int32()),
+        ("created_at", pa.timestamp("s")),
+        ("closed_at", pa.timestamp("s")),
+        ("product_id", pa.int32()),
+        ("product_name", pa.string()),
+        ("category_id", pa.int32()),
+        ("category_name", pa.string()),
+        ("quantity", pa.int32()),
+        ("unit_price", pa.float64()),
+        ("total_price", pa.float64()),
+    ])
+
+def partition_path(target_date: date, data_dir: str = None) -> str:
+    """Directory holding the snapshot of one closing date."""
+    return os.path.join(data_dir or data_root(), f"closed_date={target_date.isoformat()}")
+
+def _to_batch(pa, schema, rows):
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_floating(field.type):
+            values = [float(v) if v is not None else None for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def export_day(target_date: date, data_dir: str = None) -> Optional[int]:
+    """
+    Write the snapshot partition of one closing date.
+    
+    Rows are streamed from MySQL and written in row groups, then the file is
+    renamed into place so readers never observe a partial partition. Running
+    the export again for the same date replaces the partition.
+    
+    Args:
+        target_date: The closing date to export
+        data_dir: Dataset root (defaults to data_root())
+        
+    Returns:
+        int: Number of rows written, or None if failed
+    """
+    pa = require_pyarrow()
+    import pyarrow.parquet as pq
+    
+    schema = snapshot_schema()
+    directory = partition_path(target_date, data_dir)
+    os.makedirs(directory, exist_ok=True)
+    final_path = os.path.join(directory, "part-0.parquet")
+    # Dot-prefixed so dataset discovery ignores it while it is being written
+    tmp_path = os.path.join(directory, ".part-0.parquet.tmp")
+    
+    written = 0
+    try:
+        # Raises when the database is down, so the existing partition is kept
+        rows = Order.stream_custom_query(
+            SNAPSHOT_QUERY,
+            (Order.STATUS_PAID, target_date, target_date + timedelta(days=1)),
+            fetch_size=SNAPSHOT_BATCH_ROWS
+        )
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= SNAPSHOT_BATCH_ROWS:
+                    writer.write_batch(_to_batch(pa, schema, batch))
+                    written += len(batch)
+                    batch = []
+            if batch:
+                writer.write_batch(_to_batch(pa, schema, batch))
+                written += len(batch)
+        os.replace(tmp_path, final_path)
+    except Exception as e:
+        logger.error(f"Error exporting analytics snapshot for {target_date}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    
+    logger.info(f"Analytics snapshot for {target_date}: {written} rows written to {final_path}")
+    return written
+
+def export_range(from_date: date, to_date: date, data_dir: str = None) -> bool:
+    """
+    Write one snapshot partition per closing date in a range.
+    
+    Args:
+        from_date: First closing date to export
+        to_date: Last closing date to export, inclusive
+        data_dir: Dataset root (defaults to data_root())
+        
+    Returns:
+        bool: True if every partition was written, False otherwise
+    """
+    success = True
+    day = from_date
+    while day <= to_date:
+        if export_day(day, data_dir) is None:
+            success = False
+        day += timedelta(days=1)
+    return success
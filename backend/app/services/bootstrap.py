@@ -0,0 +1,258 @@
+"""
+Tablet bootstrap.
+
+Assembles everything a waiter tablet needs on launch (establishment
+configuration, active sales areas with their spots, the menus valid today
+grouped by category and the waiter's open orders) for GET /api/v1/bootstrap.
+
+The shared components are cached in memory per worker and keyed by the
+TableVersions counters of the tables they are read from, so they are only
+rebuilt after a write. The waiter's orders are live data; a single query
+returns their (id, version, items) fingerprint, so a tablet that already has
+the current payload gets a 304 after two cheap queries.
+
+Every query raises on failure instead of returning no rows, so a database
+error never caches an empty component or tags an incomplete payload.
+"""
+import hashlib
+import logging
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from app.db.db_connect import transaction
+from app.services.spot_status import ACTIVE_ORDER_STATUSES
+from app.utils import http_cache
+
+logger = logging.getLogger(__name__)
+
+ESTABLISHMENT_FIELDS = ("id", "name", "address", "phone", "logo", "tax_rate", "currency", "is_configured")
+
+# Component -> tables its payload is read from
+COMPONENT_TABLES = {
+    "establishment": ("Establishment",),
+    "sales_areas": ("SalesAreas", "ServiceSpots"),
+    "menus": ("Menus", "MenuSalesAreas", "MenuItems", "Products", "ProductCategories"),
+}
+ALL_TABLES = tuple(sorted({table for tables in COMPONENT_TABLES.values() for table in tables}))
+
+_ACTIVE_SQL = ", ".join(["%s"] * len(ACTIVE_ORDER_STATUSES))
+
+ESTABLISHMENT_QUERY = f"SELECT {', '.join(ESTABLISHMENT_FIELDS)} FROM Establishment LIMIT 1"
+
+SALES_AREAS_QUERY = """
+    SELECT
+        sa.id AS area_id, sa.name AS area_name, sa.description AS area_description,
+        ss.id, ss.name, ss.capacity, ss.status, ss.version
+    FROM SalesAreas sa
+    LEFT JOIN ServiceSpots ss ON ss.sales_area_id = sa.id AND ss.is_active = TRUE
+    WHERE sa.is_active = TRUE
+    ORDER BY sa.name ASC, ss.name ASC
+"""
+
+MENU_ITEMS_QUERY = """
+    SELECT
+        m.id AS menu_id, m.name AS menu_name, m.valid_date,
+        mi.id, mi.product_id, p.name, p.description, p.image, mi.price,
+        (mi.is_available AND p.is_available) AS is_available,
+        pc.id AS category_id, pc.name AS category_name
+    FROM Menus m
+    {area_join}
+    JOIN MenuItems mi ON mi.menu_id = m.id
+    JOIN Products p ON p.id = mi.product_id
+    JOIN ProductCategories pc ON pc.id = p.category_id
+    WHERE m.status = 'publicada'
+    AND m.valid_date = %s
+    {area_filter}
+    ORDER BY m.id DESC, pc.name ASC, p.name ASC
+"""
+
+ORDERS_FINGERPRINT_QUERY = f"""
+    SELECT o.id, o.version, COUNT(oi.id) AS item_count, MAX(oi.updated_at) AS items_updated_at
+    FROM Orders o
+    LEFT JOIN OrderItems oi ON oi.order_id = o.id
+    WHERE o.created_by = %s
+    AND o.status IN ({_ACTIVE_SQL})
+    {{area_filter}}
+    GROUP BY o.id, o.version
+    ORDER BY o.id
+"""
+
+ORDERS_QUERY = """
+    SELECT o.id, o.service_spot_id, ss.name AS service_spot_name, o.sales_area_id, o.menu_id,
+        o.status, o.total_amount, o.tax_amount, o.created_at, o.updated_at, o.version
+    FROM Orders o
+    JOIN ServiceSpots ss ON ss.id = o.service_spot_id
+    WHERE o.id IN %s
+    ORDER BY o.created_at ASC
+"""
+
+ORDER_ITEMS_QUERY = """
+    SELECT oi.id, oi.order_id, oi.product_id, p.name AS product_name, oi.quantity,
+        oi.unit_price, oi.total_price, oi.notes, oi.status
+    FROM OrderItems oi
+    JOIN Products p ON p.id = oi.product_id
+    WHERE oi.order_id IN %s
+    ORDER BY oi.id ASC
+"""
+
+# (component, key) -> (fingerprint, payload)
+_components: Dict[Tuple[str, Any], Tuple[str, Any]] = {}
+
+def _component(name: str, key: Any, versions: Dict[str, dict], loader: Callable[[], Any]) -> Any:
+    """Get a component from the cache, rebuilding it when its tables changed."""
+    fingerprint = http_cache.versions_fingerprint(COMPONENT_TABLES[name], versions)
+    cached = _components.get((name, key))
+    if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    logger.debug(f"Rebuilding bootstrap component {name} ({key})")
+    payload = loader()
+    if fingerprint is not None:
+        # Entries for other keys of a date-scoped component are stale by tomorrow
+        if name == "menus":
+            for stale in [k for k in _components if k[0] == name and k[1][1] != key[1]]:
+                _components.pop(stale, None)
+        _components[(name, key)] = (fingerprint, payload)
+    return payload
+
+def invalidate():
+    """Drop every cached component."""
+    _components.clear()
+
+def _fetch_all(query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+    """Run a read, raising on failure (RuntimeError or pymysql.MySQLError)."""
+    with transaction() as cursor:
+        cursor.execute(query, tuple(params))
+        return list(cursor.fetchall())
+
+def _load_establishment() -> Optional[Dict[str, Any]]:
+    rows = _fetch_all(ESTABLISHMENT_QUERY)
+    return rows[0] if rows else None
+
+def _load_sales_areas() -> List[Dict[str, Any]]:
+    areas: Dict[int, Dict[str, Any]] = {}
+    for row in _fetch_all(SALES_AREAS_QUERY):
+        area = areas.get(row['area_id'])
+        if area is None:
+            area = areas[row['area_id']] = {
+                "id": row['area_id'],
+                "name": row['area_name'],
+                "description": row['area_description'],
+                "service_spots": [],
+            }
+        if row['id'] is not None:
+            area["service_spots"].append({
+                "id": row['id'],
+                "name": row['name'],
+                "capacity": row['capacity'],
+                "status": row['status'],
+                "version": row['version'],
+            })
+    return list(areas.values())
+
+def _load_menus(sales_area_id: Optional[int], target_date: date) -> List[Dict[str, Any]]:
+    if sales_area_id is not None:
+        query = MENU_ITEMS_QUERY.format(
+            area_join="JOIN MenuSalesAreas msa ON msa.menu_id = m.id",
+            area_filter="AND msa.sales_area_id = %s"
+        )
+        params = (target_date, sales_area_id)
+    else:
+        query = MENU_ITEMS_QUERY.format(area_join="", area_filter="")
+        params = (target_date,)
+
+    menus: Dict[int, Dict[str, Any]] = {}
+    categories: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for row in _fetch_all(query, params):
+        menu = menus.get(row['menu_id'])
+        if menu is None:
+            menu = menus[row['menu_id']] = {
+                "id": row['menu_id'],
+                "name": row['menu_name'],
+                "valid_date": row['valid_date'],
+                "categories": [],
+            }
+        category = categories.get((row['menu_id'], row['category_id']))
+        if category is None:
+            category = categories[(row['menu_id'], row['category_id'])] = {
+                "id": row['category_id'],
+                "name": row['category_name'],
+                "items": [],
+            }
+            menu["categories"].append(category)
+        category["items"].append({
+            "id": row['id'],
+            "product_id": row['product_id'],
+            "name": row['name'],
+            "description": row['description'],
+            "image": row['image'],
+            "price": row['price'],
+            "is_available": bool(row['is_available']),
+        })
+    return list(menus.values())
+
+def _orders_fingerprint(user_id: int, sales_area_id: Optional[int]) -> List[Dict[str, Any]]:
+    if sales_area_id is not None:
+        query = ORDERS_FINGERPRINT_QUERY.format(area_filter="AND o.sales_area_id = %s")
+        params = (user_id, *ACTIVE_ORDER_STATUSES, sales_area_id)
+    else:
+        query = ORDERS_FINGERPRINT_QUERY.format(area_filter="")
+        params = (user_id, *ACTIVE_ORDER_STATUSES)
+    return _fetch_all(query, params)
+
+def _load_orders(order_ids: List[int]) -> List[Dict[str, Any]]:
+    if not order_ids:
+        return []
+    ids = tuple(order_ids)
+    orders = _fetch_all(ORDERS_QUERY, (ids,))
+    items_by_order: Dict[int, List[Dict[str, Any]]] = {}
+    for item in _fetch_all(ORDER_ITEMS_QUERY, (ids,)):
+        items_by_order.setdefault(item['order_id'], []).append(item)
+    for order in orders:
+        order["items"] = items_by_order.get(order['id'], [])
+    return orders
+
+def prepare(user: Dict[str, Any],
+            sales_area_id: Optional[int] = None) -> Tuple[Optional[str], Callable[[], Dict[str, Any]]]:
+    """
+    Compute the bootstrap ETag and a builder for the payload.
+
+    Args:
+        user: The authenticated user (user_id, username, role)
+        sales_area_id: The tablet's sales area, to limit menus and orders to it
+
+    Returns:
+        tuple: (etag, build) where build() assembles the payload; call it only
+            when the client copy is stale. etag is None when the TableVersions
+            counters are missing (nothing is cached then)
+
+    Raises:
+        RuntimeError, pymysql.MySQLError: If a read fails (also from build())
+    """
+    today = date.today()
+    versions = http_cache.get_versions(ALL_TABLES)
+    order_rows = _orders_fingerprint(user['user_id'], sales_area_id)
+
+    orders_part = ",".join(
+        f"{row['id']}:{row['version']}:{row['item_count']}:{row['items_updated_at']}" for row in order_rows
+    )
+    tables_part = http_cache.versions_fingerprint(ALL_TABLES, versions)
+    etag = None
+    if tables_part is not None:
+        raw = f"{user['user_id']}|{user.get('role')}|{sales_area_id}|{today}|{tables_part}|{orders_part}"
+        etag = '"' + hashlib.sha1(raw.encode()).hexdigest()[:24] + '"'
+
+    def build() -> Dict[str, Any]:
+        return {
+            "date": today,
+            "user": {"id": user['user_id'], "username": user['username'], "role": user.get('role')},
+            "sales_area_id": sales_area_id,
+            "establishment": _component("establishment", None, versions, _load_establishment),
+            "sales_areas": _component("sales_areas", None, versions, _load_sales_areas),
+            "menus": _component(
+                "menus", (sales_area_id, today), versions,
+                lambda: _load_menus(sales_area_id, today)
+            ),
+            "orders": _load_orders([row['id'] for row in order_rows]),
+        }
+
+    return etag, build
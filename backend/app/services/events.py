@@ -0,0 +1,217 @@
+"""
+Server-sent events for connected clients.
+
+Writers publish an event by inserting a row in the Events table, inside their
+own transaction when they have one, so the event exists exactly when the
+change is committed. Each worker runs one poller, started with the app, that
+reads the new rows every POLL_INTERVAL seconds, runs the listeners registered
+for their type (cache invalidation in this worker) and hands them to its
+subscribers' queues; clients connected to any worker get every event with a
+single query per worker and interval, whatever the number of clients.
+
+Ids are assigned at insert but rows become visible at commit, so a lower id
+can appear after a higher one was read. Ids skipped by the poller are kept
+as gaps and read again on every poll until their row shows up or GAP_SECONDS
+pass (rolled-back inserts leave permanent holes).
+
+Clients reconnecting with Last-Event-ID get the events they missed replayed
+first (up to REPLAY_LIMIT). A subscriber whose queue fills up is dropped and
+reconnects the same way.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from app.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1.0
+HEARTBEAT_SECONDS = 15.0
+REPLAY_LIMIT = 500
+QUEUE_SIZE = 256
+RETENTION_HOURS = 24
+PRUNE_INTERVAL = 3600.0
+GAP_SECONDS = 60.0
+MAX_GAPS = 1000
+
+EVENT_AVAILABILITY = "availability"
+
+INSERT_QUERY = "INSERT INTO Events (event_type, payload) VALUES (%s, %s)"
+
+def publish(event_type: str, payload: Dict[str, Any], cursor=None):
+    """
+    Publish an event to the connected clients.
+
+    Args:
+        event_type: The event name sent as the SSE `event` field
+        payload: JSON-serializable event data
+        cursor: Optional cursor of an open transaction; the event is only
+            delivered if it commits
+    """
+    params = (event_type, json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")))
+    if cursor is not None:
+        cursor.execute(INSERT_QUERY, params)
+    else:
+        BaseModel.execute_custom_query(INSERT_QUERY, params)
+
+_listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+
+def add_listener(event_type: str, callback: Callable[[Dict[str, Any]], None]):
+    """
+    Run a callback in this worker for every event of a type, whichever
+    worker published it.
+
+    Args:
+        event_type: The event name
+        callback: Called with the decoded payload from the poller
+    """
+    _listeners.setdefault(event_type, []).append(callback)
+
+def _latest_id() -> int:
+    rows = BaseModel.execute_custom_query("SELECT COALESCE(MAX(id), 0) AS id FROM Events")
+    return rows[0]['id'] if rows else 0
+
+def _fetch_since(last_id: int, limit: int = REPLAY_LIMIT, gaps: Sequence[int] = ()) -> List[Dict[str, Any]]:
+    if gaps:
+        placeholders = ", ".join(["%s"] * len(gaps))
+        return BaseModel.execute_custom_query(
+            f"SELECT id, event_type, payload FROM Events WHERE id > %s OR id IN ({placeholders}) "
+            "ORDER BY id ASC LIMIT %s",
+            (last_id, *gaps, limit + len(gaps))
+        )
+    return BaseModel.execute_custom_query(
+        "SELECT id, event_type, payload FROM Events WHERE id > %s ORDER BY id ASC LIMIT %s",
+        (last_id, limit)
+    )
+
+def _prune():
+    BaseModel.execute_custom_query(
+        "DELETE FROM Events WHERE created_at < NOW() - INTERVAL %s HOUR",
+        (RETENTION_HOURS,)
+    )
+
+def format_event(row: Dict[str, Any]) -> str:
+    """Format an Events row as an SSE message."""
+    return f"id: {row['id']}\nevent: {row['event_type']}\ndata: {row['payload']}\n\n"
+
+class EventBroker:
+    """Per-worker fan-out of the Events table to subscriber queues."""
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_id: Optional[int] = None
+        # Unseen ids below _last_id -> when they were first skipped
+        self._gaps: Dict[int, float] = {}
+        self._pruned_at = 0.0
+
+    def _notify(self, row: Dict[str, Any]):
+        callbacks = _listeners.get(row['event_type'])
+        if not callbacks:
+            return
+        payload = json.loads(row['payload'])
+        for callback in callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Error in {row['event_type']} event listener: {e}")
+
+    def _dispatch(self, rows: List[Dict[str, Any]]):
+        now = time.monotonic()
+        for row in rows:
+            row_id = row['id']
+            if row_id > self._last_id:
+                for gap in range(max(self._last_id + 1, row_id - MAX_GAPS), row_id):
+                    self._gaps[gap] = now
+                self._last_id = row_id
+            elif self._gaps.pop(row_id, None) is None:
+                # Already delivered
+                continue
+            self._notify(row)
+            for queue in list(self._subscribers):
+                try:
+                    queue.put_nowait(row)
+                except asyncio.QueueFull:
+                    # Slow client: end its stream; it reconnects with Last-Event-ID
+                    self._subscribers.discard(queue)
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+
+        expired = [gap for gap, seen_at in self._gaps.items() if now - seen_at > GAP_SECONDS]
+        for gap in expired:
+            del self._gaps[gap]
+        if len(self._gaps) > MAX_GAPS:
+            for gap in sorted(self._gaps)[:len(self._gaps) - MAX_GAPS]:
+                del self._gaps[gap]
+
+    async def start(self):
+        """Start this worker's poller from the newest event, if not running."""
+        if self._task is None:
+            latest = await run_in_threadpool(_latest_id)
+            if self._task is None:
+                self._last_id = latest
+                self._gaps.clear()
+                self._task = asyncio.create_task(self._poll())
+
+    async def _poll(self):
+        try:
+            while True:
+                await asyncio.sleep(POLL_INTERVAL)
+                try:
+                    rows = await run_in_threadpool(_fetch_since, self._last_id, REPLAY_LIMIT, sorted(self._gaps))
+                    self._dispatch(rows)
+                    if time.monotonic() - self._pruned_at > PRUNE_INTERVAL:
+                        self._pruned_at = time.monotonic()
+                        await run_in_threadpool(_prune)
+                except Exception as e:
+                    logger.error(f"Error polling events: {e}")
+        finally:
+            self._task = None
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Receive events until the client disconnects.
+
+        Args:
+            last_event_id: Id of the last event the client received, to
+                replay the ones it missed
+
+        Yields:
+            dict: Events rows, or None every HEARTBEAT_SECONDS without events
+        """
+        await self.start()
+
+        queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+        # Registering and reading the boundary happen without yielding to the
+        # loop, so every event is either replayed or queued, never both
+        self._subscribers.add(queue)
+        boundary = self._last_id
+
+        try:
+            if last_event_id is not None and last_event_id < boundary:
+                # Gaps are still pending in the poller and reach the queue
+                pending = set(self._gaps)
+                for row in await run_in_threadpool(_fetch_since, last_event_id):
+                    if row['id'] > boundary:
+                        break
+                    if row['id'] not in pending:
+                        yield row
+
+            while True:
+                try:
+                    row = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if row is None:
+                    return
+                yield row
+        finally:
+            self._subscribers.discard(queue)
+
+broker = EventBroker()
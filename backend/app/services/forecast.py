@@ -0,0 +1,184 @@
+"""
+Demand forecast service.
+Forecasts per-product quantities for a target date from the same weekday in
+previous weeks, fitting every product and hour at once with NumPy.
+
+Models:
+    ses             Simple exponential smoothing over the same-weekday series
+    seasonal_naive  Same weekday of the previous week
+"""
+import logging
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, Any, List, Iterable, Tuple
+from app.db.rows import ROW_TUPLE
+from app.models.order import Order
+
+# NumPy is imported where it is used so importing the API stays fast
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHOD_SES = "ses"
+METHOD_SEASONAL_NAIVE = "seasonal_naive"
+METHODS = (METHOD_SES, METHOD_SEASONAL_NAIVE)
+
+# Same-weekday observations used to fit the models
+HISTORY_WEEKS = 8
+DEFAULT_ALPHA = 0.4
+
+HISTORY_QUERY = """
+    SELECT oi.product_id, DATE(o.created_at), HOUR(o.created_at), SUM(oi.quantity)
+    FROM Orders o
+    JOIN OrderItems oi ON oi.order_id = o.id
+    WHERE o.status = %s
+    AND o.created_at >= %s
+    AND o.created_at < %s
+    AND DAYOFWEEK(o.created_at) = %s
+    AND oi.status <> 'cancelado'
+    GROUP BY oi.product_id, DATE(o.created_at), HOUR(o.created_at)
+"""
+
+CATALOG_QUERY = """
+    SELECT p.id, p.name, p.category_id
+    FROM Products p
+    ORDER BY p.id
+"""
+
+MENU_CATALOG_QUERY = """
+    SELECT p.id, p.name, p.category_id
+    FROM MenuItems mi
+    JOIN Products p ON mi.product_id = p.id
+    WHERE mi.menu_id = %s
+    ORDER BY p.id
+"""
+
+def build_history(rows: Iterable[Tuple[int, date, int, int]],
+                  product_ids: "np.ndarray",
+                  target_date: date,
+                  weeks: int = HISTORY_WEEKS) -> "np.ndarray":
+    """
+    Scatter aggregated sales rows into a dense array.
+    
+    Args:
+        rows: (product_id, day, hour, quantity) for the target weekday
+        product_ids: Sorted product ids defining the first axis
+        target_date: The date being forecast
+        weeks: Number of weeks of history
+        
+    Returns:
+        np.ndarray: float array of shape (products, weeks, 24), oldest week first
+    """
+    import numpy as np
+    
+    history = np.zeros((len(product_ids), weeks, 24), dtype=np.float64)
+    rows = list(rows)
+    if not rows or not len(product_ids):
+        return history
+    
+    pids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    weeks_back = np.fromiter(((target_date - r[1]).days // 7 for r in rows), dtype=np.int64, count=len(rows))
+    hours = np.fromiter((r[2] for r in rows), dtype=np.int64, count=len(rows))
+    quantities = np.fromiter((r[3] for r in rows), dtype=np.float64, count=len(rows))
+    
+    positions = np.searchsorted(product_ids, pids)
+    positions = np.clip(positions, 0, len(product_ids) - 1)
+    # Drop products no longer in the catalog and rows outside the window
+    valid = (product_ids[positions] == pids) & (weeks_back >= 1) & (weeks_back <= weeks)
+    
+    np.add.at(
+        history,
+        (positions[valid], weeks - weeks_back[valid], hours[valid]),
+        quantities[valid]
+    )
+    return history
+
+def fit_forecast(history: "np.ndarray", method: str = METHOD_SES, alpha: float = DEFAULT_ALPHA) -> "np.ndarray":
+    """
+    Forecast the next same-weekday value for every product and hour.
+    
+    Args:
+        history: Array of shape (products, weeks, 24), oldest week first
+        method: One of METHODS
+        alpha: Smoothing factor for ses, in (0, 1]
+        
+    Returns:
+        np.ndarray: Forecast of shape (products, 24)
+    """
+    if method == METHOD_SEASONAL_NAIVE:
+        return history[:, -1, :].copy()
+    
+    level = history[:, 0, :].copy()
+    for week in range(1, history.shape[1]):
+        level *= (1.0 - alpha)
+        level += alpha * history[:, week, :]
+    return level
+
+def forecast_for_date(target_date: date,
+                      method: str = METHOD_SES,
+                      alpha: float = DEFAULT_ALPHA,
+                      menu_id: int = None,
+                      include_hourly: bool = False) -> List[Dict[str, Any]]:
+    """
+    Forecast demand of the product catalog (or one menu's products) for a date.
+    
+    Args:
+        target_date: The date to forecast
+        method: One of METHODS
+        alpha: Smoothing factor for ses
+        menu_id: Optional menu whose products are forecast instead of the full catalog
+        include_hourly: Whether to include the 24-hour profile of each product
+        
+    Returns:
+        list: One row per product, sorted by forecast quantity descending
+        
+    Raises:
+        RuntimeError: If the database is unavailable
+    """
+    import numpy as np
+    
+    # The catalog can be the whole product table; named tuples keep it compact
+    if menu_id:
+        catalog = Order.execute_custom_query(MENU_CATALOG_QUERY, (menu_id,), row_type=ROW_TUPLE)
+    else:
+        catalog = Order.execute_custom_query(CATALOG_QUERY, row_type=ROW_TUPLE)
+    
+    if not catalog:
+        return []
+    
+    product_ids = np.array([p.id for p in catalog], dtype=np.int64)
+    order = np.argsort(product_ids, kind="stable")
+    product_ids = product_ids[order]
+    catalog = [catalog[i] for i in order]
+    
+    # MySQL DAYOFWEEK is 1=Sunday..7=Saturday; date.weekday() is 0=Monday
+    mysql_weekday = (target_date.weekday() + 1) % 7 + 1
+    rows = Order.stream_custom_query(
+        HISTORY_QUERY,
+        (
+            Order.STATUS_PAID,
+            target_date - timedelta(weeks=HISTORY_WEEKS),
+            target_date,
+            mysql_weekday,
+        )
+    )
+    
+    history = build_history(rows, product_ids, target_date)
+    hourly = fit_forecast(history, method, alpha)
+    daily = hourly.sum(axis=1)
+    ranking = np.argsort(-daily, kind="stable")
+    
+    result = []
+    for index in ranking:
+        product = catalog[index]
+        row = {
+            "product_id": product.id,
+            "product_name": product.name,
+            "category_id": product.category_id,
+            "forecast_quantity": round(float(daily[index]), 2),
+        }
+        if include_hourly:
+            row["hourly"] = np.round(hourly[index], 2).tolist()
+        result.append(row)
+    
+    return result
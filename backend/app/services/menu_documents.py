@@ -0,0 +1,223 @@
+"""
+Precompiled published menu documents.
+
+Publishing a menu compiles, per sales area it is assigned to (plus one not
+bound to an area), the complete JSON body of GET /api/v1/menus/{id}/document:
+the menu, its items grouped by category with their prices and availability.
+The bodies are stored in PublishedMenuDocuments and held in memory as bytes,
+so a read sends them as they are without querying or serializing anything.
+
+A document is recompiled only when its source changes. The source hash covers
+the menu row, its sales areas, its items and the products and categories they
+reference, and is checked on a read only when the TableVersions counters of
+those tables moved since the document was loaded in this worker. Reads raise
+when the database fails, so a document is never compiled, stored or cached
+from a failed read.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from fastapi.encoders import jsonable_encoder
+from app.db.db_connect import transaction
+from app.models.published_menu_document import PublishedMenuDocument
+from app.utils import http_cache
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TABLES = ("Menus", "MenuSalesAreas", "SalesAreas", "MenuItems", "Products", "ProductCategories")
+
+DOCUMENT_MESSAGE = "Carta obtenida exitosamente"
+
+SOURCE_QUERY = """
+    SELECT
+        m.id, m.name, m.valid_date, m.status,
+        (
+            SELECT GROUP_CONCAT(CONCAT(sa.id, ':', sa.name) ORDER BY sa.id SEPARATOR '|')
+            FROM MenuSalesAreas msa
+            JOIN SalesAreas sa ON sa.id = msa.sales_area_id
+            WHERE msa.menu_id = m.id
+        ) AS areas,
+        (
+            SELECT CONCAT(COUNT(*), ':', COALESCE(BIT_XOR(CRC32(CONCAT_WS('|',
+                mi.id, mi.product_id, mi.price, mi.is_available,
+                p.name, p.description, p.image, p.is_available, pc.id, pc.name
+            ))), 0))
+            FROM MenuItems mi
+            JOIN Products p ON p.id = mi.product_id
+            JOIN ProductCategories pc ON pc.id = p.category_id
+            WHERE mi.menu_id = m.id
+        ) AS items_hash
+    FROM Menus m
+    WHERE m.id = %s
+"""
+
+ITEMS_QUERY = """
+    SELECT
+        mi.id, mi.product_id, p.name, p.description, p.image, mi.price,
+        (mi.is_available AND p.is_available) AS is_available,
+        pc.id AS category_id, pc.name AS category_name
+    FROM MenuItems mi
+    JOIN Products p ON p.id = mi.product_id
+    JOIN ProductCategories pc ON pc.id = p.category_id
+    WHERE mi.menu_id = %s
+    ORDER BY pc.name ASC, p.name ASC
+"""
+
+# (menu_id, sales_area_id) -> (TableVersions fingerprint, body, etag)
+_documents: Dict[Tuple[int, int], Tuple[str, bytes, str]] = {}
+
+def invalidate(menu_id: Optional[int] = None):
+    """
+    Drop documents held in memory (they are re-validated on the next read).
+
+    Args:
+        menu_id: Only drop this menu's documents (all when omitted)
+    """
+    if menu_id is None:
+        _documents.clear()
+        return
+    for key in [key for key in _documents if key[0] == menu_id]:
+        _documents.pop(key, None)
+
+def _fetch_all(query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+    """Run a read, raising on failure (RuntimeError or pymysql.MySQLError)."""
+    with transaction() as cursor:
+        cursor.execute(query, tuple(params))
+        return list(cursor.fetchall())
+
+def _load_source(menu_id: int) -> Optional[Dict[str, Any]]:
+    results = _fetch_all(SOURCE_QUERY, (menu_id,))
+    if not results:
+        return None
+    source = results[0]
+    raw = "|".join(str(source[key]) for key in ("name", "valid_date", "status", "areas", "items_hash"))
+    source["source_hash"] = hashlib.sha1(raw.encode()).hexdigest()
+    source["area_list"] = []
+    for area in (source["areas"] or "").split("|"):
+        if area:
+            area_id, _, name = area.partition(":")
+            source["area_list"].append({"id": int(area_id), "name": name})
+    return source
+
+def _serialize(menu: Dict[str, Any], sales_area: Optional[Dict[str, Any]], categories: list,
+               compiled_at: datetime) -> Tuple[str, str]:
+    body = {
+        "status": "success",
+        "message": DOCUMENT_MESSAGE,
+        "data": {
+            "menu": menu,
+            "sales_area": sales_area,
+            "categories": categories,
+            "compiled_at": compiled_at,
+        },
+    }
+    document = json.dumps(jsonable_encoder(body), ensure_ascii=False, separators=(",", ":"))
+    etag = '"' + hashlib.sha1(document.encode()).hexdigest()[:24] + '"'
+    return document, etag
+
+def compile_menu(menu_id: int, source: Optional[Dict[str, Any]] = None) -> Dict[int, Tuple[str, str]]:
+    """
+    Compile and store the documents of a menu.
+
+    Unpublished (or missing) menus get their stored documents removed.
+
+    Args:
+        menu_id: The menu ID
+        source: The menu source row, if already loaded
+
+    Returns:
+        dict: sales_area_id -> (document, etag); empty if the menu is not published
+
+    Raises:
+        RuntimeError, pymysql.MySQLError: If the menu could not be read
+    """
+    source = source or _load_source(menu_id)
+    if not source or source['status'] != 'publicada':
+        PublishedMenuDocument.replace_for_menu(menu_id, [])
+        invalidate(menu_id)
+        return {}
+
+    categories: Dict[int, Dict[str, Any]] = {}
+    for row in _fetch_all(ITEMS_QUERY, (menu_id,)):
+        category = categories.get(row['category_id'])
+        if category is None:
+            category = categories[row['category_id']] = {
+                "id": row['category_id'],
+                "name": row['category_name'],
+                "items": [],
+            }
+        category["items"].append({
+            "id": row['id'],
+            "product_id": row['product_id'],
+            "name": row['name'],
+            "description": row['description'],
+            "image": row['image'],
+            "price": row['price'],
+            "is_available": bool(row['is_available']),
+        })
+
+    menu = {
+        "id": source['id'],
+        "name": source['name'],
+        "valid_date": source['valid_date'],
+        "status": source['status'],
+    }
+    compiled_at = datetime.now()
+    areas = [(PublishedMenuDocument.NO_AREA, None)] + [(area['id'], area) for area in source['area_list']]
+    documents = {
+        area_id: _serialize(menu, area, list(categories.values()), compiled_at)
+        for area_id, area in areas
+    }
+
+    PublishedMenuDocument.replace_for_menu(menu_id, [
+        {"sales_area_id": area_id, "document": document, "etag": etag, "source_hash": source['source_hash']}
+        for area_id, (document, etag) in documents.items()
+    ])
+    invalidate(menu_id)
+    logger.info(f"Compiled {len(documents)} document(s) for menu {menu_id}")
+    return documents
+
+def get_document(menu_id: int, sales_area_id: int = PublishedMenuDocument.NO_AREA) -> Optional[Tuple[bytes, str]]:
+    """
+    Get the precompiled document of a published menu.
+
+    Args:
+        menu_id: The menu ID
+        sales_area_id: The sales area ID (NO_AREA for the menu without an area)
+
+    Returns:
+        tuple: (body, etag), or None if the menu is not published or not
+            assigned to the sales area
+
+    Raises:
+        RuntimeError, pymysql.MySQLError: If the menu could not be read
+    """
+    key = (menu_id, sales_area_id)
+    fingerprint = http_cache.versions_fingerprint(SOURCE_TABLES)
+    cached = _documents.get(key)
+    if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+        return cached[1], cached[2]
+
+    source = _load_source(menu_id)
+    if not source or source['status'] != 'publicada':
+        invalidate(menu_id)
+        return None
+    if sales_area_id != PublishedMenuDocument.NO_AREA and \
+            sales_area_id not in {area['id'] for area in source['area_list']}:
+        return None
+
+    stored = PublishedMenuDocument.get(menu_id, sales_area_id)
+    if stored and stored['source_hash'] == source['source_hash']:
+        document, etag = stored['document'], stored['etag']
+    else:
+        documents = compile_menu(menu_id, source)
+        if sales_area_id not in documents:
+            return None
+        document, etag = documents[sales_area_id]
+
+    body = document.encode()
+    if fingerprint is not None:
+        _documents[key] = (fingerprint, body, etag)
+    return body, etag
@@ -0,0 +1,141 @@
+"""
+Menu resolution: which published menu applies to a sales area on a date.
+
+Keeps an in-memory map of (sales_area_id, valid_date) to the published menu
+assigned to the area for that date, loaded with one query over Menus and
+MenuSalesAreas for the dates from PAST_DAYS ago onwards. When an area has
+several published menus for the same date the newest one wins, as in the
+menu suggestions. Order creation and menu listing resolve against the map
+without querying.
+
+The map is dropped when menus or their sales areas are written in this
+process, expires after RESOLVER_TTL seconds to pick up writes from other
+workers, and a miss reloads it (at most every MISS_RELOAD_INTERVAL seconds)
+so a menu just published in another worker is found before an order is
+rejected. Dates before the loaded window are looked up in the database.
+"""
+import logging
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+from app.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_TTL = 30.0
+MISS_RELOAD_INTERVAL = 1.0
+# Yesterday's menus stay resolvable so offline orders taken before midnight sync
+PAST_DAYS = 1
+
+MENU_COLUMNS = "m.id, m.name, m.valid_date, m.status"
+
+PUBLISHED_QUERY = f"""
+    SELECT msa.sales_area_id, {MENU_COLUMNS}
+    FROM Menus m
+    JOIN MenuSalesAreas msa ON msa.menu_id = m.id
+    WHERE m.status = 'publicada'
+    AND m.valid_date >= %s
+    ORDER BY m.id ASC
+"""
+
+SINGLE_QUERY = f"""
+    SELECT {MENU_COLUMNS}
+    FROM Menus m
+    JOIN MenuSalesAreas msa ON msa.menu_id = m.id
+    WHERE msa.sales_area_id = %s
+    AND m.status = 'publicada'
+    AND m.valid_date = %s
+    ORDER BY m.id DESC
+    LIMIT 1
+"""
+
+class _Snapshot:
+    """Published menus by area and date, as loaded at one point in time."""
+
+    def __init__(self, since: date, rows):
+        self.loaded_at = time.monotonic()
+        self.since = since
+        self.by_area_date: Dict[Tuple[int, date], Dict[str, Any]] = {}
+        for row in rows:
+            menu = {key: row[key] for key in ("id", "name", "valid_date", "status")}
+            # Rows come oldest first, so the newest menu overwrites the others
+            self.by_area_date[(row['sales_area_id'], row['valid_date'])] = menu
+
+_snapshot: Optional[_Snapshot] = None
+_lock = threading.Lock()
+
+def invalidate():
+    """Drop the loaded map; the next resolution reloads it."""
+    global _snapshot
+    _snapshot = None
+
+def _load() -> _Snapshot:
+    since = date.today() - timedelta(days=PAST_DAYS)
+    snapshot = _Snapshot(since, BaseModel.execute_custom_query(PUBLISHED_QUERY, (since,)))
+    logger.info(f"Menu resolver loaded {len(snapshot.by_area_date)} area/date entries from {since}")
+    return snapshot
+
+def _get_snapshot(reload_after: float = RESOLVER_TTL) -> _Snapshot:
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - snapshot.loaded_at < reload_after:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < reload_after:
+            return snapshot
+        _snapshot = _load()
+        return _snapshot
+
+def warm() -> int:
+    """
+    Load the map.
+
+    Returns:
+        int: Number of (sales area, date) entries loaded
+    """
+    return len(_get_snapshot().by_area_date)
+
+def resolve(sales_area_id: int, target_date: date = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the published menu that applies to a sales area on a date.
+
+    Args:
+        sales_area_id: The sales area ID
+        target_date: The date (defaults to today)
+
+    Returns:
+        dict: id, name, valid_date and status of the menu, or None if no
+            published menu is assigned to the area for that date
+    """
+    target_date = target_date or date.today()
+    snapshot = _get_snapshot()
+    if target_date < snapshot.since:
+        results = BaseModel.execute_custom_query(SINGLE_QUERY, (sales_area_id, target_date))
+        return results[0] if results else None
+
+    menu = snapshot.by_area_date.get((sales_area_id, target_date))
+    if menu is None:
+        menu = _get_snapshot(MISS_RELOAD_INTERVAL).by_area_date.get((sales_area_id, target_date))
+    return menu
+
+def applies(menu_id: int, sales_area_id: int) -> bool:
+    """
+    Check that a menu is the one that applies to a sales area today, or on
+    one of the PAST_DAYS before (offline orders replayed after midnight).
+
+    Args:
+        menu_id: The menu ID
+        sales_area_id: The sales area ID
+
+    Returns:
+        bool: True if orders of the area may use the menu
+    """
+    today = date.today()
+    for days_ago in range(PAST_DAYS + 1):
+        menu = resolve(sales_area_id, today - timedelta(days=days_ago))
+        if menu is not None and menu['id'] == menu_id:
+            return True
+    return False
@@ -0,0 +1,169 @@
+"""
+Typeahead suggestions for the waiter product picker.
+
+Keeps, per sales area and day, a sorted array of normalized keys over the
+available items of the menu that applies to the area (menu_resolver, the
+same menu orders are created and priced on). A lookup is a bisect plus a
+short forward scan, so suggestions never touch the database once the area is
+loaded. A failed read raises instead of caching an empty index, and indexes
+of past days are dropped.
+
+Entries are dropped when menus, menu items or products are written in this
+process or availability changes in any worker (through the event feed), and
+expire after SUGGEST_TTL seconds to pick up other writes from other workers.
+"""
+import hashlib
+import logging
+import threading
+import time
+from bisect import bisect_left
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from app.db.db_connect import transaction
+from app.services import menu_resolver
+from app.utils.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_TTL = 30.0
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+MENU_ITEMS_QUERY = """
+    SELECT
+        mi.id AS menu_item_id,
+        mi.menu_id,
+        mi.product_id,
+        p.name,
+        mi.price,
+        p.category_id,
+        pc.name AS category_name
+    FROM MenuItems mi
+    JOIN Products p ON mi.product_id = p.id
+    JOIN ProductCategories pc ON p.category_id = pc.id
+    WHERE mi.menu_id = %s
+    AND mi.is_available = TRUE
+    AND p.is_available = TRUE
+    ORDER BY p.name ASC, mi.id DESC
+"""
+
+class SuggestIndex:
+    """Sorted-array prefix index over one area's menu items."""
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        # Whole-name keys rank above keys starting at a later word
+        name_keys: List[Tuple[str, int]] = []
+        word_keys: List[Tuple[str, int]] = []
+        for position, item in enumerate(items):
+            tokens = tokenize(item['name'])
+            name_keys.append((" ".join(tokens), position))
+            for start in range(1, len(tokens)):
+                word_keys.append((" ".join(tokens[start:]), position))
+
+        name_keys.sort()
+        word_keys.sort()
+        self.items = items
+        self._name_keys = [key for key, _ in name_keys]
+        self._name_positions = [position for _, position in name_keys]
+        self._word_keys = [key for key, _ in word_keys]
+        self._word_positions = [position for _, position in word_keys]
+        self.version = hashlib.sha1(
+            repr([(i['menu_item_id'], i['name'], str(i['price'])) for i in items]).encode()
+        ).hexdigest()[:16]
+
+    @staticmethod
+    def _scan(keys, positions, prefix, seen, result, limit):
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and len(result) < limit and keys[index].startswith(prefix):
+            position = positions[index]
+            if position not in seen:
+                seen.add(position)
+                result.append(position)
+            index += 1
+
+    def suggest(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Get the items whose name, or one of its words, starts with the query.
+
+        Args:
+            query: The typed text
+            limit: Maximum number of suggestions
+
+        Returns:
+            list: Matching items, name-prefix matches first
+        """
+        prefix = " ".join(tokenize(query))
+        if not prefix:
+            return []
+
+        seen = set()
+        result = []
+        self._scan(self._name_keys, self._name_positions, prefix, seen, result, limit)
+        self._scan(self._word_keys, self._word_positions, prefix, seen, result, limit)
+        return [self.items[position] for position in result]
+
+# (sales_area_id, date) -> (loaded at, menu ID or None, index)
+_indexes: Dict[Tuple[int, date], Tuple[float, Optional[int], SuggestIndex]] = {}
+_lock = threading.Lock()
+
+def invalidate():
+    """Drop every cached area index."""
+    _indexes.clear()
+
+def _load(menu_id: Optional[int]) -> SuggestIndex:
+    if menu_id is None:
+        return SuggestIndex([])
+    with transaction() as cursor:
+        cursor.execute(MENU_ITEMS_QUERY, (menu_id,))
+        rows = cursor.fetchall()
+
+    # A product listed twice keeps its newest menu item, as the price book does
+    items = []
+    seen_products = set()
+    for row in rows:
+        if row['product_id'] in seen_products:
+            continue
+        seen_products.add(row['product_id'])
+        items.append(row)
+
+    return SuggestIndex(items)
+
+def get_index(sales_area_id: int, target_date: date = None) -> SuggestIndex:
+    """
+    Get the suggestion index of a sales area, loading it if missing or expired.
+
+    Args:
+        sales_area_id: The sales area ID
+        target_date: The menu date (defaults to today)
+
+    Returns:
+        SuggestIndex: The area's index (empty if no menu applies)
+
+    Raises:
+        RuntimeError, pymysql.MySQLError: If the menu items could not be read
+    """
+    today = date.today()
+    key = (sales_area_id, target_date or today)
+    menu = menu_resolver.resolve(*key)
+    menu_id = menu['id'] if menu else None
+
+    def current(entry) -> bool:
+        return entry is not None and entry[1] == menu_id and time.monotonic() - entry[0] < SUGGEST_TTL
+
+    entry = _indexes.get(key)
+    if current(entry):
+        return entry[2]
+
+    with _lock:
+        entry = _indexes.get(key)
+        if current(entry):
+            return entry[2]
+        index = _load(menu_id)
+        for stale in [stale for stale in _indexes if stale[1] < today]:
+            _indexes.pop(stale, None)
+        _indexes[key] = (time.monotonic(), menu_id, index)
+        logger.info(
+            f"Suggest index loaded for sales area {key[0]} on {key[1]} "
+            f"from menu {menu_id} with {len(index.items)} items"
+        )
+        return index
@@ -0,0 +1,240 @@
+"""
+Batch ingest of queued (offline) order operations.
+
+Applies a batch of client operations in one transaction: orders are created
+through Order.create_order, items are priced from the order's menu by the
+price book, those of the whole batch are inserted with one multi-row INSERT
+and totals are recomputed once per touched order. Every operation's outcome
+is stored under its idempotency key, so replaying a batch after a dropped
+connection returns the stored outcome instead of applying it again.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+import pymysql
+from app.db.db_connect import transaction
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.services import menu_resolver, price_book
+
+logger = logging.getLogger(__name__)
+
+OP_CREATE_ORDER = "create_order"
+OP_ADD_ITEMS = "add_items"
+OPERATIONS = (OP_CREATE_ORDER, OP_ADD_ITEMS)
+
+RESULT_APPLIED = "applied"
+RESULT_DUPLICATE = "duplicate"
+RESULT_REJECTED = "rejected"
+
+CLOSED_STATUSES = (Order.STATUS_PAID, Order.STATUS_CANCELED)
+
+# A concurrent replay of the same keys surfaces as a duplicate key error or a
+# deadlock on the key gap locks; retrying then finds the stored outcomes.
+MAX_ATTEMPTS = 3
+RETRYABLE_ERRORS = (1062, 1213)
+
+def _in_clause(values) -> str:
+    return ", ".join(["%s"] * len(values))
+
+def _select_in(cursor, query: str, values, suffix: str = "", leading=()) -> List[Dict[str, Any]]:
+    values = list(values)
+    if not values:
+        return []
+    cursor.execute(query.format(placeholders=_in_clause(values)) + suffix, tuple(leading) + tuple(values))
+    return cursor.fetchall()
+
+def _result(key: str, status: str, order_id: Optional[int] = None,
+            items_added: int = 0, detail: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "idempotency_key": key,
+        "status": status,
+        "order_id": order_id,
+        "items_added": items_added,
+        "detail": detail,
+    }
+
+def _resolve_menu(op: Dict[str, Any], spot: Dict[str, Any]) -> Optional[int]:
+    # Offline clients may send the menu they took the order with (yesterday's
+    # included); without one the area's menu of today applies
+    if op.get("menu_id") is not None:
+        return op["menu_id"] if menu_resolver.applies(op["menu_id"], spot["sales_area_id"]) else None
+    menu = menu_resolver.resolve(spot["sales_area_id"])
+    return menu["id"] if menu else None
+
+def _validate(op: Dict[str, Any], order_id: Optional[int], spots, orders) -> Optional[str]:
+    if op["type"] not in OPERATIONS:
+        return f"Tipo de operación inválido. Debe ser uno de: {', '.join(OPERATIONS)}"
+
+    if op["type"] == OP_CREATE_ORDER:
+        spot = spots.get(op.get("service_spot_id"))
+        if not spot:
+            return "Service spot no encontrado"
+        if op.get("sales_area_id") not in (None, spot["sales_area_id"]):
+            return "El service spot no pertenece al área de venta indicada"
+        if _resolve_menu(op, spot) is None:
+            if op.get("menu_id") is not None:
+                return "El menú indicado no es una carta publicada del área de venta"
+            return "No hay una carta publicada para el área de venta hoy"
+    else:
+        if order_id is None:
+            return "Orden no encontrada"
+        if orders.get(order_id) in CLOSED_STATUSES:
+            return "No se puede modificar una orden cerrada"
+        if not op.get("items"):
+            return "La operación no contiene ítems"
+    return None
+
+def _apply(cursor, operations: List[Dict[str, Any]], user_id: int) -> List[Dict[str, Any]]:
+    keys = {op["idempotency_key"] for op in operations}
+    order_keys = {op["order_key"] for op in operations if op.get("order_key")}
+
+    # Keys are scoped to the user, so another user's key (or the order it
+    # created) is never replayed. Locks existing keys (and the gaps of missing
+    # ones) against concurrent replays
+    stored = {
+        row["idempotency_key"]: row
+        for row in _select_in(
+            cursor,
+            "SELECT * FROM IdempotencyKeys WHERE user_id = %s AND idempotency_key IN ({placeholders})",
+            keys | order_keys,
+            " FOR UPDATE",
+            leading=(user_id,)
+        )
+    }
+
+    # Batched lookups for validation
+    spots = {
+        row["id"]: row
+        for row in _select_in(
+            cursor,
+            "SELECT id, sales_area_id FROM ServiceSpots WHERE id IN ({placeholders})",
+            {op["service_spot_id"] for op in operations if op.get("service_spot_id")}
+        )
+    }
+    referenced_orders = {op["order_id"] for op in operations if op.get("order_id")}
+    referenced_orders |= {row["order_id"] for row in stored.values() if row["order_id"]}
+    orders = {}
+    order_menus = {}
+    for row in _select_in(
+        cursor,
+        "SELECT id, status, menu_id FROM Orders WHERE id IN ({placeholders})",
+        referenced_orders,
+        " FOR UPDATE"
+    ):
+        orders[row["id"]] = row["status"]
+        order_menus[row["id"]] = row["menu_id"]
+
+    results: List[Dict[str, Any]] = []
+    handled: Dict[str, Dict[str, Any]] = {}
+    created: Dict[str, int] = {}
+    pending_items: List[Dict[str, Any]] = []
+    touched_orders = set()
+    new_keys = []
+
+    for op in operations:
+        key = op["idempotency_key"]
+
+        previous = stored.get(key)
+        if previous is not None:
+            status = RESULT_DUPLICATE if previous["result_status"] == RESULT_APPLIED else previous["result_status"]
+            results.append(_result(key, status, previous["order_id"], previous["items_added"], previous["detail"]))
+            continue
+        if key in handled:
+            results.append(dict(handled[key], status=RESULT_DUPLICATE))
+            continue
+
+        order_id = None
+        if op["type"] == OP_ADD_ITEMS:
+            order_key = op.get("order_key")
+            if op.get("order_id"):
+                order_id = op["order_id"] if op["order_id"] in orders else None
+            elif order_key in created:
+                order_id = created[order_key]
+            elif order_key in stored:
+                order_id = stored[order_key]["order_id"]
+                order_id = order_id if order_id in orders else None
+
+        error = _validate(op, order_id, spots, orders)
+        items = []
+        if not error:
+            # Items are priced from the order's menu before anything is written
+            if op["type"] == OP_CREATE_ORDER:
+                menu_id = _resolve_menu(op, spots[op["service_spot_id"]])
+            else:
+                menu_id = order_menus[order_id]
+            try:
+                items = price_book.price_items(menu_id, op.get("items", []))
+            except price_book.PriceBookError as e:
+                error = str(e)
+
+        if error:
+            result = _result(key, RESULT_REJECTED, order_id, detail=error)
+        else:
+            if op["type"] == OP_CREATE_ORDER:
+                spot = spots[op["service_spot_id"]]
+                order_id = Order.create_order(
+                    op["service_spot_id"],
+                    spot["sales_area_id"],
+                    menu_id,
+                    user_id,
+                    cursor=cursor
+                )
+                orders[order_id] = Order.STATUS_OPEN
+                order_menus[order_id] = menu_id
+                created[key] = order_id
+
+            for item in items:
+                pending_items.append(OrderItem._item_row(
+                    order_id, item["product_id"], item["quantity"], item["unit_price"], item.get("notes")
+                ))
+            if op.get("items"):
+                touched_orders.add(order_id)
+            result = _result(key, RESULT_APPLIED, order_id, len(op.get("items", [])))
+
+        handled[key] = result
+        results.append(result)
+        new_keys.append((key, user_id, op["type"], result["status"], result["order_id"],
+                         result["items_added"], result["detail"]))
+
+    OrderItem.add_many(pending_items, cursor)
+    Order.recalculate_totals(sorted(touched_orders), cursor=cursor)
+
+    if new_keys:
+        cursor.executemany(
+            """
+            INSERT INTO IdempotencyKeys
+                (idempotency_key, user_id, operation, result_status, order_id, items_added, detail)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            new_keys
+        )
+
+    return results
+
+def submit_batch(operations: List[Dict[str, Any]], user_id: int) -> List[Dict[str, Any]]:
+    """
+    Apply a batch of queued order operations in one transaction.
+
+    Invalid operations are rejected individually (and remembered, so a
+    replay is rejected the same way) without blocking the rest of the batch.
+
+    Args:
+        operations: Operations as dicts (see OrderBatchOperation)
+        user_id: The user submitting the batch
+
+    Returns:
+        list: One result per operation, in request order
+
+    Raises:
+        RuntimeError: If the database is unavailable
+        pymysql.MySQLError: If the batch could not be applied
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with transaction() as cursor:
+                return _apply(cursor, operations, user_id)
+        except pymysql.MySQLError as e:
+            if e.args and e.args[0] in RETRYABLE_ERRORS and attempt < MAX_ATTEMPTS:
+                logger.warning(f"Retrying order batch after concurrent replay (attempt {attempt}): {e}")
+                continue
+            raise
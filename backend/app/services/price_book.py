@@ -0,0 +1,144 @@
+"""
+Server-side prices of order items.
+
+Keeps, per menu, the price and availability of each product on it (the
+MenuItems row, unavailable when either the menu item or the product is), so
+the order item write paths set unit_price and total_price from the order's
+menu instead of trusting the client, without loading the menu per item: a
+menu is loaded with one query on first use and then priced from memory.
+
+Every use checks the TableVersions counters of the tables the prices come
+from (one primary-key read), so a price change or an "86" made by any worker
+is seen by the next order. A product missing from a cached menu reloads it
+once (at most every MISS_RELOAD_INTERVAL seconds) before the item is
+rejected, and a failed load raises instead of caching an empty menu.
+"""
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import pymysql
+from app.db.db_connect import transaction
+from app.utils import http_cache
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TABLES = ("Menus", "MenuItems", "Products")
+MISS_RELOAD_INTERVAL = 1.0
+
+MENU_PRICES_QUERY = """
+    SELECT mi.product_id, mi.price, (mi.is_available AND p.is_available) AS is_available
+    FROM MenuItems mi
+    JOIN Products p ON p.id = mi.product_id
+    WHERE mi.menu_id = %s
+    ORDER BY mi.id ASC
+"""
+
+class PriceBookError(Exception):
+    """Raised when items are not on the order's menu or are unavailable."""
+
+    def __init__(self, message: str, product_ids: Sequence[int]):
+        super().__init__(message)
+        self.product_ids = sorted(set(product_ids))
+
+# menu_id -> (TableVersions fingerprint, loaded at, product_id -> (price, is_available))
+_menus: Dict[int, Tuple[str, float, Dict[int, Tuple[Decimal, bool]]]] = {}
+_lock = threading.Lock()
+
+def invalidate(menu_id: int = None):
+    """
+    Drop cached menu prices.
+
+    Args:
+        menu_id: Only drop this menu (all when omitted)
+    """
+    if menu_id is None:
+        _menus.clear()
+    else:
+        _menus.pop(menu_id, None)
+
+def _load(menu_id: int) -> Dict[int, Tuple[Decimal, bool]]:
+    try:
+        with transaction() as cursor:
+            cursor.execute(MENU_PRICES_QUERY, (menu_id,))
+            rows = cursor.fetchall()
+    except pymysql.MySQLError as e:
+        raise RuntimeError(f"Price book load failed for menu {menu_id}: {e}") from e
+    # A product listed twice keeps its last menu item, as the menu shows it
+    return {row['product_id']: (row['price'], bool(row['is_available'])) for row in rows}
+
+def get_menu_prices(menu_id: int, reload_after: Optional[float] = None) -> Dict[int, Tuple[Decimal, bool]]:
+    """
+    Get the prices of a menu, loading them if missing or stale.
+
+    Args:
+        menu_id: The menu ID
+        reload_after: Also reload an entry loaded more than this many
+            seconds ago, even if its tables did not change
+
+    Returns:
+        dict: product_id -> (price, is_available)
+
+    Raises:
+        RuntimeError: If the prices could not be loaded
+    """
+    fingerprint = http_cache.versions_fingerprint(SOURCE_TABLES)
+
+    def current(entry) -> bool:
+        return (
+            entry is not None
+            and fingerprint is not None
+            and entry[0] == fingerprint
+            and (reload_after is None or time.monotonic() - entry[1] < reload_after)
+        )
+
+    entry = _menus.get(menu_id)
+    if current(entry):
+        return entry[2]
+
+    with _lock:
+        entry = _menus.get(menu_id)
+        if current(entry):
+            return entry[2]
+        prices = _load(menu_id)
+        if fingerprint is not None:
+            # Without the counters a cached entry could never be validated
+            _menus[menu_id] = (fingerprint, time.monotonic(), prices)
+        logger.info(f"Price book loaded for menu {menu_id} with {len(prices)} products")
+        return prices
+
+def price_items(menu_id: int, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Set unit_price on order items from the order's menu.
+
+    Args:
+        menu_id: The order's menu ID
+        items: Items with product_id and quantity (a client unit_price is ignored)
+
+    Returns:
+        list: Copies of the items with unit_price set
+
+    Raises:
+        PriceBookError: If a product is not on the menu or is unavailable
+        RuntimeError: If the menu prices could not be loaded
+    """
+    prices = get_menu_prices(menu_id)
+    if any(item['product_id'] not in prices for item in items):
+        # Reload once before rejecting, in case the menu just changed
+        prices = get_menu_prices(menu_id, reload_after=MISS_RELOAD_INTERVAL)
+
+    missing = [item['product_id'] for item in items if item['product_id'] not in prices]
+    if missing:
+        raise PriceBookError(
+            f"Productos fuera de la carta de la orden: {', '.join(str(p) for p in sorted(set(missing)))}",
+            missing
+        )
+    unavailable = [item['product_id'] for item in items if not prices[item['product_id']][1]]
+    if unavailable:
+        raise PriceBookError(
+            f"Productos no disponibles: {', '.join(str(p) for p in sorted(set(unavailable)))}",
+            unavailable
+        )
+
+    return [dict(item, unit_price=prices[item['product_id']][0]) for item in items]
@@ -0,0 +1,183 @@
+"""
+Service spot status maintenance.
+
+A spot's status is derived from its orders:
+
+    active order (abierta, en_preparación, servida)  -> pedido_abierto
+    manual status (ocupado, reservado)               -> kept
+    order paid today                                 -> cobrado
+    otherwise                                        -> libre
+
+Opening an order moves the spot to pedido_abierto directly; closing or
+deleting one recomputes that spot's status from its orders, inside the
+transaction that changed the order, so the spot commits or rolls back with it
+and orders handled by other workers are always taken into account.
+
+recompute() replaces the per-event update_spot_status stored procedure: one
+UPDATE ... JOIN (SELECT ... GROUP BY service_spot_id) for a set of spots, an
+area or every spot. It runs on order events, at startup and on
+reconciliation.
+
+These derived status changes don't bump the spot's row version (migration
+16), so they never turn an admin's If-Match edit of the spot into a 409.
+"""
+import logging
+from typing import Iterable, Optional
+from app.db.db_connect import transaction
+from app.models.service_spot import ServiceSpot
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_ORDER_STATUSES = ('abierta', 'en_preparación', 'servida')
+PAID_ORDER_STATUS = 'cobrada'
+MANUAL_STATUSES = (ServiceSpot.STATUS_OCCUPIED, ServiceSpot.STATUS_RESERVED)
+
+_ACTIVE_SQL = ", ".join(f"'{status}'" for status in ACTIVE_ORDER_STATUSES)
+_MANUAL_SQL = ", ".join(f"'{status}'" for status in MANUAL_STATUSES)
+
+# Derived status of a spot joined with its order counters (alias o)
+_DERIVED_STATUS = f"""
+    CASE
+        WHEN COALESCE(o.active_orders, 0) > 0 THEN '{ServiceSpot.STATUS_ORDER_OPEN}'
+        WHEN ss.status IN ({_MANUAL_SQL}) THEN ss.status
+        WHEN COALESCE(o.paid_today, 0) > 0 THEN '{ServiceSpot.STATUS_PAID}'
+        ELSE '{ServiceSpot.STATUS_FREE}'
+    END
+"""
+
+# closed_at is compared as a half-open range so idx_orders_spot_status_closed applies
+_RECOMPUTE_SQL = f"""
+    UPDATE ServiceSpots ss
+    LEFT JOIN (
+        SELECT
+            service_spot_id,
+            SUM(status IN ({_ACTIVE_SQL})) AS active_orders,
+            SUM(status = '{PAID_ORDER_STATUS}') AS paid_today
+        FROM Orders
+        WHERE {{orders_scope}}
+        AND (
+            status IN ({_ACTIVE_SQL})
+            OR (
+                status = '{PAID_ORDER_STATUS}'
+                AND closed_at >= CURRENT_DATE()
+                AND closed_at < CURRENT_DATE() + INTERVAL 1 DAY
+            )
+        )
+        GROUP BY service_spot_id
+    ) o ON o.service_spot_id = ss.id
+    SET ss.status = {_DERIVED_STATUS}
+    WHERE {{spots_scope}}
+    AND ss.status <> {_DERIVED_STATUS}
+"""
+
+def _execute_derived(cursor, query: str, params) -> int:
+    """Run a derived status update without bumping the spots' row versions."""
+    cursor.execute("SET @vesta_derived_status = 1")
+    try:
+        return cursor.execute(query, params)
+    finally:
+        cursor.execute("SET @vesta_derived_status = NULL")
+
+def _scoped_query(spot_ids: Optional[Iterable[int]], sales_area_id: Optional[int]):
+    if spot_ids is not None:
+        spot_ids = list(spot_ids)
+        placeholders = ", ".join(["%s"] * len(spot_ids))
+        query = _RECOMPUTE_SQL.format(
+            orders_scope=f"service_spot_id IN ({placeholders})",
+            spots_scope=f"ss.id IN ({placeholders})"
+        )
+        return query, tuple(spot_ids) * 2
+    if sales_area_id is not None:
+        query = _RECOMPUTE_SQL.format(
+            orders_scope="sales_area_id = %s",
+            spots_scope="ss.sales_area_id = %s"
+        )
+        return query, (sales_area_id, sales_area_id)
+    return _RECOMPUTE_SQL.format(orders_scope="TRUE", spots_scope="TRUE"), ()
+
+def recompute(spot_ids: Optional[Iterable[int]] = None,
+              sales_area_id: Optional[int] = None,
+              cursor=None) -> int:
+    """
+    Recompute the derived status of many spots with one statement.
+
+    Args:
+        spot_ids: Spots to recompute
+        sales_area_id: Recompute every spot of this area (if spot_ids is None)
+        cursor: Optional cursor of an open transaction
+        All spots are recomputed when neither spot_ids nor sales_area_id is given.
+
+    Returns:
+        int: Number of spots whose status changed
+    """
+    if spot_ids is not None and not spot_ids:
+        return 0
+
+    query, params = _scoped_query(spot_ids, sales_area_id)
+    if cursor is not None:
+        return _execute_derived(cursor, query, params)
+    with transaction() as own_cursor:
+        return _execute_derived(own_cursor, query, params)
+
+def initialize():
+    """Reconcile every spot; run at startup."""
+    try:
+        changed = recompute()
+        logger.info(f"Service spot statuses reconciled ({changed} changed)")
+    except Exception as e:
+        logger.error(f"Error initializing service spot statuses: {e}")
+
+def reconcile(sales_area_id: Optional[int] = None) -> int:
+    """
+    Recompute statuses from the orders.
+
+    Args:
+        sales_area_id: Optional area to limit the recomputation to
+
+    Returns:
+        int: Number of spots whose status changed
+    """
+    return recompute(sales_area_id=sales_area_id)
+
+def order_opened(spot_id: int, cursor=None):
+    """
+    Register an order becoming active on a spot.
+
+    Args:
+        spot_id: The service spot ID
+        cursor: Cursor of the transaction that changed the order, if any
+    """
+    query = "UPDATE ServiceSpots SET status = %s WHERE id = %s AND status <> %s"
+    params = (ServiceSpot.STATUS_ORDER_OPEN, spot_id, ServiceSpot.STATUS_ORDER_OPEN)
+    if cursor is not None:
+        _execute_derived(cursor, query, params)
+        return
+    with transaction() as own_cursor:
+        _execute_derived(own_cursor, query, params)
+
+def order_closed(spot_id: int, cursor=None):
+    """
+    Register an order leaving the active statuses (paid, canceled or deleted).
+
+    The spot keeps pedido_abierto only if it still has active orders in the
+    database, whichever worker created them.
+
+    Args:
+        spot_id: The service spot ID
+        cursor: Cursor of the transaction that changed the order, if any
+    """
+    recompute(spot_ids=[spot_id], cursor=cursor)
+
+def order_status_changed(spot_id: int, new_status: str, cursor):
+    """
+    Apply an order status change to its spot.
+
+    Args:
+        spot_id: The service spot ID
+        new_status: The order's new status
+        cursor: Cursor of the transaction that changed the order
+    """
+    if new_status in ACTIVE_ORDER_STATUSES:
+        order_opened(spot_id, cursor)
+    else:
+        order_closed(spot_id, cursor)
@@ -0,0 +1,216 @@
+"""
+Delta sync service for offline-capable tablets.
+
+A sync token encodes a database time watermark. Changed rows are found
+through `updated_at` (indexed), deleted rows through the `deleted_at` of the
+SyncTombstones table filled by delete triggers (including the children a
+foreign key cascade removes), so steady-state polling returns only what
+changed.
+
+`updated_at` and `deleted_at` are statement times, not commit times: a row
+written before a sync but committed after it carries an older time than the
+sync. The next watermark is therefore the start of the oldest transaction
+still open when the sync is taken (read from information_schema.INNODB_TRX),
+since every row that sync could not see was written by one of those
+transactions or a later one. Without the PROCESS privilege needed to read
+INNODB_TRX, the watermark falls back to UNTRACKED_WINDOW before the sync.
+Clients apply rows as upserts by id, so the re-sent overlap is harmless.
+
+Every read of a sync runs in one transaction and a failed read raises, so a
+token is never advanced past changes that were not returned.
+"""
+import base64
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import pymysql
+from app.db.db_connect import transaction
+from app.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = "v2"
+# v1 tokens carried a tombstone id, now ignored; their time is still valid
+LEGACY_TOKEN_VERSIONS = ("v1",)
+# Slack for the one-second resolution of TIMESTAMP columns
+SAFETY_WINDOW = timedelta(seconds=2)
+# Watermark margin when open transactions can't be inspected; longer than any
+# transaction of the application
+UNTRACKED_WINDOW = timedelta(minutes=5)
+# Tokens older than this fall back to a full sync; tombstones are purged after it
+TOMBSTONE_RETENTION = timedelta(days=7)
+PURGE_INTERVAL_SECONDS = 3600
+
+# Resource name -> (table name, delta query, initial query)
+SYNC_RESOURCES = {
+    "orders": (
+        "Orders",
+        "SELECT * FROM Orders WHERE updated_at >= %s",
+        """
+        SELECT * FROM Orders
+        WHERE status IN ('abierta', 'en_preparación', 'servida')
+        OR created_at >= CURRENT_DATE()
+        """,
+    ),
+    "order_items": (
+        "OrderItems",
+        "SELECT * FROM OrderItems WHERE updated_at >= %s",
+        """
+        SELECT oi.* FROM OrderItems oi
+        JOIN Orders o ON oi.order_id = o.id
+        WHERE o.status IN ('abierta', 'en_preparación', 'servida')
+        OR o.created_at >= CURRENT_DATE()
+        """,
+    ),
+    "service_spots": (
+        "ServiceSpots",
+        "SELECT * FROM ServiceSpots WHERE updated_at >= %s",
+        "SELECT * FROM ServiceSpots",
+    ),
+    "products": (
+        "Products",
+        "SELECT * FROM Products WHERE updated_at >= %s",
+        "SELECT * FROM Products",
+    ),
+    "menu_items": (
+        "MenuItems",
+        "SELECT * FROM MenuItems WHERE updated_at >= %s",
+        """
+        SELECT mi.* FROM MenuItems mi
+        JOIN Menus m ON mi.menu_id = m.id
+        WHERE m.valid_date >= CURRENT_DATE()
+        """,
+    ),
+}
+
+OPEN_TRANSACTIONS_QUERY = "SELECT MIN(trx_started) AS oldest FROM information_schema.INNODB_TRX"
+
+# MySQL error raised when INNODB_TRX is read without the PROCESS privilege
+ER_SPECIFIC_ACCESS_DENIED = 1227
+
+_TABLE_TO_RESOURCE = {table: resource for resource, (table, _, _) in SYNC_RESOURCES.items()}
+_last_purge = 0.0
+_untracked_warned = False
+
+def encode_token(watermark: datetime) -> str:
+    """
+    Build an opaque sync token.
+
+    Args:
+        watermark: Database time from which the next sync must read changes
+
+    Returns:
+        str: URL-safe token
+    """
+    raw = f"{TOKEN_VERSION}|{watermark.strftime('%Y-%m-%dT%H:%M:%S')}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_token(token: str) -> datetime:
+    """
+    Parse a sync token.
+
+    Args:
+        token: Token returned by a previous sync
+
+    Returns:
+        datetime: The watermark to read changes from
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        if parts[0] not in (TOKEN_VERSION,) + LEGACY_TOKEN_VERSIONS:
+            raise ValueError(f"unsupported token version {parts[0]}")
+        return datetime.strptime(parts[1], "%Y-%m-%dT%H:%M:%S")
+    except Exception as e:
+        raise ValueError(f"Invalid sync token: {e}")
+
+def _watermark(cursor, now: datetime) -> datetime:
+    """Start of the oldest open transaction, capped at now."""
+    global _untracked_warned
+    try:
+        cursor.execute(OPEN_TRANSACTIONS_QUERY)
+    except pymysql.err.OperationalError as e:
+        if not e.args or e.args[0] != ER_SPECIFIC_ACCESS_DENIED:
+            raise
+        if not _untracked_warned:
+            _untracked_warned = True
+            logger.warning(
+                "Open transactions can't be read without the PROCESS privilege; "
+                f"sync tokens fall back to a {UNTRACKED_WINDOW} margin"
+            )
+        return now - UNTRACKED_WINDOW
+    oldest = cursor.fetchone()['oldest']
+    return min(now, oldest) if oldest else now
+
+def _purge_tombstones(now: datetime):
+    global _last_purge
+    if time.monotonic() - _last_purge < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = time.monotonic()
+    BaseModel.execute_custom_query(
+        "DELETE FROM SyncTombstones WHERE deleted_at < %s",
+        (now - TOMBSTONE_RETENTION,)
+    )
+
+def changes_since(token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Collect the rows created, updated or deleted since a sync token.
+
+    Without a token (or with one older than the tombstone retention) a full
+    snapshot is returned: catalog tables in full, plus active and today's
+    orders and the items of current menus.
+
+    Args:
+        token: Token from the previous sync, if any
+
+    Returns:
+        dict: {"full", "token", "changes": {resource: {"upserted", "deleted"}}}
+
+    Raises:
+        ValueError: If the token is malformed
+        RuntimeError: If the database is unavailable or a read failed
+    """
+    since = decode_token(token) if token else None
+
+    try:
+        with transaction() as cursor:
+            # The watermark is read before the first data read opens the
+            # snapshot, so anything the snapshot misses is after it
+            cursor.execute("SELECT NOW() AS now")
+            now = cursor.fetchone()['now']
+            watermark = _watermark(cursor, now)
+
+            full = since is None or now - since > TOMBSTONE_RETENTION
+            changes: Dict[str, Dict[str, List[Any]]] = {}
+
+            for resource, (_, delta_query, initial_query) in SYNC_RESOURCES.items():
+                if full:
+                    cursor.execute(initial_query)
+                else:
+                    cursor.execute(delta_query, (since - SAFETY_WINDOW,))
+                changes[resource] = {"upserted": list(cursor.fetchall()), "deleted": []}
+
+            if not full:
+                cursor.execute(
+                    "SELECT table_name, row_id FROM SyncTombstones WHERE deleted_at >= %s ORDER BY id",
+                    (since - SAFETY_WINDOW,)
+                )
+                for tombstone in cursor.fetchall():
+                    resource = _TABLE_TO_RESOURCE.get(tombstone['table_name'])
+                    if resource:
+                        changes[resource]["deleted"].append(tombstone['row_id'])
+    except pymysql.MySQLError as e:
+        logger.error(f"Error reading sync changes: {e}")
+        raise RuntimeError("Sync read failed") from e
+
+    _purge_tombstones(now)
+
+    return {
+        "full": full,
+        "token": encode_token(watermark),
+        "changes": changes,
+    }
@@ -7,8 +7,6 @@ from typing import Optional, Dict, Any
 from app.db.db_connect import get_connection
 from app.utils.security import verify_password
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
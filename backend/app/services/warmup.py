@@ -0,0 +1,43 @@
+"""
+Cache warmup for freshly started workers.
+
+Runs in each worker's startup event, before it accepts connections, so the
+first requests after a deploy or a graceful reload do not pay for loading the
+product search index, the menu resolver and the menu suggestion indexes of
+every active area.
+"""
+import logging
+import time
+from app.models.product import product_search_index
+from app.models.sales_area import SalesArea
+from app.services import menu_resolver, menu_suggest
+
+logger = logging.getLogger(__name__)
+
+def warm_caches():
+    """Load the catalog and menu caches; failures are logged, never raised."""
+    started = time.perf_counter()
+
+    try:
+        products = product_search_index.warm()
+    except Exception as e:
+        logger.error(f"Error warming product search index: {e}")
+        products = 0
+
+    try:
+        menu_resolver.warm()
+    except Exception as e:
+        logger.error(f"Error warming menu resolver: {e}")
+
+    areas = 0
+    try:
+        for area in SalesArea.get_active_areas():
+            menu_suggest.get_index(area['id'])
+            areas += 1
+    except Exception as e:
+        logger.error(f"Error warming menu suggestion indexes: {e}")
+
+    logger.info(
+        f"Caches warmed in {(time.perf_counter() - started) * 1000:.0f} ms "
+        f"({products} products, {areas} sales areas)"
+    )
@@ -0,0 +1,96 @@
+"""
+Application settings.
+
+Resolved once, on first use, from the process environment and the database
+env file (/app/.db.env in Docker, backend/.db.env locally); variables already
+set in the environment win over the file, as with load_dotenv. Importing this
+module (or any module that uses it) has no side effects: nothing is read,
+logged or configured until get_settings() or configure_logging() is called.
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCKER_ENV_FILE = "/app/.db.env"
+LOCAL_ENV_FILE = os.path.join(BACKEND_DIR, ".db.env")
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+class Settings(BaseModel):
+    """Typed application settings; field aliases are the environment variable names."""
+
+    is_docker: bool = False
+    env_file: Optional[str] = None
+
+    db_host: str = Field("localhost", alias="DB_HOST")
+    db_user: str = Field("vestasysuser", alias="MYSQL_USER")
+    db_password: str = Field("VestaSys2025", alias="MYSQL_PASSWORD")
+    db_name: str = Field("vestasys", alias="MYSQL_DATABASE")
+    db_port: int = Field(3306, alias="DB_PORT")
+    # Connections kept open per worker process (0 disables pooling)
+    db_pool_size: int = Field(0, alias="DB_POOL_SIZE")
+
+    analytics_data_dir: str = Field(
+        os.path.join(BACKEND_DIR, "data", "analytics"), alias="ANALYTICS_DATA_DIR"
+    )
+    log_level: str = Field("INFO", alias="LOG_LEVEL")
+
+    # JWT key ring sources (see app/utils/keyring.py)
+    jwt_keys_file: Optional[str] = Field(None, alias="JWT_KEYS_FILE")
+    jwt_keys: Optional[str] = Field(None, alias="JWT_KEYS")
+    jwt_secret_key: Optional[str] = Field(None, alias="JWT_SECRET_KEY")
+
+    def db_config(self) -> Dict[str, Any]:
+        """Connection arguments for pymysql.connect."""
+        return {
+            "host": self.db_host,
+            "user": self.db_user,
+            "password": self.db_password,
+            "database": self.db_name,
+            "port": self.db_port,
+        }
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    from dotenv import dotenv_values
+
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading them on the first call.
+
+    Returns:
+        Settings: The cached settings (call get_settings.cache_clear() to re-read)
+    """
+    is_docker = os.path.exists(DOCKER_ENV_FILE)
+    env_file = DOCKER_ENV_FILE if is_docker else LOCAL_ENV_FILE
+
+    values: Dict[str, Any] = _read_env_file(env_file) if os.path.exists(env_file) else {}
+    values.update(os.environ)
+    fields = {field.alias for field in Settings.model_fields.values() if field.alias}
+    values = {key: value for key, value in values.items() if key in fields}
+    if is_docker:
+        # The database service name in docker-compose
+        values.setdefault("DB_HOST", "db")
+
+    return Settings(is_docker=is_docker, env_file=env_file, **values)
+
+def configure_logging(level: Optional[str] = None):
+    """
+    Configure root logging for an entry point (the API startup, app.serve, CLI scripts).
+
+    Args:
+        level: Log level name (defaults to the LOG_LEVEL setting)
+    """
+    settings = get_settings()
+    logging.basicConfig(level=(level or settings.log_level).upper(), format=LOG_FORMAT)
+    logger.info(
+        f"Settings loaded ({'Docker' if settings.is_docker else 'local'} environment, {settings.env_file}): "
+        f"database={settings.db_name} at {settings.db_host}:{settings.db_port}"
+    )
@@ -7,8 +7,6 @@ from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 from app.utils.security import get_current_user
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def get_user_with_roles(allowed_roles: List[str] = None):
@@ -0,0 +1,303 @@
+"""
+Response compression middleware.
+
+Compresses JSON/text responses with brotli (when the `brotli` package is
+installed) or gzip, negotiated from Accept-Encoding. Small bodies and binary
+content types are passed through untouched.
+
+Compressed bodies of responses that carry an ETag are kept in a bounded LRU
+cache keyed by (path and query, ETag, encoding), so identical catalog payloads
+are compressed once instead of on every request. An ETag is only trusted for
+the URL that sent it, and a hit is only served when the length and CRC32 of
+the uncompressed body match the cached one. Streaming responses (no Content-Length,
+e.g. the orders export) are compressed chunk by chunk without buffering.
+"""
+import gzip
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Below this size the header overhead and CPU cost outweigh the savings
+DEFAULT_MINIMUM_SIZE = 1024
+# zlib level 5 and brotli quality 4 keep most of the ratio at a fraction of
+# the CPU of the maximum levels
+DEFAULT_GZIP_LEVEL = 5
+DEFAULT_BROTLI_QUALITY = 4
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# (path and query, ETag, encoding)
+CacheKey = Tuple[str, str, str]
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies bounded by entries and bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        # key -> (uncompressed length, uncompressed CRC32, compressed body)
+        self._entries: "OrderedDict[CacheKey, Tuple[int, int, bytes]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey, body: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != len(body) or entry[1] != zlib.crc32(body):
+                # Same tag, different body: the tag does not identify the payload
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key: CacheKey, body: bytes, compressed: bytes):
+        if len(compressed) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[2])
+            self._entries[key] = (len(body), zlib.crc32(body), compressed)
+            self._size += len(compressed)
+            while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[2])
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses."""
+
+    def __init__(self,
+                 app,
+                 minimum_size: int = DEFAULT_MINIMUM_SIZE,
+                 gzip_level: int = DEFAULT_GZIP_LEVEL,
+                 brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+                 content_types: Tuple[str, ...] = DEFAULT_CONTENT_TYPES,
+                 cache_entries: int = DEFAULT_CACHE_ENTRIES,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = content_types
+        self.cache = CompressedBodyCache(cache_entries, cache_max_bytes)
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        target = scope.get("path", "")
+        if scope.get("query_string"):
+            target += "?" + scope["query_string"].decode("latin-1")
+        responder = _CompressionResponder(
+            self, negotiate_encoding(accept_encoding, self.encodings), target, send
+        )
+        await self.app(scope, receive, responder.send)
+
+    def is_compressible(self, content_type: str) -> bool:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return any(
+            media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+            for allowed in self.content_types
+        )
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def stream_compressor(self, encoding: str):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.flush, compressor.finish
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return (
+            compressor.compress,
+            lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+            lambda: compressor.flush(zlib.Z_FINISH),
+        )
+
+def negotiate_encoding(accept_encoding: str, supported: Tuple[str, ...]) -> Optional[str]:
+    """
+    Pick the preferred supported encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: The header value
+        supported: Supported encodings, in server preference order
+
+    Returns:
+        str: The encoding to use, or None for identity
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+
+    best = None
+    best_weight = 0.0
+    for encoding in supported:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+class _CompressionResponder:
+    """Per-request send wrapper deciding whether and how to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], target: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.target = target
+        self.downstream = send
+        self.start_message = None
+        self.compressible = False
+        self.streaming = None
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = {name.lower(): value for name, value in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            self.compressible = (
+                self.middleware.is_compressible(content_type)
+                and message["status"] not in (204, 304)
+                and b"content-encoding" not in headers
+                and b"no-transform" not in headers.get(b"cache-control", b"")
+            )
+            if self.compressible or message["status"] == 304:
+                # 304s must carry the same Vary as the 200 they validate
+                _add_vary(message)
+            if not self.compressible or self.encoding is None:
+                await self.downstream(message)
+                self.start_message = False
+            else:
+                # Held until the first body chunk tells us the size
+                self.start_message = message
+            return
+
+        if message_type != "http.response.body" or self.start_message is False:
+            await self.downstream(message)
+            return
+
+        if self.streaming is not None:
+            await self._send_stream_chunk(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if more_body:
+            await self._start_stream(message)
+            return
+
+        start = self.start_message
+        self.start_message = False
+
+        if len(body) < self.middleware.minimum_size:
+            await self.downstream(start)
+            await self.downstream(message)
+            return
+
+        headers = start["headers"]
+        etag = _get_header(headers, b"etag")
+        cache_key = None
+        if etag and not etag.startswith(b"W/"):
+            cache_key = (self.target, etag.decode("latin-1"), self.encoding)
+
+        compressed = self.middleware.cache.get(cache_key, body) if cache_key else None
+        if compressed is None:
+            compressed = self.middleware.compress(body, self.encoding)
+            if cache_key:
+                self.middleware.cache.put(cache_key, body, compressed)
+
+        if len(compressed) >= len(body):
+            await self.downstream(start)
+            await self.downstream(message)
+            return
+
+        _set_encoded_headers(start, self.encoding, len(compressed))
+        await self.downstream(start)
+        await self.downstream({"type": "http.response.body", "body": compressed})
+
+    async def _start_stream(self, message):
+        start = self.start_message
+        self.start_message = None
+        _set_encoded_headers(start, self.encoding, None)
+        self.streaming = self.middleware.stream_compressor(self.encoding)
+        await self.downstream(start)
+        await self._send_stream_chunk(message)
+
+    async def _send_stream_chunk(self, message):
+        process, flush, finish = self.streaming
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        # Flushing each chunk keeps streamed rows flowing to the client
+        data = process(body) + (flush() if more_body else finish())
+        await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+def _get_header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+def _add_vary(message):
+    headers = list(message.get("headers", []))
+    for index, (key, value) in enumerate(headers):
+        if key.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[index] = (key, value + b", Accept-Encoding")
+            break
+    else:
+        headers.append((b"vary", b"Accept-Encoding"))
+    message["headers"] = headers
+
+def _set_encoded_headers(message, encoding: str, length: Optional[int]):
+    headers = []
+    for key, value in message["headers"]:
+        key_lower = key.lower()
+        if key_lower == b"content-length":
+            continue
+        if key_lower == b"etag" and not value.startswith(b"W/"):
+            # The encoded representation is no longer byte-identical
+            value = b"W/" + value
+        headers.append((key, value))
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    if length is not None:
+        headers.append((b"content-length", str(length).encode("latin-1")))
+    message["headers"] = headers
@@ -0,0 +1,202 @@
+"""
+Conditional request helpers.
+
+Builds strong ETags from the TableVersions counters of the tables a response
+is read from, so `If-None-Match` can be answered with 304 after a single
+primary-key lookup instead of running the queries behind the payload.
+
+Rows with a `version` column (Orders, ServiceSpots) are exposed with a
+per-row ETag naming the resource, id and version, which clients send back in
+`If-Match` to make writes conditional.
+"""
+import hashlib
+import logging
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Sequence
+from fastapi import HTTPException, Request, Response, status
+from app.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Cache-Control presets. Authenticated payloads stay private; every preset
+# still revalidates cheaply through the ETag once max-age is over.
+CACHE_CATALOG = "private, max-age=300"
+CACHE_MENUS = "private, max-age=60"
+CACHE_LIVE = "private, no-cache"
+
+def get_versions(tables: Sequence[str]) -> Dict[str, dict]:
+    """
+    Read the version counters of the given tables.
+    
+    High-write tables keep their counter in several shard rows (migration
+    13), so a table's version is the sum of its rows.
+    
+    Args:
+        tables: Table names
+        
+    Returns:
+        dict: table_name -> {"version", "updated_at"}; empty if unavailable
+    """
+    placeholders = ", ".join(["%s"] * len(tables))
+    rows = BaseModel.execute_custom_query(
+        f"""
+        SELECT table_name, CAST(SUM(version) AS UNSIGNED) AS version, MAX(updated_at) AS updated_at
+        FROM TableVersions
+        WHERE table_name IN ({placeholders})
+        GROUP BY table_name
+        """,
+        tuple(tables)
+    )
+    return {row['table_name']: row for row in rows}
+
+def versions_fingerprint(tables: Sequence[str], versions: Optional[Dict[str, dict]] = None) -> Optional[str]:
+    """
+    Fingerprint the version counters of the given tables.
+    
+    Args:
+        tables: Table names
+        versions: Counters already read with get_versions (read here if omitted)
+        
+    Returns:
+        str: A value that changes with any write to the tables, or None if
+            a counter could not be read
+    """
+    if versions is None:
+        versions = get_versions(tables)
+    if any(table not in versions for table in tables):
+        return None
+    return ";".join(f"{table}={versions[table]['version']}" for table in tables)
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return etag in candidates or f"W/{etag}" in candidates
+
+def check_not_modified(request: Request,
+                       response: Response,
+                       tables: Sequence[str],
+                       cache_control: str) -> Optional[Response]:
+    """
+    Set ETag, Last-Modified and Cache-Control and answer conditional requests.
+    
+    The ETag covers the table versions and the query string, so different
+    filters of the same endpoint get different tags.
+    
+    Args:
+        request: The incoming request
+        response: The response whose headers are set
+        tables: Tables the payload is read from
+        cache_control: Cache-Control value for this resource
+        
+    Returns:
+        Response: A 304 response if the client copy is current, otherwise None
+    """
+    versions = get_versions(tables)
+    fingerprint = versions_fingerprint(tables, versions)
+    if fingerprint is None:
+        # Without every counter the payload can't be fingerprinted safely
+        return None
+    
+    etag = '"' + hashlib.sha1(f"{request.url.path}?{request.url.query}|{fingerprint}".encode()).hexdigest()[:24] + '"'
+    
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    modified = [row['updated_at'] for row in versions.values() if row.get('updated_at')]
+    last_modified = max(modified) if modified else None
+    if last_modified:
+        # TIMESTAMP columns come back in the session time zone, UTC on the server
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    not_modified = False
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    elif if_modified_since and last_modified:
+        # Only consulted without If-None-Match; second resolution
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            not_modified = last_modified.replace(microsecond=0) <= since
+        except (TypeError, ValueError):
+            not_modified = False
+    
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+def row_etag(resource: str, row_id: int, version: int) -> str:
+    """
+    Build the ETag of a versioned row.
+
+    The tag names the row, so rows of any table at the same version never
+    share one.
+
+    Args:
+        resource: Resource name, e.g. "orders"
+        row_id: The row's primary key
+        version: The row's version column
+
+    Returns:
+        str: Quoted entity tag, e.g. "orders-12-v3"
+    """
+    return f'"{resource}-{row_id}-v{version}"'
+
+def parse_if_match(request: Request, resource: str, row_id: int) -> Optional[int]:
+    """
+    Read the row version expected by a conditional write.
+
+    Args:
+        request: The incoming request
+        resource: Resource name the tag must carry
+        row_id: Primary key of the row being written
+
+    Returns:
+        int: The version from `If-Match`, or None if absent or `*`
+
+    Raises:
+        HTTPException: 400 if the header is not this row's ETag
+    """
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+
+    # A single version is meaningful; weak tags are accepted as sent by some proxies
+    tag = header.split(",", 1)[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+
+    prefix = f"{resource}-{row_id}-v"
+    # Bare versions are the tags issued before they named the row; the URL
+    # already identifies the row for a write
+    value = tag[len(prefix):] if tag.startswith(prefix) else tag
+    if not value.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Encabezado If-Match inválido para este registro"
+        )
+    return int(value)
+
+def version_conflict(resource: str, row_id: int, current_version: int) -> HTTPException:
+    """
+    Build the 409 answer to a conditional write that lost a race.
+
+    Args:
+        resource: Resource name of the row
+        row_id: The row's primary key
+        current_version: The row's version in the database
+
+    Returns:
+        HTTPException: 409 carrying the current ETag
+    """
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="El registro fue modificado por otro usuario. Recárguelo e intente de nuevo.",
+        headers={"ETag": row_etag(resource, row_id, current_version)}
+    )
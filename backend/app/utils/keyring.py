@@ -0,0 +1,318 @@
+"""
+Shared JWT signing keys.
+
+Every worker and replica must sign and verify with the same secrets, so keys
+are read from a key ring instead of being generated per process. Sources, in
+order of precedence:
+
+    JWT_KEYS_FILE   path to a JSON key ring (reloaded when the file changes)
+    JWT_KEYS        the same JSON inline, for orchestrators that inject env vars
+    JWT_SECRET_KEY  a single legacy secret (kid "default")
+
+Key ring format (a list, or {"keys": [...]}):
+
+    [
+        {"kid": "2025-01", "secret": "...", "expires_at": "2025-02-01T00:30:00+00:00"},
+        {"kid": "2025-02", "secret": "...", "not_before": "2025-02-01T00:00:00+00:00"}
+    ]
+
+Tokens are signed with the newest key whose `not_before` has passed and carry
+its id in the `kid` header; any key of the ring that has not reached
+`expires_at` verifies tokens. Rotating is therefore adding the next key with a
+`not_before` a bit in the future (so every worker has loaded it before anyone
+signs with it) and giving the previous one an `expires_at` past the lifetime
+of the tokens it signed; see rotate_jwt_keys.py.
+
+When nothing is configured a key ring is generated once in DEFAULT_KEYRING_FILE
+(created exclusively, so concurrent workers on the same host share it). That
+covers `uvicorn --workers N`; several hosts need a shared file or JWT_KEYS.
+"""
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+KEYRING_FILE_ENV = "JWT_KEYS_FILE"
+KEYRING_ENV = "JWT_KEYS"
+LEGACY_SECRET_ENV = "JWT_SECRET_KEY"
+LEGACY_KID = "default"
+
+DEFAULT_KEYRING_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".jwt_keys.json"
+)
+
+# Seconds between checks of the key ring file for changes
+RELOAD_INTERVAL_SECONDS = 30.0
+# Minimum seconds between forced reloads triggered by an unknown kid
+UNKNOWN_KID_RELOAD_SECONDS = 1.0
+
+class KeyRingError(Exception):
+    """Raised when the key ring cannot be loaded or has no usable key."""
+
+def _timestamp(value: Any, field: str) -> Optional[float]:
+    """Parse an ISO 8601 date-time or Unix seconds into Unix seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise KeyRingError(f"Invalid {field} in key ring: {value!r}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+class SigningKey:
+    """A parsed key ring entry."""
+
+    __slots__ = ("kid", "secret", "not_before", "expires_at")
+
+    def __init__(self, kid: str, secret: str,
+                 not_before: Optional[float] = None,
+                 expires_at: Optional[float] = None):
+        self.kid = kid
+        self.secret = secret
+        self.not_before = not_before
+        self.expires_at = expires_at
+
+    def can_sign(self, now: float) -> bool:
+        return (self.not_before is None or self.not_before <= now) and self.can_verify(now)
+
+    def can_verify(self, now: float) -> bool:
+        return self.expires_at is None or now < self.expires_at
+
+def parse_keys(document: Any) -> List[SigningKey]:
+    """
+    Parse a key ring document.
+
+    Args:
+        document: Decoded JSON (a list of entries or {"keys": [...]})
+
+    Returns:
+        list: The keys, in document order
+
+    Raises:
+        KeyRingError: If an entry is malformed or a kid is repeated
+    """
+    entries = document.get("keys") if isinstance(document, dict) else document
+    if not isinstance(entries, list):
+        raise KeyRingError("Key ring must be a list of keys or an object with a 'keys' list")
+
+    keys = []
+    seen = set()
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("kid") or not entry.get("secret"):
+            raise KeyRingError("Every key ring entry needs a 'kid' and a 'secret'")
+        kid = str(entry["kid"])
+        if kid in seen:
+            raise KeyRingError(f"Duplicate kid in key ring: {kid!r}")
+        seen.add(kid)
+        keys.append(SigningKey(
+            kid,
+            str(entry["secret"]),
+            _timestamp(entry.get("not_before"), "not_before"),
+            _timestamp(entry.get("expires_at"), "expires_at")
+        ))
+    return keys
+
+def read_keyring_file(path: str) -> List[SigningKey]:
+    """
+    Read and parse a key ring file.
+
+    Args:
+        path: The JSON file
+
+    Returns:
+        list: The keys
+
+    Raises:
+        KeyRingError: If the file cannot be read or parsed
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_keys(json.load(f))
+    except (OSError, ValueError) as e:
+        raise KeyRingError(f"Cannot read key ring {path}: {e}")
+
+def write_keyring_file(path: str, entries: List[Dict[str, Any]]):
+    """
+    Atomically replace a key ring file (readable by its owner only).
+
+    Args:
+        path: The JSON file
+        entries: Raw key ring entries
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".jwt_keys.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"keys": entries}, f, indent=2)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def new_secret() -> str:
+    """Generate a random secret suitable for HS256."""
+    return secrets.token_urlsafe(48)
+
+def _create_default_keyring(path: str):
+    """Create a single-key ring unless another worker already did."""
+    entry = {"kid": datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S"), "secret": new_secret()}
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=".jwt_keys.", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"keys": [entry]}, f, indent=2)
+        # link() fails if the file exists, so the first worker wins and the
+        # others never see a partially written ring
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            return
+        finally:
+            os.unlink(tmp_path)
+    except OSError as e:
+        logger.error(f"Cannot create JWT key ring {path}: {e}")
+        return
+    logger.warning(
+        f"No JWT keys configured; generated a key ring in {path}. "
+        f"Set {KEYRING_FILE_ENV} or {KEYRING_ENV} to share keys between hosts."
+    )
+
+class KeyRing:
+    """Process-wide cache of the parsed signing keys."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[str, SigningKey] = {}
+        self._ordered: List[SigningKey] = []
+        self._path: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._loaded = False
+
+    def _configure(self):
+        """Pick the key source; env keys are parsed once, files are watched."""
+        settings = get_settings()
+        path = settings.jwt_keys_file
+        if path:
+            self._path = path
+            return
+        inline = settings.jwt_keys
+        if inline:
+            try:
+                self._set_keys(parse_keys(json.loads(inline)))
+            except ValueError as e:
+                raise KeyRingError(f"Invalid {KEYRING_ENV}: {e}")
+            return
+        legacy = settings.jwt_secret_key
+        if legacy:
+            self._set_keys([SigningKey(LEGACY_KID, legacy)])
+            return
+        _create_default_keyring(DEFAULT_KEYRING_FILE)
+        self._path = DEFAULT_KEYRING_FILE
+
+    def _set_keys(self, keys: List[SigningKey]):
+        if not keys:
+            raise KeyRingError("Key ring is empty")
+        self._ordered = keys
+        self._keys = {key.kid: key for key in keys}
+
+    def _refresh(self, force: bool = False):
+        """Load the ring on first use and reload the file when its mtime changes."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._loaded:
+                self._configure()
+                self._loaded = True
+            if self._path is None:
+                return
+            interval = UNKNOWN_KID_RELOAD_SECONDS if force else RELOAD_INTERVAL_SECONDS
+            if self._mtime is not None and now - self._checked_at < interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self._path).st_mtime
+            except OSError as e:
+                if self._mtime is None:
+                    raise KeyRingError(f"Cannot read key ring {self._path}: {e}")
+                # Keep serving the last good keys while the file is being replaced
+                logger.error(f"Cannot stat key ring {self._path}: {e}")
+                return
+            if mtime == self._mtime:
+                return
+            try:
+                self._set_keys(read_keyring_file(self._path))
+            except KeyRingError as e:
+                if self._mtime is None:
+                    raise
+                logger.error(f"Keeping previous JWT keys: {e}")
+                return
+            self._mtime = mtime
+            logger.info(f"Loaded {len(self._ordered)} JWT key(s) from {self._path}")
+
+    def signing_key(self) -> Tuple[str, str]:
+        """
+        Get the key new tokens are signed with.
+
+        Returns:
+            tuple: (kid, secret)
+
+        Raises:
+            KeyRingError: If no key is active
+        """
+        self._refresh()
+        now = time.time()
+        best = None
+        for key in self._ordered:
+            if key.can_sign(now) and (best is None or (key.not_before or 0) >= (best.not_before or 0)):
+                best = key
+        if best is None:
+            raise KeyRingError("No active JWT signing key")
+        return best.kid, best.secret
+
+    def verification_key(self, kid: Optional[str]) -> Optional[str]:
+        """
+        Get the secret that verifies a token's signature.
+
+        Args:
+            kid: The token's `kid` header; tokens without one use the legacy key
+
+        Returns:
+            str: The secret, or None if the kid is unknown or expired
+        """
+        kid = kid or LEGACY_KID
+        self._refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            # The key may have just been added by a rotation on another host
+            self._refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None or not key.can_verify(time.time()):
+            return None
+        return key.secret
+
+    def reset(self):
+        """Forget the cached keys so the next use reads the configuration again."""
+        with self._lock:
+            self._keys = {}
+            self._ordered = []
+            self._path = None
+            self._mtime = None
+            self._checked_at = 0.0
+            self._loaded = False
+
+keyring = KeyRing()
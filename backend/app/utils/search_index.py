@@ -0,0 +1,214 @@
+"""
+In-process inverted index for accent-insensitive prefix search.
+
+Used instead of `LIKE '%term%'` scans: the indexed rows are loaded once, the
+normalized tokens of each searchable field are mapped to the ids containing
+them, and queries resolve every term (as a whole word or as a word prefix)
+through a sorted token list with bisect.
+
+The index is rebuilt lazily. Writes made in this process call invalidate();
+writes made by other workers are picked up through a cheap fingerprint query
+(e.g. COUNT/MAX(updated_at)) checked at most every `fingerprint_ttl` seconds.
+"""
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Score multipliers for how a query term matched an indexed token
+EXACT_MATCH_BOOST = 2.0
+PREFIX_MATCH_BOOST = 1.0
+# Extra score when the whole normalized query starts the first field (name)
+LEADING_MATCH_BONUS = 4.0
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Lowercase and strip accents so "Café" and "cafe" (or "Piña" and "pina") match.
+
+    Args:
+        text: The text to normalize
+
+    Returns:
+        str: Normalized text
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into normalized alphanumeric tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        list: Tokens in order of appearance
+    """
+    return _TOKEN_RE.findall(normalize(text))
+
+class SearchIndex:
+    """Inverted index over a set of rows, keyed by row id."""
+
+    def __init__(self,
+                 loader: Callable[[], List[Dict[str, Any]]],
+                 fields: Dict[str, float],
+                 fingerprint: Optional[Callable[[], Any]] = None,
+                 fingerprint_ttl: float = 5.0):
+        """
+        Args:
+            loader: Returns every row to index; rows must have an 'id'
+            fields: Searchable fields and their weights; the first one is the
+                display name used for tie-breaking and the leading-match bonus
+            fingerprint: Returns a value that changes whenever the rows change
+            fingerprint_ttl: Seconds between fingerprint checks
+        """
+        self._loader = loader
+        self._fields = fields
+        self._name_field = next(iter(fields))
+        self._fingerprint = fingerprint
+        self._fingerprint_ttl = fingerprint_ttl
+        self._lock = threading.Lock()
+        self._state = None
+        self._checked_at = 0.0
+
+    def build(self, rows: Iterable[Dict[str, Any]], fingerprint: Any = None):
+        """
+        Replace the index contents with the given rows.
+
+        Args:
+            rows: Rows to index
+            fingerprint: Fingerprint of the data the rows were read from
+        """
+        docs = {}
+        postings: Dict[str, Dict[Any, float]] = {}
+        names = {}
+
+        for row in rows:
+            row_id = row['id']
+            docs[row_id] = row
+            names[row_id] = normalize(row.get(self._name_field))
+            for field, weight in self._fields.items():
+                for token in tokenize(row.get(field)):
+                    entry = postings.setdefault(token, {})
+                    entry[row_id] = entry.get(row_id, 0.0) + weight
+
+        # Swapped as a single reference so readers never see a partial index
+        self._state = (docs, postings, sorted(postings), names, fingerprint)
+
+    def invalidate(self):
+        """Drop the index so the next search rebuilds it."""
+        self._state = None
+
+    def warm(self) -> int:
+        """
+        Build the index now instead of on the first search.
+
+        Returns:
+            int: Number of indexed rows
+        """
+        return len(self._ensure_fresh()[0])
+
+    def _current_fingerprint(self):
+        try:
+            return self._fingerprint()
+        except Exception as e:
+            logger.error(f"Error reading search index fingerprint: {e}")
+            return None
+
+    def _ensure_fresh(self):
+        state = self._state
+        now = time.monotonic()
+
+        if state is not None:
+            if self._fingerprint is None or now - self._checked_at < self._fingerprint_ttl:
+                return state
+            self._checked_at = now
+            fingerprint = self._current_fingerprint()
+            if fingerprint is None or fingerprint == state[4]:
+                return state
+
+        with self._lock:
+            # Another thread may have rebuilt while we waited
+            if self._state is not None and self._state is not state:
+                return self._state
+            fingerprint = self._current_fingerprint() if self._fingerprint else None
+            started = time.perf_counter()
+            rows = self._loader()
+            self.build(rows, fingerprint)
+            self._checked_at = time.monotonic()
+            logger.info(f"Search index rebuilt with {len(rows)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+            return self._state
+
+    def _match_term(self, term: str, postings, tokens) -> Dict[Any, float]:
+        scores = {}
+        start = bisect_left(tokens, term)
+        for position in range(start, len(tokens)):
+            token = tokens[position]
+            if not token.startswith(term):
+                break
+            boost = EXACT_MATCH_BOOST if token == term else PREFIX_MATCH_BOOST
+            for row_id, weight in postings[token].items():
+                score = weight * boost
+                if score > scores.get(row_id, 0.0):
+                    scores[row_id] = score
+        return scores
+
+    def search(self,
+               query: str,
+               predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+               limit: Optional[int] = None,
+               offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Find the rows matching every term of the query, best match first.
+
+        Each term matches a whole token or a token prefix, so partially typed
+        words ("hambur") find their rows.
+
+        Args:
+            query: The search text
+            predicate: Optional filter applied to the matching rows
+            limit: Maximum number of rows to return
+            offset: Number of ranked rows to skip
+
+        Returns:
+            list: Matching rows
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        docs, postings, tokens, names, _ = self._ensure_fresh()
+
+        # Most selective terms first so the candidate set shrinks quickly
+        matches = sorted(
+            (self._match_term(term, postings, tokens) for term in set(terms)),
+            key=len
+        )
+        scores = dict(matches[0])
+        for other in matches[1:]:
+            if not scores:
+                break
+            scores = {row_id: score + other[row_id] for row_id, score in scores.items() if row_id in other}
+
+        leading = normalize(query).strip()
+        ranked: List[Tuple[float, str, Any]] = []
+        for row_id, score in scores.items():
+            if predicate is not None and not predicate(docs[row_id]):
+                continue
+            name = names[row_id]
+            if name.startswith(leading):
+                score += LEADING_MATCH_BONUS
+            ranked.append((-score, name, row_id))
+
+        ranked.sort()
+        end = None if limit is None else offset + limit
+        return [docs[row_id] for _, _, row_id in ranked[offset:end]]
@@ -4,12 +4,11 @@ This module provides functions for JWT token creation, verification, and passwor
 """
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-import os
-import secrets
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from app.utils.keyring import keyring
 
 # Password hashing configuration
 # This uses bcrypt for password hashing which is considered secure
@@ -19,8 +18,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 # JWT Configuration
-# In production, these should be loaded from environment variables or a secure vault
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_hex(32))  # Generate random key if not provided
+# Signing keys come from the shared key ring (see app/utils/keyring.py)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Token valid for 30 minutes
 
@@ -72,8 +70,9 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     
     to_encode.update({"exp": expire})
     
-    # Create the JWT token
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Create the JWT token, naming the key in the header so any worker can verify it
+    kid, secret = keyring.signing_key()
+    encoded_jwt = jwt.encode(to_encode, secret, algorithm=ALGORITHM, headers={"kid": kid})
     return encoded_jwt
 
 
@@ -97,8 +96,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any
     )
     
     try:
-        # Decode the JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Decode the JWT token with the key named in its header
+        secret = keyring.verification_key(jwt.get_unverified_header(token).get("kid"))
+        if secret is None:
+            raise credentials_exception
+        payload = jwt.decode(token, secret, algorithms=[ALGORITHM])
         
         # Extract user information
         username: str = payload.get("username")
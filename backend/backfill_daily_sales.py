@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the DailySales rollup from historical paid orders.
+
+Usage:
+    python backfill_daily_sales.py                          # all history
+    python backfill_daily_sales.py --from 2025-01-01 --to 2025-01-31
+"""
+import sys
+import argparse
+import logging
+from datetime import date
+from app.models.daily_sales import DailySales
+from app.settings import configure_logging
+
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Rebuild the DailySales rollup")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, default=None,
+                        help="First closing date to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, default=None,
+                        help="Last closing date to rebuild, inclusive (YYYY-MM-DD)")
+    args = parser.parse_args()
+    
+    logger.info(f"Backfilling DailySales from {args.from_date or 'the beginning'} to {args.to_date or 'today'}")
+    
+    written = DailySales.backfill(args.from_date, args.to_date)
+    
+    if written is None:
+        logger.error("Backfill failed")
+        sys.exit(1)
+        
+    logger.info(f"Backfill completed: {written} rollup rows written")
+    sys.exit(0)
@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for the Vesta backend.
+Run them from the backend directory, e.g. `python -m benchmarks.bench_orders_export`.
+Scripts that touch the database use the same configuration as the application.
+"""
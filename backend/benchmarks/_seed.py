@@ -0,0 +1,146 @@
+"""
+Helpers to seed a benchmark dataset into the configured database.
+Seeding uses bulk executemany() inserts with explicit ids so that millions of
+rows can be generated in minutes.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+BATCH_SIZE = 5000
+
+def _next_id(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 AS next_id FROM {table}")
+    return cursor.fetchone()["next_id"]
+
+def _insert_many(cursor, query: str, rows: List[tuple]):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(query, rows[start:start + BATCH_SIZE])
+
+def ensure_fixtures(conn, n_products: int = 200, n_spots: int = 20) -> Dict[str, Any]:
+    """
+    Create the reference rows orders depend on (establishment, user, area,
+    spots, category, products and a published menu).
+    
+    Returns:
+        dict: ids of the created rows
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT id FROM Users ORDER BY id LIMIT 1")
+        user_id = cursor.fetchone()["id"]
+        
+        cursor.execute(
+            "INSERT INTO Establishment (name, tax_rate, is_configured) VALUES (%s, %s, TRUE)",
+            ("Benchmark", 10)
+        )
+        establishment_id = cursor.lastrowid
+        
+        cursor.execute(
+            "INSERT INTO SalesAreas (establishment_id, name) VALUES (%s, %s)",
+            (establishment_id, "Bench Salon")
+        )
+        sales_area_id = cursor.lastrowid
+        
+        spot_ids = []
+        for i in range(n_spots):
+            cursor.execute(
+                "INSERT INTO ServiceSpots (sales_area_id, name) VALUES (%s, %s)",
+                (sales_area_id, f"Mesa {i + 1}")
+            )
+            spot_ids.append(cursor.lastrowid)
+        
+        cursor.execute(
+            "INSERT INTO ProductCategories (name) VALUES (%s)",
+            ("Bench",)
+        )
+        category_id = cursor.lastrowid
+        
+        first_product = _next_id(cursor, "Products")
+        product_ids = list(range(first_product, first_product + n_products))
+        _insert_many(
+            cursor,
+            "INSERT INTO Products (id, category_id, name, description, price) VALUES (%s, %s, %s, %s, %s)",
+            [
+                (pid, category_id, f"Producto {pid}", "Producto de prueba", round(random.uniform(50, 900), 2))
+                for pid in product_ids
+            ]
+        )
+        
+        cursor.execute(
+            "INSERT INTO Menus (name, valid_date, status, created_by) VALUES (%s, CURRENT_DATE(), 'publicada', %s)",
+            ("Bench", user_id)
+        )
+        menu_id = cursor.lastrowid
+        
+    conn.commit()
+    
+    return {
+        "user_id": user_id,
+        "sales_area_id": sales_area_id,
+        "spot_ids": spot_ids,
+        "category_id": category_id,
+        "product_ids": product_ids,
+        "menu_id": menu_id,
+    }
+
+def seed_closed_orders(conn,
+                       fixtures: Dict[str, Any],
+                       n_orders: int,
+                       items_per_order: int = 4,
+                       days: int = 30) -> int:
+    """
+    Insert paid orders with their items, closed over the last `days` days.
+    
+    Returns:
+        int: Number of OrderItems rows inserted
+    """
+    now = datetime.now()
+    with conn.cursor() as cursor:
+        first_order = _next_id(cursor, "Orders")
+        first_item = _next_id(cursor, "OrderItems")
+        
+    item_id = first_item
+    for start in range(0, n_orders, BATCH_SIZE):
+        orders = []
+        items = []
+        for order_id in range(first_order + start, first_order + min(start + BATCH_SIZE, n_orders)):
+            closed_at = now - timedelta(seconds=random.randint(0, days * 86400))
+            created_at = closed_at - timedelta(minutes=random.randint(5, 90))
+            subtotal = 0
+            for _ in range(items_per_order):
+                quantity = random.randint(1, 3)
+                unit_price = round(random.uniform(50, 900), 2)
+                subtotal += quantity * unit_price
+                items.append((
+                    item_id, order_id, random.choice(fixtures["product_ids"]),
+                    quantity, unit_price, round(quantity * unit_price, 2), "servido", created_at
+                ))
+                item_id += 1
+            orders.append((
+                order_id, random.choice(fixtures["spot_ids"]), fixtures["sales_area_id"],
+                fixtures["menu_id"], "cobrada", round(subtotal, 2), 0,
+                created_at, closed_at, fixtures["user_id"], fixtures["user_id"]
+            ))
+        
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO Orders (id, service_spot_id, sales_area_id, menu_id, status,
+                                    total_amount, tax_amount, created_at, closed_at,
+                                    created_by, closed_by)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                orders
+            )
+            _insert_many(
+                cursor,
+                """
+                INSERT INTO OrderItems (id, order_id, product_id, quantity, unit_price,
+                                        total_price, status, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                items
+            )
+        conn.commit()
+        
+    return item_id - first_item
@@ -0,0 +1,72 @@
+"""
+Cold import time of the API and the CLI entry points.
+
+Imports each module in a fresh interpreter with `python -X importtime`, which
+prints the self and cumulative microseconds of every module imported, and
+reports the median cumulative time of the module over several runs plus the
+slowest modules it pulled in. Worker boots (app.serve forks after importing
+app.main once) and every CLI script pay this cost.
+
+With --budget-ms the run fails (exit code 1) when a median exceeds the
+budget, so the check can run in CI.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --module app.main --runs 7 --top 15 --budget-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ("app.main", "app.db.migrate", "app.services.analytics_snapshot")
+
+def import_profile(module: str):
+    """Import a module in a fresh interpreter; returns {module: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time")
+    parser.add_argument("--module", action="append", help="Module to import (repeatable)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imported modules to list")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in args.module or DEFAULT_MODULES:
+        # The first run warms the bytecode cache and is discarded
+        import_profile(module)
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        totals = [profile[module][1] / 1000 for profile in profiles]
+        median = statistics.median(totals)
+        status = ""
+        if args.budget_ms is not None and median > args.budget_ms:
+            over_budget = True
+            status = f"  OVER BUDGET ({args.budget_ms:.0f} ms)"
+        print(f"{module}: median {median:.1f} ms, min {min(totals):.1f} ms over {args.runs} runs, "
+              f"{len(profiles[0])} modules{status}")
+
+        slowest = sorted(profiles[-1].items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, cumulative_us) in slowest:
+            print(f"    {self_us / 1000:>8.1f} ms self {cumulative_us / 1000:>8.1f} ms cumulative  {name}")
+
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Throughput and memory benchmark for the streaming orders export.
+
+Seeds paid orders into the configured database (optional) and streams them
+through the same encoders used by GET /api/v1/orders/export, reporting rows
+per second, bytes produced and peak RSS growth.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_orders_export --seed-rows 1000000
+    python -m benchmarks.bench_orders_export --format csv --compare-buffered
+"""
+import argparse
+import resource
+import time
+from datetime import date, timedelta
+
+from app.api.orders import _export_csv, _export_ndjson
+from app.db.db_connect import get_connection
+from app.models.order import Order
+from benchmarks._seed import ensure_fixtures, seed_closed_orders
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_streaming(fmt: str, from_date: date, to_date: date):
+    encoder = _export_csv if fmt == "csv" else _export_ndjson
+    rss_before = _max_rss_mb()
+    started = time.perf_counter()
+    
+    columns, rows = Order.stream_closed_with_items(from_date, to_date)
+    counted = []
+    
+    def counting(iterable):
+        n = 0
+        for row in iterable:
+            n += 1
+            yield row
+        counted.append(n)
+    
+    total_bytes = sum(len(chunk) for chunk in encoder(columns, counting(rows)))
+    elapsed = time.perf_counter() - started
+    n_rows = counted[0] if counted else 0
+    
+    print(f"[streaming/{fmt}] rows={n_rows} bytes={total_bytes} "
+          f"time={elapsed:.2f}s rate={n_rows / elapsed if elapsed else 0:,.0f} rows/s "
+          f"peak_rss_growth={_max_rss_mb() - rss_before:.1f} MB")
+
+def run_buffered(from_date: date, to_date: date):
+    """Baseline: fetch everything into dicts at once, as the list endpoint does."""
+    rss_before = _max_rss_mb()
+    started = time.perf_counter()
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT o.*, oi.id AS item_id, oi.product_id, oi.quantity,
+                       oi.unit_price, oi.total_price, oi.status AS item_status
+                FROM Orders o
+                LEFT JOIN OrderItems oi ON oi.order_id = o.id
+                WHERE o.status = 'cobrada' AND o.closed_at >= %s AND o.closed_at < %s
+                """,
+                (from_date, to_date + timedelta(days=1))
+            )
+            rows = cursor.fetchall()
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    print(f"[buffered] rows={len(rows)} time={elapsed:.2f}s "
+          f"peak_rss_growth={_max_rss_mb() - rss_before:.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-rows", type=int, default=0,
+                        help="OrderItems rows to seed before measuring (4 items per order)")
+    parser.add_argument("--days", type=int, default=30, help="Spread of closing dates when seeding")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--compare-buffered", action="store_true",
+                        help="Also run a fetchall() baseline (run it last, RSS only grows)")
+    args = parser.parse_args()
+    
+    if args.seed_rows:
+        conn = get_connection()
+        try:
+            fixtures = ensure_fixtures(conn)
+            started = time.perf_counter()
+            inserted = seed_closed_orders(conn, fixtures, n_orders=args.seed_rows // 4, days=args.days)
+            print(f"Seeded {inserted} order items in {time.perf_counter() - started:.1f}s")
+        finally:
+            conn.close()
+    
+    to_date = date.today()
+    from_date = to_date - timedelta(days=args.days)
+    run_streaming(args.format, from_date, to_date)
+    if args.compare_buffered:
+        run_buffered(from_date, to_date)
+
+if __name__ == "__main__":
+    main()
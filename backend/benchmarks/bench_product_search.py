@@ -0,0 +1,85 @@
+"""
+Benchmark for the product search index.
+
+Builds the in-process index over synthetic Spanish product names (no
+database needed) and compares query latency against a scan that emulates
+`name LIKE '%term%' OR description LIKE '%term%'`.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_product_search --products 50000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.models.product import Product
+from app.utils.search_index import SearchIndex, normalize
+
+DISHES = [
+    "Hamburguesa", "Pizza", "Café", "Jugo", "Ensalada", "Sándwich", "Pollo",
+    "Arroz", "Batido", "Cerveza", "Limonada", "Pastel", "Helado", "Piña colada",
+    "Tostón", "Croqueta", "Flan", "Mojito", "Té", "Espaguetis",
+]
+STYLES = [
+    "clásica", "de la casa", "con queso", "especial", "al ajillo", "criolla",
+    "frío", "caliente", "doble", "vegetariana", "con jamón", "de guayaba",
+]
+CATEGORIES = ["Bebidas", "Entrantes", "Platos fuertes", "Postres", "Cócteles"]
+QUERIES = ["piña", "hambur", "cafe con", "pollo ajillo", "helado guayaba", "sandw", "xyz"]
+
+def synthetic_products(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    products = []
+    for product_id in range(1, n + 1):
+        dish = rng.choice(DISHES)
+        style = rng.choice(STYLES)
+        products.append({
+            "id": product_id,
+            "name": f"{dish} {style} {product_id}",
+            "description": f"{dish} preparado {rng.choice(STYLES)}",
+            "category_name": rng.choice(CATEGORIES),
+            "is_available": rng.random() > 0.1,
+        })
+    return products
+
+def like_scan(products, query):
+    term = query.lower()
+    return [
+        p for p in products
+        if p["is_available"] and (term in p["name"].lower() or term in p["description"].lower())
+    ]
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the product search index")
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    products = synthetic_products(args.products)
+    index = SearchIndex(loader=lambda: products, fields=Product.SEARCH_FIELDS)
+    
+    started = time.perf_counter()
+    index.build(products)
+    print(f"products={args.products} build: {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    available = lambda p: p["is_available"]
+    print(f"{'query':<16}{'index ms':>10}{'hits':>8}{'scan ms':>10}{'hits':>8}")
+    for query in QUERIES:
+        index_ms, hits = timed(lambda: index.search(query, predicate=available, limit=20), args.repeat)
+        all_hits = index.search(query, predicate=available)
+        scan_ms, scanned = timed(lambda: like_scan(products, query), max(1, args.repeat // 4))
+        print(f"{query:<16}{index_ms:>10.2f}{len(all_hits):>8}{scan_ms:>10.2f}{len(scanned):>8}")
+        if hits:
+            print(f"  top: {hits[0]['name']} (normalized: {normalize(hits[0]['name'])})")
+
+if __name__ == "__main__":
+    main()
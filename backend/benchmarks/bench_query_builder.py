@@ -0,0 +1,78 @@
+"""
+Benchmark for the cached SQL builders.
+
+Measures the client-side cost of producing the SQL text and parameters for
+typical find_all/update shapes, against the per-call f-string building that
+BaseModel used before, and PyMySQL's own parameter escaping for reference
+(no database needed).
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_query_builder --calls 200000
+"""
+import argparse
+import time
+
+from pymysql.converters import escape_item
+
+from app.db import query_builder
+
+FILTERS = [
+    ("orders by spot", {"service_spot_id": 12, "status__in": ["abierta", "en_preparación", "servida"]}),
+    ("spots by area", {"sales_area_id": 3, "is_active": True}),
+    ("orders by day", {"created_at__gte": "2024-05-01", "created_at__lt": "2024-05-02"}),
+]
+SORTABLE = ("id", "name", "created_at")
+
+def legacy_select(table, where, order_by, limit):
+    query = f"SELECT * FROM {table}"
+    params = []
+    if where:
+        where_parts = []
+        for key, value in where.items():
+            where_parts.append(f"{key} = %s")
+            params.append(value)
+        query += " WHERE " + " AND ".join(where_parts)
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit)
+    return query, params
+
+def cached_select(table, where, order_by, limit):
+    shape, params = query_builder.build_where(where)
+    order = query_builder.parse_order_by(order_by, SORTABLE)
+    query = query_builder.compile_select(table, None, shape, order, bool(limit), False)
+    params.append(limit)
+    return query, params
+
+def per_call_us(fn, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cached SQL builders")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'shape':<16}{'legacy us':>11}{'cached us':>11}{'escape us':>11}")
+    for name, where in FILTERS:
+        legacy_us = per_call_us(lambda: legacy_select("Orders", where, "created_at DESC", 20), args.calls)
+        cached_us = per_call_us(lambda: cached_select("Orders", where, "created_at DESC", 20), args.calls)
+        _, params = cached_select("Orders", where, "created_at DESC", 20)
+        escape_us = per_call_us(lambda: [escape_item(p, "utf8mb4") for p in params], args.calls)
+        print(f"{name:<16}{legacy_us:>11.2f}{cached_us:>11.2f}{escape_us:>11.2f}")
+
+    data = {"name": "Mesa 4", "capacity": 4, "status": "libre", "is_active": True}
+    legacy_us = per_call_us(
+        lambda: "UPDATE ServiceSpots SET " + ", ".join(f"{key} = %s" for key in data) + " WHERE id = %s",
+        args.calls
+    )
+    cached_us = per_call_us(lambda: query_builder.compile_update("ServiceSpots", tuple(data), True), args.calls)
+    print(f"{'update':<16}{legacy_us:>11.2f}{cached_us:>11.2f}")
+    print(query_builder.cache_info())
+
+if __name__ == "__main__":
+    main()
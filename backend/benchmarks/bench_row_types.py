@@ -0,0 +1,82 @@
+"""
+Memory benchmark for result row representations.
+
+Builds synthetic OrderItems rows shaped like PyMySQL returns them (the value
+objects are created once and shared) and measures, with tracemalloc, what
+each representation adds on top of the values:
+
+    dict        what DictCursor builds (one dict per row)
+    namedtuple  row_type="tuple" (app.db.rows)
+    tuple       what the plain Cursor returns, for reference
+
+Build times are taken with tracemalloc running, so compare them only
+against each other.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_row_types --rows 1000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.db.rows import row_class
+
+COLUMNS = (
+    "id", "order_id", "product_id", "quantity", "unit_price", "total_price",
+    "notes", "status", "created_at", "updated_at",
+)
+STATUSES = ("pendiente", "en_preparación", "listo", "servido")
+
+def synthetic_values(n: int):
+    prices = [Decimal(f"{p}.50") for p in range(1, 40)]
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    values = []
+    for row_id in range(1, n + 1):
+        price = prices[row_id % len(prices)]
+        quantity = 1 + row_id % 4
+        created = base + timedelta(seconds=row_id * 7)
+        values.append((
+            row_id, 1 + row_id // 3, 1 + row_id % 500, quantity, price, price * quantity,
+            None if row_id % 5 else "sin hielo", STATUSES[row_id % 4], created, created,
+        ))
+    return values
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark row representations")
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    values = synthetic_values(args.rows)
+    Row = row_class(COLUMNS)
+
+    builders = [
+        ("dict", lambda: [dict(zip(COLUMNS, v)) for v in values]),
+        ("namedtuple", lambda: [Row._make(v) for v in values]),
+        ("tuple", lambda: [tuple(iter(v)) for v in values]),
+    ]
+
+    print(f"rows={args.rows} columns={len(COLUMNS)}")
+    print(f"{'representation':<16}{'MiB':>10}{'bytes/row':>12}{'build s':>10}")
+    for name, build in builders:
+        result, size, elapsed = measure(build)
+        print(f"{name:<16}{size / 2**20:>10.1f}{size / args.rows:>12.1f}{elapsed:>10.2f}")
+        del result
+
+    row = Row._make(values[0])
+    print(f"sample: {row.product_id=} {row[4]=} {sorted(row._asdict())[:3]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Throughput benchmark for the server entry points.
+
+Starts each server command in turn, waits until it answers, drives it with
+concurrent keep-alive clients for a fixed time and reports requests per
+second and latency percentiles, plus the time until the first response:
+
+    uvicorn     uvicorn app.main:app   (the previous production command)
+    serve       python -m app.serve    (multi-worker, preloaded, warmed up)
+
+The database is not required; point --path at an endpoint that does not use
+it (the default) to measure the server itself, or at a cached catalog
+endpoint on a machine with the database running.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serve --clients 64 --seconds 10
+    python -m benchmarks.bench_serve --workers 4 --path /api/v1/products-grouped
+"""
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+COMMANDS = {
+    "uvicorn": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning",
+    ],
+    "serve": lambda port, workers: [
+        sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ],
+}
+
+def wait_ready(port, path, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def client(port, path, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+def run(name, args, port):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    started = time.monotonic()
+    process = subprocess.Popen(
+        COMMANDS[name](port, args.workers), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        if not wait_ready(port, args.path):
+            print(f"{name:<10} did not start")
+            return
+        ready_s = time.monotonic() - started
+
+        latencies, errors = [], []
+        stop_at = time.monotonic() + args.seconds
+        threads = [
+            threading.Thread(target=client, args=(port, args.path, stop_at, latencies, errors))
+            for _ in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        count = len(latencies)
+        p50 = latencies[count // 2] * 1000 if count else 0
+        p99 = latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0
+        print(f"{name:<10}{count / args.seconds:>10.0f}{p50:>10.2f}{p99:>10.2f}{len(errors):>8}{ready_s:>9.2f}")
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=args.seconds + 30)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the server entry points")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--only", choices=sorted(COMMANDS), default=None)
+    args = parser.parse_args()
+
+    print(f"path={args.path} clients={args.clients} seconds={args.seconds} workers={args.workers}")
+    print(f"{'command':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'ready s':>9}")
+    for offset, name in enumerate(COMMANDS):
+        if args.only and name != args.only:
+            continue
+        run(name, args, args.port + offset)
+
+if __name__ == "__main__":
+    main()
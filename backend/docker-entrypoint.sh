@@ -39,16 +39,9 @@ print("Could not connect to database after 30 attempts. Exiting.")
 exit(1)
 '
 
-# Ejecutar migraciones
-echo "Running database migrations..."
-python run_migrations.py
-
-# Ejecutar procedimientos almacenados
-echo "Running stored procedures..."
-chmod +x /app/run_stored_procs.sh
-/app/run_stored_procs.sh
-
-# Inicializar la base de datos
+# Inicializar la base de datos: tabla Users, migraciones y procedimientos
+# almacenados pendientes según el registro schema_migrations (si el esquema
+# está al día es una sola consulta)
 echo "Initializing database..."
 python -m app.db.init_db
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Nightly job that exports closed orders into the Parquet analytics dataset.
+
+Usage:
+    python export_analytics_snapshot.py                     # yesterday
+    python export_analytics_snapshot.py --date 2025-01-31
+    python export_analytics_snapshot.py --from 2025-01-01 --to 2025-01-31
+
+Example crontab entry (03:00 every night):
+    0 3 * * * cd /app && python export_analytics_snapshot.py
+"""
+import sys
+import argparse
+import logging
+from datetime import date, timedelta
+from app.services.analytics_snapshot import export_range, data_root
+from app.settings import configure_logging
+
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Export closed orders to the Parquet analytics dataset")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="Single closing date to export (defaults to yesterday)")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, default=None,
+                        help="First closing date of a range to export")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, default=None,
+                        help="Last closing date of a range to export, inclusive")
+    parser.add_argument("--output", default=None, help="Dataset root directory (defaults to ANALYTICS_DATA_DIR)")
+    args = parser.parse_args()
+    
+    if args.from_date or args.to_date:
+        from_date = args.from_date or args.to_date
+        to_date = args.to_date or args.from_date
+    else:
+        from_date = to_date = args.date or (date.today() - timedelta(days=1))
+    
+    logger.info(f"Exporting analytics snapshot from {from_date} to {to_date} into {args.output or data_root()}")
+    
+    if not export_range(from_date, to_date, args.output):
+        logger.error("Analytics snapshot export failed")
+        sys.exit(1)
+        
+    logger.info("Analytics snapshot export completed")
+    sys.exit(0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Rotate the JWT signing keys in a key ring file.
+
+Adds a new key that becomes the signing key after --activate-in seconds (long
+enough for every worker to reload the file, see RELOAD_INTERVAL_SECONDS),
+schedules the current signing keys to stop verifying once the tokens they
+signed have expired, and drops keys that are already expired.
+
+Usage:
+    python rotate_jwt_keys.py                          # JWT_KEYS_FILE or the default ring
+    python rotate_jwt_keys.py --file /run/secrets/jwt_keys.json --activate-in 300
+
+Example crontab entry (first day of every month at 04:00):
+    0 4 1 * * cd /app && python rotate_jwt_keys.py
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+from datetime import datetime, timezone
+from app.utils.keyring import (
+    DEFAULT_KEYRING_FILE, RELOAD_INTERVAL_SECONDS,
+    KeyRingError, new_secret, read_keyring_file, write_keyring_file
+)
+from app.utils.security import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.settings import configure_logging, get_settings
+
+logger = logging.getLogger(__name__)
+
+def iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds") if timestamp else None
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Rotate the JWT signing keys")
+    parser.add_argument("--file", default=get_settings().jwt_keys_file or DEFAULT_KEYRING_FILE,
+                        help="Key ring file to rotate")
+    parser.add_argument("--activate-in", type=int, default=int(RELOAD_INTERVAL_SECONDS * 4),
+                        help="Seconds until the new key starts signing tokens")
+    parser.add_argument("--grace", type=int, default=300,
+                        help="Extra seconds old keys keep verifying after their last token expires")
+    args = parser.parse_args()
+
+    now = time.time()
+    try:
+        keys = read_keyring_file(args.file) if os.path.exists(args.file) else []
+    except KeyRingError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    activate_at = now + args.activate_in
+    retire_at = activate_at + ACCESS_TOKEN_EXPIRE_MINUTES * 60 + args.grace
+
+    entries = []
+    for key in keys:
+        if not key.can_verify(now):
+            logger.info(f"Dropping expired key {key.kid}")
+            continue
+        expires_at = key.expires_at
+        if expires_at is None or expires_at > retire_at:
+            expires_at = retire_at
+        entries.append({
+            "kid": key.kid,
+            "secret": key.secret,
+            "not_before": iso(key.not_before),
+            "expires_at": iso(expires_at),
+        })
+
+    kid = datetime.fromtimestamp(activate_at, timezone.utc).strftime("%Y%m%d%H%M%S")
+    entries.append({"kid": kid, "secret": new_secret(), "not_before": iso(activate_at), "expires_at": None})
+    write_keyring_file(args.file, entries)
+
+    logger.info(f"Key {kid} signs from {iso(activate_at)}; previous keys verify until {iso(retire_at)}")
+    sys.exit(0)
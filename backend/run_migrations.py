@@ -5,15 +5,12 @@ Script to run database migrations.
 import sys
 import logging
 from app.db.migrate import run_migrations
+from app.settings import configure_logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
+    configure_logging()
     logger.info("Starting database migrations")
     
     # Run migrations